@@ -4,15 +4,42 @@ Developed by Kerdos Infrasoft Private Limited
 Flask server providing API endpoints for voice cloning and conversion
 """
 
-from flask import Flask, request, jsonify, send_file, send_from_directory
+from flask import Flask, Response, request, jsonify, send_file, send_from_directory, stream_with_context
 from flask_cors import CORS
 from voice_converter import VoiceConverter
-from coqui_tts_converter import CoquiTTSConverter
+from coqui_tts_converter import CoquiTTSConverter, CURATED_MODELS, DEFAULT_MODEL_NAME, create_model_pool
+from index_tts_converter import IndexTTSConverter
+from voice_conversion_engine import VoiceConversionEngine
+from model_server import ModelServerClient, RemoteConverter
+from job_queue import SynthesisJobQueue, QueueFullError
+from synthesis_cache import SynthesisCache
+from cache_utils import LRUCache, get_cache_dir, hash_file, hash_params
+from speaker_registry import SpeakerRegistry, SpeakerNotFoundError
+from memory_stats import get_memory_usage
+from audio_assembly import wav_header
+from thread_budget import apply_to_current_thread, thread_budget_stats, configure as configure_thread_budget
+from realtime_vc import RealtimeConversionSession
+import gc
+import io
 import os
+import time
+import json
+import base64
+import zipfile
 import tempfile
 import logging
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from werkzeug.utils import secure_filename
 
+try:
+    from flask_sock import Sock
+    from simple_websocket import ConnectionClosed
+except ImportError:
+    # flask-sock is optional; without it the real-time endpoint is not registered
+    Sock = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,18 +47,69 @@ logger = logging.getLogger(__name__)
 # Initialize Flask app
 app = Flask(__name__, static_folder='static')
 CORS(app)
+sock = Sock(app) if Sock is not None else None
 
 # Configuration
 UPLOAD_FOLDER = tempfile.gettempdir()
 ALLOWED_AUDIO_EXTENSIONS = {'wav', 'mp3', 'ogg', 'flac', 'm4a'}
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+# Text limit of the synchronous routes, which must finish within the worker
+# timeout; longer texts (split into per-call segments) go through /api/jobs
+MAX_TEXT_LENGTH = int(os.environ.get('MAX_TEXT_LENGTH', 5000))
+JOB_MAX_TEXT_LENGTH = int(os.environ.get('JOB_MAX_TEXT_LENGTH', 100000))
+# Job records and results; must be shared by all gunicorn workers
+JOB_DIR = os.environ.get('JOB_DIR') or get_cache_dir('jobs')
+# Jobs running inference at once, across all worker processes
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 1))
+# Request threads per gunicorn worker (set from gunicorn's --threads)
+WEB_THREADS = int(os.environ.get('WEB_THREADS', 1))
+JOB_MAX_PENDING = int(os.environ.get('JOB_MAX_PENDING', 100))
+JOB_RESULT_TTL = int(os.environ.get('JOB_RESULT_TTL', 3600))
+SYNTHESIS_CACHE_MEMORY_MB = int(os.environ.get('SYNTHESIS_CACHE_MEMORY_MB', 64))
+SYNTHESIS_CACHE_DISK_MB = int(os.environ.get('SYNTHESIS_CACHE_DISK_MB', 1024))
+BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', 500))
+BATCH_EDGE_CONCURRENCY = int(os.environ.get('BATCH_EDGE_CONCURRENCY', 8))
+# Larger batches run as a job instead of inside the HTTP request
+BATCH_SYNC_MAX_ITEMS = int(os.environ.get('BATCH_SYNC_MAX_ITEMS', 20))
+VC_MAX_TARGETS = int(os.environ.get('VC_MAX_TARGETS', 16))
+# Concurrent real-time conversion sessions per worker (each keeps a CPU busy)
+REALTIME_VC_MAX_SESSIONS = int(os.environ.get('REALTIME_VC_MAX_SESSIONS', 2))
+REALTIME_VC_IDLE_TIMEOUT = float(os.environ.get('REALTIME_VC_IDLE_TIMEOUT', 30))
+# When set, Coqui and Index-TTS run in the shared model server (model_server.py)
+MODEL_SERVER_SOCKET = os.environ.get('MODEL_SERVER_SOCKET')
+MODEL_SERVER_AUTHKEY = os.environ.get('MODEL_SERVER_AUTHKEY')
+# Engines to load at import time, e.g. in the gunicorn master with preload_app
+# ('1'/'true' means coqui-tts; otherwise a comma-separated list of engines)
+PRELOAD_MODELS = os.environ.get('PRELOAD_MODELS', '')
+# 'background' starts loading Index-TTS2 when a worker starts, without
+# blocking it; requests arriving during the load wait for it
+INDEX_TTS_WARMUP = os.environ.get('INDEX_TTS_WARMUP', '').lower()
+# Coqui models /api/coqui/synthesize may load (voice conversion models excluded)
+SYNTHESIS_MODEL_IDS = {
+    model['id'] for model in CURATED_MODELS if 'voice_conversion' not in model['features']
+}
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
 
+# Every request thread and job worker may run inference at the same time;
+# they split this process's torch threads between them
+configure_thread_budget(inference_threads=WEB_THREADS + JOB_WORKERS)
+
 # Initialize voice converters (lazy loading)
 voice_converter = None
 coqui_tts_converter = None
+coqui_model_pool = None
+voice_conversion_engine = None
+index_tts_converter = None
+index_tts_lock = threading.Lock()
+model_server_client = None
+realtime_vc_slots = threading.BoundedSemaphore(REALTIME_VC_MAX_SESSIONS)
+job_queue = None
+synthesis_cache = None
+speaker_registry = None
+voice_list_responses = LRUCache(max_items=128)
+coqui_model_responses = LRUCache(max_items=16)
 
 
 def get_voice_converter():
@@ -44,22 +122,316 @@ def get_voice_converter():
     return voice_converter
 
 
-def get_coqui_tts_converter():
-    """Lazy load the Coqui TTS converter"""
+def get_model_server_client():
+    """Lazy create the client for the shared model server"""
+    global model_server_client
+    if model_server_client is None:
+        authkey = MODEL_SERVER_AUTHKEY.encode() if MODEL_SERVER_AUTHKEY else None
+        model_server_client = ModelServerClient(MODEL_SERVER_SOCKET, authkey)
+    return model_server_client
+
+
+def get_coqui_model_pool():
+    """Lazy create the pool of loaded Coqui models"""
+    global coqui_model_pool
+    if coqui_model_pool is None:
+        coqui_model_pool = create_model_pool()
+    return coqui_model_pool
+
+
+def get_coqui_tts_converter(model_name=None):
+    """
+    Lazy load a Coqui TTS converter
+    
+    Args:
+        model_name: Coqui model (default: XTTS v2); other models are loaded
+            into the model pool on first use
+    """
     global coqui_tts_converter
+    if model_name and model_name != DEFAULT_MODEL_NAME:
+        if MODEL_SERVER_SOCKET:
+            return RemoteConverter(get_model_server_client(), f'coqui-tts:{model_name}')
+        return get_coqui_model_pool().get(model_name)
+    
     if coqui_tts_converter is None:
-        logger.info("Loading Coqui TTS converter...")
-        coqui_tts_converter = CoquiTTSConverter()  # Auto-detects GPU
-        logger.info("Coqui TTS converter ready")
+        if MODEL_SERVER_SOCKET:
+            logger.info(f"Using Coqui TTS from model server at {MODEL_SERVER_SOCKET}")
+            coqui_tts_converter = RemoteConverter(get_model_server_client(), 'coqui-tts')
+        else:
+            logger.info("Loading Coqui TTS converter...")
+            coqui_tts_converter = get_coqui_model_pool().get(DEFAULT_MODEL_NAME)  # Auto-detects GPU
+            logger.info("Coqui TTS converter ready")
     return coqui_tts_converter
 
 
+def get_voice_conversion_engine():
+    """Lazy load the FreeVC voice conversion engine"""
+    global voice_conversion_engine
+    if voice_conversion_engine is None:
+        if MODEL_SERVER_SOCKET:
+            logger.info(f"Using voice conversion from model server at {MODEL_SERVER_SOCKET}")
+            voice_conversion_engine = RemoteConverter(get_model_server_client(), 'voice-conversion')
+        else:
+            logger.info("Loading voice conversion engine...")
+            voice_conversion_engine = VoiceConversionEngine()
+            logger.info("Voice conversion engine ready")
+    return voice_conversion_engine
+
+
+def get_index_tts_converter():
+    """
+    Get the process-wide Index-TTS2 converter
+    
+    Creating it is cheap; the model loads on first use, once, even when
+    several request threads need it at the same time.
+    """
+    global index_tts_converter
+    if index_tts_converter is None:
+        with index_tts_lock:
+            if index_tts_converter is None:
+                if MODEL_SERVER_SOCKET:
+                    logger.info(f"Using Index-TTS2 from model server at {MODEL_SERVER_SOCKET}")
+                    index_tts_converter = RemoteConverter(get_model_server_client(), 'index-tts')
+                else:
+                    index_tts_converter = IndexTTSConverter()
+    return index_tts_converter
+
+
+def index_tts_load_stats():
+    """Load state of the local Index-TTS2 model, or None if not created here"""
+    if isinstance(index_tts_converter, IndexTTSConverter):
+        return index_tts_converter.load_stats()
+    return None
+
+
+def preload_models(engines):
+    """
+    Load model weights up front and freeze the resulting objects
+    
+    Meant to run in the gunicorn master (preload_app) so forked workers share
+    the weights copy-on-write. gc.freeze() moves everything allocated so far
+    out of the collector's reach, so collections in the workers do not write
+    to (and thereby un-share) the pages holding those objects.
+    
+    Args:
+        engines: Engine ids to load ('coqui-tts', 'index-tts', 'voice-conversion')
+    """
+    before = get_memory_usage()
+    
+    for engine in engines:
+        if engine == 'coqui-tts':
+            converter = get_coqui_tts_converter()
+        elif engine == 'index-tts':
+            converter = get_index_tts_converter()
+            converter.ensure_loaded()
+        elif engine == 'voice-conversion':
+            converter = get_voice_conversion_engine()
+        else:
+            logger.warning(f"Cannot preload unknown engine: {engine}")
+            continue
+        
+        if getattr(converter, 'device', 'cpu') != 'cpu':
+            logger.warning(f"{engine} uses {converter.device}; GPU state does not survive fork")
+    
+    gc.collect()
+    gc.freeze()
+    
+    after = get_memory_usage()
+    logger.info(
+        f"Preloaded {', '.join(engines)}: rss {before.get('rss_mb')}MB -> {after.get('rss_mb')}MB, "
+        f"{gc.get_freeze_count()} objects frozen"
+    )
+
+
+def get_job_queue():
+    """Lazy create the synthesis job queue"""
+    global job_queue
+    if job_queue is None:
+        job_queue = SynthesisJobQueue(
+            JOB_DIR,
+            max_workers=JOB_WORKERS,
+            max_pending=JOB_MAX_PENDING,
+            result_ttl=JOB_RESULT_TTL,
+            initializer=apply_to_current_thread
+        )
+    return job_queue
+
+
+def get_synthesis_cache():
+    """Lazy create the synthesis result cache"""
+    global synthesis_cache
+    if synthesis_cache is None:
+        synthesis_cache = SynthesisCache(
+            memory_max_bytes=SYNTHESIS_CACHE_MEMORY_MB * 1024 * 1024,
+            disk_max_bytes=SYNTHESIS_CACHE_DISK_MB * 1024 * 1024
+        )
+    return synthesis_cache
+
+
+def synthesize_cached(cache_key, synthesize, extension):
+    """
+    Return cached audio for cache_key, or run synthesize(output_path) and cache it
+    
+    Args:
+        cache_key: Key from SynthesisCache.make_key()
+        synthesize: Callable writing the audio to the path it is given
+        extension: Output file extension (e.g., 'mp3', 'wav')
+    
+    Returns:
+        Audio bytes
+    """
+    cache = get_synthesis_cache()
+    audio = cache.get(cache_key)
+    if audio is not None:
+        logger.info(f"Synthesis cache hit: {cache_key[:12]}")
+        return audio
+    
+    output_path = os.path.join(UPLOAD_FOLDER, f'synth_{os.urandom(8).hex()}.{extension}')
+    try:
+        synthesize(output_path)
+        with open(output_path, 'rb') as f:
+            audio = f.read()
+    finally:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+    
+    cache.put(cache_key, audio)
+    return audio
+
+
+def get_speaker_registry():
+    """Lazy create the speaker profile registry"""
+    global speaker_registry
+    if speaker_registry is None:
+        speaker_registry = SpeakerRegistry()
+    return speaker_registry
+
+
+def resolve_speaker_reference(file_field):
+    """
+    Resolve the speaker reference audio of the current request
+    
+    A registered 'speaker_id' form field takes precedence; otherwise the
+    uploaded file in file_field is saved to the upload folder.
+    
+    Args:
+        file_field: Name of the multipart file field holding reference audio
+    
+    Returns:
+        (reference_path, audio_hash, is_temporary)
+    
+    Raises:
+        ValueError: If the request holds no usable reference
+        SpeakerNotFoundError: If speaker_id is not registered
+    """
+    speaker_id = request.form.get('speaker_id')
+    if speaker_id:
+        registry = get_speaker_registry()
+        meta = registry.get(speaker_id)
+        return registry.reference_path(speaker_id), meta['audio_hash'], False
+    
+    if file_field not in request.files:
+        raise ValueError(f'Either {file_field} or speaker_id is required')
+    
+    reference_file = request.files[file_field]
+    if reference_file.filename == '':
+        raise ValueError('No reference audio file selected')
+    
+    if not allowed_file(reference_file.filename):
+        raise ValueError('Invalid audio file format')
+    
+    reference_filename = secure_filename(f'{file_field}_{os.urandom(8).hex()}.wav')
+    reference_path = os.path.join(UPLOAD_FOLDER, reference_filename)
+    reference_file.save(reference_path)
+    return reference_path, hash_file(reference_path), True
+
+
+def send_audio(audio, mimetype, download_name):
+    """Send in-memory audio bytes as a file download"""
+    return send_file(
+        io.BytesIO(audio),
+        mimetype=mimetype,
+        as_attachment=True,
+        download_name=download_name
+    )
+
+
+def stream_pcm(chunks, sample_rate: int, stream_format: str, cache_key: str, download_name: str) -> Response:
+    """
+    Stream 16-bit mono PCM chunks to the client as they are generated
+    
+    The first chunk is pulled before responding so synthesis errors still
+    produce a proper error status. A fully delivered stream is cached as a
+    regular WAV file.
+    
+    Args:
+        chunks: Iterator of PCM byte chunks
+        sample_rate: Sample rate of the PCM
+        stream_format: 'wav' (open-ended WAV header) or 'pcm' (raw samples)
+        cache_key: Synthesis cache key for the complete audio
+        download_name: Attachment file name without extension
+    
+    Returns:
+        Streaming response
+    """
+    first_chunk = next(chunks, b'')
+    
+    def generate():
+        if stream_format == 'wav':
+            yield wav_header(sample_rate)
+        received = [first_chunk]
+        yield first_chunk
+        for chunk in chunks:
+            received.append(chunk)
+            yield chunk
+        pcm = b''.join(received)
+        get_synthesis_cache().put(cache_key, wav_header(sample_rate, len(pcm)) + pcm)
+    
+    if stream_format == 'wav':
+        mimetype = 'audio/wav'
+    else:
+        mimetype = f'audio/L16;rate={sample_rate};channels=1'
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={
+            'Content-Disposition': f'attachment; filename={download_name}.{stream_format}',
+            'X-Sample-Rate': str(sample_rate)
+        }
+    )
+
+
+def text_too_long_response(text):
+    """
+    413 response for texts too long for a synchronous route, pointing to /api/jobs
+    
+    Returns:
+        (response, status) tuple, or None if the text is short enough
+    """
+    if len(text) <= MAX_TEXT_LENGTH:
+        return None
+    return jsonify({
+        'error': (
+            f'Text too long for a direct request (max {MAX_TEXT_LENGTH} characters); '
+            f'submit it to /api/jobs instead (max {JOB_MAX_TEXT_LENGTH} characters)'
+        ),
+        'jobs_url': '/api/jobs'
+    }), 413
+
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_AUDIO_EXTENSIONS
 
 
+@app.before_request
+def apply_request_thread_budget():
+    """Torch's intra-op thread count is per thread; size it for this request thread"""
+    apply_to_current_thread()
+
+
 @app.route('/')
 def index():
     """Serve the main page"""
@@ -72,23 +444,49 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'edge_tts_loaded': voice_converter is not None,
-        'coqui_tts_loaded': coqui_tts_converter is not None
+        'coqui_tts_loaded': coqui_tts_converter is not None,
+        'index_tts_loaded': index_tts_converter is not None,
+        'index_tts': index_tts_load_stats(),
+        'voice_conversion_loaded': voice_conversion_engine is not None,
+        'model_server': MODEL_SERVER_SOCKET,
+        'memory': get_memory_usage(),
+        'threads': thread_budget_stats(),
+        'coqui_models': coqui_model_pool.stats() if coqui_model_pool is not None else None,
+        'coqui_batching': (
+            coqui_tts_converter.get_batch_stats()
+            if isinstance(coqui_tts_converter, CoquiTTSConverter) and coqui_tts_converter.is_available
+            else None
+        ),
+        'jobs': job_queue.stats() if job_queue is not None else None,
+        'cache': synthesis_cache.stats() if synthesis_cache is not None else None
     })
 
 
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Synthesis cache hit/miss counts and sizes"""
+    return jsonify(get_synthesis_cache().stats())
+
+
 @app.route('/api/engines', methods=['GET'])
 def get_engines():
     """
     Get list of available TTS engines
+    
+    Availability is probed from installed packages and checkpoints on disk;
+    no model is loaded. Models load on first synthesis or on warmup.
     """
     try:
-        # Check Coqui TTS availability
-        coqui_available = False
-        try:
-            converter = get_coqui_tts_converter()
-            coqui_available = converter.is_model_available()
-        except:
-            pass
+        edge_probe = VoiceConverter.probe()
+        coqui_probe = CoquiTTSConverter.probe()
+        index_probe = IndexTTSConverter.probe()
+        
+        # A loaded converter knows better than the probe (e.g. a failed load)
+        if coqui_tts_converter is not None and not MODEL_SERVER_SOCKET:
+            coqui_probe['available'] = coqui_tts_converter.is_model_available()
+        index_stats = index_tts_load_stats()
+        if index_stats is not None and index_stats['state'] in ('ready', 'failed'):
+            index_probe['available'] = index_stats['state'] == 'ready'
         
         engines = [
             {
@@ -96,14 +494,26 @@ def get_engines():
                 'name': 'Edge-TTS',
                 'description': '300+ pre-built neural voices',
                 'features': ['Multiple languages', 'Fast synthesis', 'No setup required'],
-                'available': True
+                'available': edge_probe['available'],
+                'loaded': voice_converter is not None
             },
             {
                 'id': 'coqui-tts',
                 'name': 'Coqui TTS',
                 'description': 'Multilingual voice cloning (1100+ languages)',
                 'features': ['Voice cloning', 'Voice conversion', 'Multilingual'],
-                'available': coqui_available
+                'available': coqui_probe['available'],
+                'model_downloaded': coqui_probe['model_downloaded'],
+                'loaded': coqui_tts_converter is not None
+            },
+            {
+                'id': 'index-tts2',
+                'name': 'Index-TTS2',
+                'description': 'Voice cloning with emotional control',
+                'features': ['Voice cloning', 'Emotion control'],
+                'available': index_probe['available'],
+                'loaded': index_tts_converter is not None,
+                'load': index_stats
             }
         ]
         
@@ -117,29 +527,117 @@ def get_engines():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/engines/<engine_id>/warmup', methods=['POST'])
+def warmup_engine(engine_id):
+    """
+    Load an engine's model now instead of on the first synthesis request
+    
+    Query parameters:
+    - background: (index-tts2) 'true' to start the load and return 202 at once;
+      poll /api/health for its progress
+    """
+    loaders = {
+        'edge-tts': get_voice_converter,
+        'coqui-tts': get_coqui_tts_converter,
+        'index-tts2': get_index_tts_converter,
+        'voice-conversion': get_voice_conversion_engine
+    }
+    
+    if engine_id not in loaders:
+        return jsonify({'error': f'Unknown engine: {engine_id}'}), 404
+    
+    try:
+        if request.args.get('background', 'false').lower() == 'true':
+            if engine_id != 'index-tts2':
+                return jsonify({'error': 'Background warmup is only supported for index-tts2'}), 400
+            load = get_index_tts_converter().start_background_load()
+            return jsonify({'id': engine_id, 'load': load}), 202
+        
+        start = time.time()
+        converter = loaders[engine_id]()
+        available = converter.is_model_available() if hasattr(converter, 'is_model_available') else True
+        
+        return jsonify({
+            'id': engine_id,
+            'available': available,
+            'load_seconds': round(time.time() - start, 3)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error warming up {engine_id}: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/voices', methods=['GET'])
 def get_voices():
     """
     Get list of available voices
+    
+    Query parameters (all optional):
+    - locale: Exact locale (e.g., 'en-US')
+    - language: Language prefix (e.g., 'en')
+    - gender: 'Male' or 'Female'
+    - q: Search in name, display name and locale
+    - page, page_size: Pagination (default: all matching voices)
+    - grouped: 'true' to also return voices grouped by locale
+    
+    Responses carry an ETag; a matching If-None-Match returns 304.
     """
     try:
         vc = get_voice_converter()
-        voices = vc.get_available_voices()
+        index = vc.catalog.index
+        
+        params = {
+            name: request.args.get(name)
+            for name in ('locale', 'language', 'gender', 'q', 'page', 'page_size', 'grouped')
+        }
+        etag = f'{index.version}-{hash_params(**params)[:8]}'
+        
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+        
+        body = voice_list_responses.get(etag)
+        if body is None:
+            voices = index.filter(
+                locale=params['locale'],
+                language=params['language'],
+                gender=params['gender'],
+                query=params['q']
+            )
+            total = len(voices)
+            
+            page = max(1, int(params['page'] or 1))
+            page_size = int(params['page_size']) if params['page_size'] else max(total, 1)
+            page_size = max(1, page_size)
+            voices = voices[(page - 1) * page_size:page * page_size]
+            
+            result = {
+                'voices': voices,
+                'total': total,
+                'page': page,
+                'page_size': page_size,
+                'locales': index.locales
+            }
+            
+            if (params['grouped'] or '').lower() in ('1', 'true', 'yes'):
+                grouped = {}
+                for voice in voices:
+                    grouped.setdefault(voice['locale'], []).append(voice)
+                result['grouped'] = grouped
+            
+            body = json.dumps(result)
+            voice_list_responses.put(etag, body)
         
-        # Group by locale for better organization
-        grouped = {}
-        for voice in voices:
-            locale = voice['locale']
-            if locale not in grouped:
-                grouped[locale] = []
-            grouped[locale].append(voice)
-        
-        return jsonify({
-            'voices': voices,
-            'grouped': grouped,
-            'total': len(voices)
-        })
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
         
+    except ValueError:
+        return jsonify({'error': 'page and page_size must be integers'}), 400
+    
     except Exception as e:
         logger.error(f"Error getting voices: {e}")
         return jsonify({'error': str(e)}), 500
@@ -153,6 +651,7 @@ def text_to_speech():
     Expected form data:
     - text: Text to convert
     - voice: Voice name to use (e.g., 'en-US-AriaNeural')
+    - stream: (optional) 'true' to stream MP3 chunks as they are synthesized
     """
     try:
         # Validate inputs
@@ -169,25 +668,52 @@ def text_to_speech():
         if not text or len(text.strip()) == 0:
             return jsonify({'error': 'Text cannot be empty'}), 400
         
-        if len(text) > 5000:
-            return jsonify({'error': 'Text too long (max 5000 characters)'}), 400
+        too_long = text_too_long_response(text)
+        if too_long:
+            return too_long
         
-        # Generate output path
-        output_path = os.path.join(app.config['UPLOAD_FOLDER'], 'output_tts.mp3')
+        cache = get_synthesis_cache()
+        cache_key = cache.make_key('edge-tts', 'edge-tts', text, voice=voice_name)
+        
+        if request.form.get('stream', '').lower() in ('1', 'true', 'yes'):
+            cached_audio = cache.get(cache_key)
+            if cached_audio is not None:
+                return send_audio(cached_audio, 'audio/mpeg', 'converted_speech.mp3')
+            
+            logger.info(f"Streaming text to speech with voice {voice_name}: {text[:50]}...")
+            chunks = get_voice_converter().stream_speech(text, voice_name)
+            
+            # Pull the first chunk before responding so synthesis errors
+            # still produce a proper error status instead of a cut-off body
+            first_chunk = next(chunks, b'')
+            
+            def generate():
+                received = [first_chunk]
+                yield first_chunk
+                for chunk in chunks:
+                    received.append(chunk)
+                    yield chunk
+                # Only a fully delivered stream is worth caching
+                cache.put(cache_key, b''.join(received))
+            
+            return Response(
+                stream_with_context(generate()),
+                mimetype='audio/mpeg',
+                headers={'Content-Disposition': 'attachment; filename=converted_speech.mp3'}
+            )
         
         # Convert text to speech
         logger.info(f"Converting text to speech with voice {voice_name}: {text[:50]}...")
         vc = get_voice_converter()
-        vc.text_to_speech(text, voice_name, output_path)
-        
-        # Send the generated audio file
-        return send_file(
-            output_path,
-            mimetype='audio/mpeg',
-            as_attachment=True,
-            download_name='converted_speech.mp3'
+        audio = synthesize_cached(
+            cache_key,
+            lambda output_path: vc.text_to_speech(text, voice_name, output_path),
+            'mp3'
         )
         
+        # Send the generated audio
+        return send_audio(audio, 'audio/mpeg', 'converted_speech.mp3')
+        
     except Exception as e:
         logger.error(f"Error in text-to-speech conversion: {e}")
         return jsonify({'error': str(e)}), 500
@@ -240,38 +766,26 @@ def index_tts_clone_voice():
     Expected form data:
     - text: Text to synthesize
     - reference_audio: Reference audio file for voice cloning
+    - speaker_id: (instead of reference_audio) Registered speaker id
     """
+    ref_path, is_temporary = None, False
     try:
         # Validate inputs
         if 'text' not in request.form:
             return jsonify({'error': 'No text provided'}), 400
         
-        if 'reference_audio' not in request.files:
-            return jsonify({'error': 'No reference audio provided'}), 400
-        
         text = request.form['text']
-        reference_file = request.files['reference_audio']
         
         # Validate text
         if not text or len(text.strip()) == 0:
             return jsonify({'error': 'Text cannot be empty'}), 400
         
-        if len(text) > 5000:
-            return jsonify({'error': 'Text too long (max 5000 characters)'}), 400
-        
-        # Save reference audio
-        if reference_file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
-        
-        if not allowed_file(reference_file.filename):
-            return jsonify({'error': 'Invalid file type'}), 400
-        
-        ref_filename = secure_filename(reference_file.filename)
-        ref_path = os.path.join(app.config['UPLOAD_FOLDER'], f'ref_{ref_filename}')
-        reference_file.save(ref_path)
+        too_long = text_too_long_response(text)
+        if too_long:
+            return too_long
         
-        # Generate output path
-        output_path = os.path.join(app.config['UPLOAD_FOLDER'], 'output_index_tts.wav')
+        # Resolve reference audio
+        ref_path, ref_hash, is_temporary = resolve_speaker_reference('reference_audio')
         
         # Clone voice
         logger.info(f"Cloning voice with Index-TTS2: {text[:50]}...")
@@ -282,22 +796,32 @@ def index_tts_clone_voice():
                 'error': 'Index-TTS2 models not available. Please run setup.'
             }), 503
         
-        converter.clone_voice(text, ref_path, output_path)
-        
-        # Clean up reference file
-        os.remove(ref_path)
-        
-        # Send the generated audio file
-        return send_file(
-            output_path,
-            mimetype='audio/wav',
-            as_attachment=True,
-            download_name='cloned_voice.wav'
+        cache_key = get_synthesis_cache().make_key(
+            'index-tts', 'index-tts2', text, speaker=ref_hash
+        )
+        audio = synthesize_cached(
+            cache_key,
+            lambda output_path: converter.clone_voice(text, ref_path, output_path),
+            'wav'
         )
         
+        # Send the generated audio
+        return send_audio(audio, 'audio/wav', 'cloned_voice.wav')
+        
+    except SpeakerNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     except Exception as e:
         logger.error(f"Error in voice cloning: {e}")
         return jsonify({'error': str(e)}), 500
+    
+    finally:
+        # Clean up uploaded reference file
+        if is_temporary and os.path.exists(ref_path):
+            os.remove(ref_path)
 
 
 @app.route('/api/index-tts/synthesize-emotion', methods=['POST'])
@@ -308,40 +832,33 @@ def index_tts_synthesize_emotion():
     Expected form data:
     - text: Text to synthesize
     - speaker_audio: Reference audio for speaker voice
+    - speaker_id: (instead of speaker_audio) Registered speaker id
     - emotion_mode: 'none', 'audio', or 'vector'
     - emotion_audio: (optional) Reference audio for emotion
     - emotion_vector: (optional) JSON array of 8 emotion values
     - emotion_intensity: (optional) Emotion intensity 0.0-1.0
     """
+    spk_path, is_temporary = None, False
     try:
         # Validate inputs
         if 'text' not in request.form:
             return jsonify({'error': 'No text provided'}), 400
         
-        if 'speaker_audio' not in request.files:
-            return jsonify({'error': 'No speaker audio provided'}), 400
-        
         text = request.form['text']
-        speaker_file = request.files['speaker_audio']
         emotion_mode = request.form.get('emotion_mode', 'none')
         
         # Validate text
         if not text or len(text.strip()) == 0:
             return jsonify({'error': 'Text cannot be empty'}), 400
         
-        # Save speaker audio
-        if speaker_file.filename == '':
-            return jsonify({'error': 'No speaker file selected'}), 400
-        
-        if not allowed_file(speaker_file.filename):
-            return jsonify({'error': 'Invalid speaker file type'}), 400
+        too_long = text_too_long_response(text)
+        if too_long:
+            return too_long
         
-        spk_filename = secure_filename(speaker_file.filename)
-        spk_path = os.path.join(app.config['UPLOAD_FOLDER'], f'spk_{spk_filename}')
-        speaker_file.save(spk_path)
+        # Resolve speaker audio
+        spk_path, speaker_hash, is_temporary = resolve_speaker_reference('speaker_audio')
         
-        # Generate output path
-        output_path = os.path.join(app.config['UPLOAD_FOLDER'], 'output_emotion.wav')
+        cache = get_synthesis_cache()
         
         converter = get_index_tts_converter()
         
@@ -361,41 +878,67 @@ def index_tts_synthesize_emotion():
             emotion_intensity = float(request.form.get('emotion_intensity', 1.0))
             
             logger.info(f"Synthesizing with emotion audio: {text[:50]}...")
-            converter.synthesize_with_emotion_audio(
-                text, spk_path, emo_path, output_path, emotion_intensity
+            cache_key = cache.make_key(
+                'index-tts', 'index-tts2', text,
+                speaker=speaker_hash,
+                emotion_audio=hash_file(emo_path),
+                emotion_intensity=emotion_intensity
+            )
+            audio = synthesize_cached(
+                cache_key,
+                lambda output_path: converter.synthesize_with_emotion_audio(
+                    text, spk_path, emo_path, output_path, emotion_intensity
+                ),
+                'wav'
             )
             
             os.remove(emo_path)
             
         elif emotion_mode == 'vector' and 'emotion_vector' in request.form:
             # Emotion from vector
-            import json
             emotion_vector = json.loads(request.form['emotion_vector'])
             
             logger.info(f"Synthesizing with emotion vector: {text[:50]}...")
-            converter.synthesize_with_emotion_vector(
-                text, spk_path, emotion_vector, output_path
+            cache_key = cache.make_key(
+                'index-tts', 'index-tts2', text,
+                speaker=speaker_hash,
+                emotion_vector=emotion_vector
+            )
+            audio = synthesize_cached(
+                cache_key,
+                lambda output_path: converter.synthesize_with_emotion_vector(
+                    text, spk_path, emotion_vector, output_path
+                ),
+                'wav'
             )
             
         else:
             # No emotion - simple voice cloning
             logger.info(f"Synthesizing without emotion: {text[:50]}...")
-            converter.clone_voice(text, spk_path, output_path)
-        
-        # Clean up speaker file
-        os.remove(spk_path)
+            cache_key = cache.make_key('index-tts', 'index-tts2', text, speaker=speaker_hash)
+            audio = synthesize_cached(
+                cache_key,
+                lambda output_path: converter.clone_voice(text, spk_path, output_path),
+                'wav'
+            )
         
-        # Send the generated audio file
-        return send_file(
-            output_path,
-            mimetype='audio/wav',
-            as_attachment=True,
-            download_name='emotional_speech.wav'
-        )
+        # Send the generated audio
+        return send_audio(audio, 'audio/wav', 'emotional_speech.wav')
         
+    except SpeakerNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     except Exception as e:
         logger.error(f"Error in emotional synthesis: {e}")
         return jsonify({'error': str(e)}), 500
+    
+    finally:
+        # Clean up uploaded speaker file
+        if is_temporary and os.path.exists(spk_path):
+            os.remove(spk_path)
 
 
 @app.route('/api/index-tts/emotions', methods=['GET'])
@@ -423,14 +966,40 @@ def get_emotions():
 def get_coqui_models():
     """
     Get list of available Coqui TTS models
+    
+    Each model reports whether it is downloaded, its size on disk and
+    whether it is loaded in this process (null when models run in the
+    model server). Responses carry an ETag; a matching If-None-Match
+    returns 304.
     """
     try:
         models = CoquiTTSConverter.list_available_models()
+        loaded = None if MODEL_SERVER_SOCKET else (
+            set(coqui_model_pool.keys()) if coqui_model_pool is not None else set()
+        )
         
-        return jsonify({
-            'models': models,
-            'total': len(models)
-        })
+        etag = hash_params(models=models, loaded=sorted(loaded) if loaded is not None else None)[:16]
+        
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+        
+        body = coqui_model_responses.get(etag)
+        if body is None:
+            body = json.dumps({
+                'models': [
+                    {**model, 'loaded': model['id'] in loaded if loaded is not None else None}
+                    for model in models
+                ],
+                'total': len(models)
+            })
+            coqui_model_responses.put(etag, body)
+        
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
         
     except Exception as e:
         logger.error(f"Error getting Coqui models: {e}")
@@ -459,36 +1028,50 @@ def get_coqui_languages():
 def coqui_synthesize():
     """
     Basic text-to-speech synthesis with Coqui TTS
+    
+    Expected form data:
+    - text: Text to synthesize
+    - language: (optional) Language code
+    - model: (optional) Coqui model id from /api/coqui/models (default: XTTS v2)
     """
     try:
         # Get parameters
         text = request.form.get('text')
         language = request.form.get('language', 'en')
+        model_name = request.form.get('model') or DEFAULT_MODEL_NAME
         
         if not text:
             return jsonify({'error': 'Text is required'}), 400
         
+        too_long = text_too_long_response(text)
+        if too_long:
+            return too_long
+        
+        if model_name not in SYNTHESIS_MODEL_IDS:
+            return jsonify({'error': f'Unsupported model: {model_name}'}), 400
+        
         # Get converter
-        converter = get_coqui_tts_converter()
+        converter = get_coqui_tts_converter(model_name)
         
         if not converter.is_model_available():
             return jsonify({'error': 'Coqui TTS model not available'}), 503
         
-        # Generate output path
-        output_path = os.path.join(UPLOAD_FOLDER, f'coqui_output_{os.urandom(8).hex()}.wav')
-        
         # Synthesize
         logger.info(f"Synthesizing with Coqui TTS: {text[:50]}...")
-        converter.synthesize(text, output_path, language)
-        
-        # Return audio file
-        return send_file(
-            output_path,
-            mimetype='audio/wav',
-            as_attachment=True,
-            download_name='coqui_speech.wav'
+        cache_key = get_synthesis_cache().make_key(
+            'coqui-tts', converter.model_name, text,
+            language=language,
+            quantize=converter.quantize
+        )
+        audio = synthesize_cached(
+            cache_key,
+            lambda output_path: converter.synthesize(text, output_path, language),
+            'wav'
         )
         
+        # Return audio
+        return send_audio(audio, 'audio/wav', 'coqui_speech.wav')
+        
     except Exception as e:
         logger.error(f"Error in Coqui synthesis: {e}")
         return jsonify({'error': str(e)}), 500
@@ -498,30 +1081,31 @@ def coqui_synthesize():
 def coqui_clone_voice():
     """
     Voice cloning with Coqui TTS
+    
+    Expected form data:
+    - text: Text to synthesize
+    - language: (optional) Language code
+    - speaker_audio: Reference audio file
+    - speaker_id: (instead of speaker_audio) Registered speaker id
+    - stream: (optional) 'true' to stream audio while it is generated (XTTS)
+    - format: (optional, with stream) 'wav' (default) or 'pcm' for raw 16-bit mono
     """
+    speaker_path, is_temporary = None, False
     try:
         # Get parameters
         text = request.form.get('text')
         language = request.form.get('language', 'en')
+        stream_format = request.form.get('format', 'wav').lower()
         
         if not text:
             return jsonify({'error': 'Text is required'}), 400
         
-        # Get speaker audio file
-        if 'speaker_audio' not in request.files:
-            return jsonify({'error': 'Speaker audio file is required'}), 400
-        
-        speaker_file = request.files['speaker_audio']
-        if speaker_file.filename == '':
-            return jsonify({'error': 'No speaker audio file selected'}), 400
-        
-        if not allowed_file(speaker_file.filename):
-            return jsonify({'error': 'Invalid audio file format'}), 400
+        too_long = text_too_long_response(text)
+        if too_long:
+            return too_long
         
-        # Save speaker audio
-        speaker_filename = secure_filename(f'speaker_{os.urandom(8).hex()}.wav')
-        speaker_path = os.path.join(UPLOAD_FOLDER, speaker_filename)
-        speaker_file.save(speaker_path)
+        # Resolve speaker audio
+        speaker_path, speaker_hash, is_temporary = resolve_speaker_reference('speaker_audio')
         
         # Get converter
         converter = get_coqui_tts_converter()
@@ -529,35 +1113,74 @@ def coqui_clone_voice():
         if not converter.is_model_available():
             return jsonify({'error': 'Coqui TTS model not available'}), 503
         
-        # Generate output path
-        output_path = os.path.join(UPLOAD_FOLDER, f'coqui_cloned_{os.urandom(8).hex()}.wav')
-        
         # Clone voice
         logger.info(f"Cloning voice with Coqui TTS in language: {language}")
-        converter.clone_voice(text, speaker_path, output_path, language)
-        
-        # Cleanup
-        if os.path.exists(speaker_path):
-            os.remove(speaker_path)
+        cache = get_synthesis_cache()
+        cache_key = cache.make_key(
+            'coqui-tts', converter.model_name, text,
+            language=language,
+            quantize=converter.quantize,
+            speaker=speaker_hash
+        )
         
-        # Return audio file
-        return send_file(
-            output_path,
-            mimetype='audio/wav',
-            as_attachment=True,
-            download_name='coqui_cloned_voice.wav'
+        if request.form.get('stream', '').lower() in ('1', 'true', 'yes'):
+            if stream_format not in ('wav', 'pcm'):
+                return jsonify({'error': "format must be 'wav' or 'pcm'"}), 400
+            
+            if converter.supports_streaming():
+                cached_audio = cache.get(cache_key)
+                if cached_audio is not None:
+                    return send_audio(cached_audio, 'audio/wav', 'coqui_cloned_voice.wav')
+                
+                return stream_pcm(
+                    converter.stream_clone_voice(text, speaker_path, language),
+                    converter.get_sample_rate(),
+                    stream_format,
+                    cache_key,
+                    'coqui_cloned_voice'
+                )
+            logger.info(f"{converter.model_name} cannot stream, returning complete audio")
+        
+        audio = synthesize_cached(
+            cache_key,
+            lambda output_path: converter.clone_voice(text, speaker_path, output_path, language),
+            'wav'
         )
         
+        # Return audio
+        return send_audio(audio, 'audio/wav', 'coqui_cloned_voice.wav')
+        
+    except SpeakerNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     except Exception as e:
         logger.error(f"Error in Coqui voice cloning: {e}")
         return jsonify({'error': str(e)}), 500
+    
+    finally:
+        # Cleanup
+        if is_temporary and os.path.exists(speaker_path):
+            os.remove(speaker_path)
 
 
 @app.route('/api/coqui/convert-voice', methods=['POST'])
 def coqui_convert_voice():
     """
-    Voice conversion with Coqui TTS
+    Voice conversion with FreeVC
+    
+    Expected form data:
+    - source_audio: Recording whose content is kept (any length)
+    - target_audio: Reference audio of the voice to convert to; repeat the
+      field to convert into several voices at once
+    - target_speaker_id: (optional, repeatable) Registered speaker used as a target
+    
+    One target returns a WAV file; several return a zip with one WAV per
+    target plus manifest.json. The source is encoded only once either way.
     """
+    temporary_paths = []
     try:
         # Get source audio file
         if 'source_audio' not in request.files:
@@ -567,58 +1190,870 @@ def coqui_convert_voice():
         if source_file.filename == '':
             return jsonify({'error': 'No source audio file selected'}), 400
         
-        # Get target audio file
-        if 'target_audio' not in request.files:
+        # Get target audio files and registered speakers
+        target_files = [f for f in request.files.getlist('target_audio') if f.filename]
+        target_speaker_ids = [s for s in request.form.getlist('target_speaker_id') if s]
+        
+        if not target_files and not target_speaker_ids:
             return jsonify({'error': 'Target audio file is required'}), 400
         
-        target_file = request.files['target_audio']
-        if target_file.filename == '':
-            return jsonify({'error': 'No target audio file selected'}), 400
+        if len(target_files) + len(target_speaker_ids) > VC_MAX_TARGETS:
+            return jsonify({'error': f'Too many targets (max {VC_MAX_TARGETS})'}), 400
         
-        if not allowed_file(source_file.filename) or not allowed_file(target_file.filename):
+        if not all(allowed_file(f.filename) for f in [source_file] + target_files):
             return jsonify({'error': 'Invalid audio file format'}), 400
         
         # Save audio files
         source_filename = secure_filename(f'source_{os.urandom(8).hex()}.wav')
         source_path = os.path.join(UPLOAD_FOLDER, source_filename)
         source_file.save(source_path)
-        
-        target_filename = secure_filename(f'target_{os.urandom(8).hex()}.wav')
-        target_path = os.path.join(UPLOAD_FOLDER, target_filename)
-        target_file.save(target_path)
-        
-        # Get converter
-        converter = get_coqui_tts_converter()
+        temporary_paths.append(source_path)
+        
+        targets = []
+        for target_file in target_files:
+            target_filename = secure_filename(f'target_{os.urandom(8).hex()}.wav')
+            target_path = os.path.join(UPLOAD_FOLDER, target_filename)
+            target_file.save(target_path)
+            temporary_paths.append(target_path)
+            targets.append({'target': target_file.filename, 'path': target_path, 'hash': hash_file(target_path)})
+        
+        registry = get_speaker_registry() if target_speaker_ids else None
+        for speaker_id in target_speaker_ids:
+            meta = registry.get(speaker_id)
+            targets.append({
+                'target': speaker_id,
+                'path': registry.reference_path(speaker_id),
+                'hash': meta['audio_hash']
+            })
+        
+        # Get conversion engine
+        converter = get_voice_conversion_engine()
         
         if not converter.is_model_available():
-            return jsonify({'error': 'Coqui TTS model not available'}), 503
-        
-        # Generate output path
-        output_path = os.path.join(UPLOAD_FOLDER, f'coqui_converted_{os.urandom(8).hex()}.wav')
+            return jsonify({'error': 'Voice conversion model not available'}), 503
+        
+        # Convert voice, skipping targets already in the cache
+        logger.info(f"Converting voice with FreeVC into {len(targets)} target(s)")
+        cache = get_synthesis_cache()
+        source_hash = hash_file(source_path)
+        for target in targets:
+            target['cache_key'] = cache.make_key(
+                'coqui-vc', converter.model_name, '',
+                source=source_hash,
+                target=target['hash']
+            )
+            target['audio'] = cache.get(target['cache_key'])
+        
+        pending = [target for target in targets if target['audio'] is None]
+        if pending:
+            output_paths = [
+                os.path.join(UPLOAD_FOLDER, f'vc_{os.urandom(8).hex()}.wav') for _ in pending
+            ]
+            temporary_paths.extend(output_paths)
+            converter.convert_voice_multi(
+                source_path,
+                [target['path'] for target in pending],
+                output_paths
+            )
+            for target, output_path in zip(pending, output_paths):
+                with open(output_path, 'rb') as f:
+                    target['audio'] = f.read()
+                cache.put(target['cache_key'], target['audio'])
+        
+        # Return audio
+        if len(targets) == 1:
+            return send_audio(targets[0]['audio'], 'audio/wav', 'coqui_converted_voice.wav')
+        
+        archive = io.BytesIO()
+        manifest = []
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_STORED) as zf:
+            for index, target in enumerate(targets):
+                name = f'{index:03d}.wav'
+                zf.writestr(name, target['audio'])
+                manifest.append({'index': index, 'target': target['target'], 'file': name})
+            zf.writestr('manifest.json', json.dumps({'items': manifest}, indent=2))
         
-        # Convert voice
-        logger.info("Converting voice with Coqui TTS")
-        converter.convert_voice(source_path, target_path, output_path)
+        return send_file(
+            io.BytesIO(archive.getvalue()),
+            mimetype='application/zip',
+            as_attachment=True,
+            download_name='coqui_converted_voices.zip'
+        )
         
+    except SpeakerNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    
+    except Exception as e:
+        logger.error(f"Error in Coqui voice conversion: {e}")
+        return jsonify({'error': str(e)}), 500
+    
+    finally:
         # Cleanup
-        if os.path.exists(source_path):
-            os.remove(source_path)
+        for path in temporary_paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def realtime_session_target(converter, config):
+    """
+    Target conditioning for a real-time session
+    
+    Args:
+        converter: Voice conversion engine
+        config: Session start message; holds 'target_speaker_id' or
+            base64 'target_audio'
+    
+    Returns:
+        Result of converter.get_target_embedding()
+    """
+    speaker_id = config.get('target_speaker_id')
+    if speaker_id:
+        return converter.get_target_embedding(get_speaker_registry().reference_path(speaker_id))
+    
+    if not config.get('target_audio'):
+        raise ValueError('target_speaker_id or target_audio is required')
+    
+    target_path = os.path.join(UPLOAD_FOLDER, secure_filename(f'target_{os.urandom(8).hex()}.wav'))
+    try:
+        with open(target_path, 'wb') as f:
+            f.write(base64.b64decode(config['target_audio']))
+        return converter.get_target_embedding(target_path)
+    finally:
         if os.path.exists(target_path):
             os.remove(target_path)
+
+
+if sock is not None:
+    @sock.route('/ws/coqui/convert-voice')
+    def realtime_convert_voice(ws):
+        """
+        Real-time voice conversion over a WebSocket
+        
+        Protocol:
+        - Client sends a JSON start message: sample_rate (of its PCM),
+          target_speaker_id or base64 target_audio, and optionally
+          block_ms, lookahead_ms, context_ms, crossfade_ms
+        - Server replies {"type": "ready", "sample_rate": ..., "latency": ...}
+        - Client sends binary 16-bit mono PCM frames of any size
+        - Server sends converted 16-bit mono PCM at the announced sample rate
+          as each block completes
+        - Client sends {"type": "end"}; server sends the remaining audio,
+          then {"type": "stats", ...} with the session's latency budget
+        """
+        def send_json(message):
+            ws.send(json.dumps(message))
+        
+        def send_error(error):
+            # The client may already have closed the connection
+            try:
+                send_json({'type': 'error', 'error': str(error)})
+            except (ConnectionClosed, OSError):
+                logger.info("Real-time voice conversion client gone before the error was sent")
+        
+        if not realtime_vc_slots.acquire(blocking=False):
+            send_error('Too many real-time sessions, try again later')
+            return
         
-        # Return audio file
-        return send_file(
-            output_path,
-            mimetype='audio/wav',
-            as_attachment=True,
-            download_name='coqui_converted_voice.wav'
+        try:
+            config = json.loads(ws.receive(timeout=REALTIME_VC_IDLE_TIMEOUT) or '{}')
+            sample_rate = int(config.get('sample_rate', 0))
+            if not 8000 <= sample_rate <= 48000:
+                raise ValueError('sample_rate between 8000 and 48000 is required')
+            
+            converter = get_voice_conversion_engine()
+            if not converter.is_model_available():
+                raise RuntimeError('Voice conversion model not available')
+            
+            session = RealtimeConversionSession(
+                converter,
+                realtime_session_target(converter, config),
+                sample_rate,
+                **{
+                    key: int(config[key])
+                    for key in ('block_ms', 'lookahead_ms', 'context_ms', 'crossfade_ms')
+                    if key in config
+                }
+            )
+            logger.info(
+                f"Real-time voice conversion started "
+                f"({session.algorithmic_latency_ms}ms algorithmic latency)"
+            )
+            send_json({
+                'type': 'ready',
+                'sample_rate': session.output_sample_rate,
+                'latency': session.stats()
+            })
+            
+            while True:
+                message = ws.receive(timeout=REALTIME_VC_IDLE_TIMEOUT)
+                if message is None:
+                    logger.info("Real-time voice conversion session idle, closing")
+                    break
+                if isinstance(message, str):
+                    if json.loads(message).get('type') == 'end':
+                        break
+                    continue
+                converted = session.push(message)
+                if converted:
+                    ws.send(converted)
+            
+            remaining = session.finish()
+            if remaining:
+                ws.send(remaining)
+            stats = session.stats()
+            logger.info(f"Real-time voice conversion finished: {stats}")
+            send_json({'type': 'stats', **stats})
+            
+        except ConnectionClosed:
+            logger.info("Real-time voice conversion client disconnected")
+        
+        except (ValueError, SpeakerNotFoundError) as e:
+            send_error(e)
+        
+        except Exception as e:
+            logger.error(f"Error in real-time voice conversion: {e}")
+            send_error(e)
+        
+        finally:
+            realtime_vc_slots.release()
+
+
+# ===== Speaker Profile Endpoints =====
+
+@app.route('/api/speakers', methods=['POST'])
+def register_speaker():
+    """
+    Register reference audio once and get a reusable speaker id
+    
+    Expected form data:
+    - audio: Reference audio file (3-30 seconds recommended)
+    - name: (optional) Display name
+    - precompute: (optional) Comma-separated engines to precompute conditioning
+      for, 'coqui-tts' and/or 'index-tts' (default: engines already loaded in
+      this worker)
+    """
+    upload_path = None
+    try:
+        if 'audio' not in request.files:
+            return jsonify({'error': 'No audio file provided'}), 400
+        
+        audio_file = request.files['audio']
+        if audio_file.filename == '':
+            return jsonify({'error': 'No file selected'}), 400
+        
+        if not allowed_file(audio_file.filename):
+            return jsonify({'error': 'Invalid file type'}), 400
+        
+        extension = audio_file.filename.rsplit('.', 1)[1].lower()
+        upload_path = os.path.join(UPLOAD_FOLDER, f'speaker_upload_{os.urandom(8).hex()}.{extension}')
+        audio_file.save(upload_path)
+        
+        registry = get_speaker_registry()
+        meta = registry.register(upload_path, request.form.get('name'))
+        reference_path = registry.reference_path(meta['speaker_id'])
+        
+        # Precompute engine conditioning so the first clone request is fast
+        if 'precompute' in request.form:
+            engines = [e.strip() for e in request.form['precompute'].split(',') if e.strip()]
+        else:
+            engines = []
+            if coqui_tts_converter is not None:
+                engines.append('coqui-tts')
+            if index_tts_converter is not None and index_tts_converter.load_state == 'ready':
+                engines.append('index-tts')
+        
+        precomputed = []
+        if 'coqui-tts' in engines:
+            converter = get_coqui_tts_converter()
+            if converter.is_model_available() and converter.supports_cached_latents():
+                converter.get_speaker_latents(reference_path)
+                precomputed.append('coqui-tts')
+        
+        if 'index-tts' in engines:
+            converter = get_index_tts_converter()
+            if converter.is_model_available() and converter.precompute_prompts(reference_path):
+                precomputed.append('index-tts')
+        
+        return jsonify(dict(meta, precomputed=precomputed)), 201
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    except Exception as e:
+        logger.error(f"Error registering speaker: {e}")
+        return jsonify({'error': str(e)}), 500
+    
+    finally:
+        if upload_path and os.path.exists(upload_path):
+            os.remove(upload_path)
+
+
+@app.route('/api/speakers', methods=['GET'])
+def list_speakers():
+    """
+    List registered speakers
+    """
+    speakers = get_speaker_registry().list()
+    return jsonify({
+        'speakers': speakers,
+        'total': len(speakers)
+    })
+
+
+@app.route('/api/speakers/<speaker_id>', methods=['GET'])
+def get_speaker(speaker_id):
+    """
+    Get a registered speaker
+    """
+    try:
+        return jsonify(get_speaker_registry().get(speaker_id))
+    except SpeakerNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+
+
+@app.route('/api/speakers/<speaker_id>', methods=['DELETE'])
+def delete_speaker(speaker_id):
+    """
+    Delete a registered speaker
+    """
+    try:
+        get_speaker_registry().delete(speaker_id)
+        return jsonify({'deleted': speaker_id})
+    except SpeakerNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+
+
+# ===== Batch Synthesis Endpoints =====
+
+def validate_batch_item(item, max_text_length=MAX_TEXT_LENGTH):
+    """
+    Validate one batch item
+    
+    Args:
+        item: Batch item as submitted
+        max_text_length: Text limit (larger for batches run as a job)
+    
+    Returns:
+        Error message, or None if the item is valid
+    """
+    if not isinstance(item, dict):
+        return 'Item must be an object'
+    
+    text = item.get('text')
+    if not isinstance(text, str) or len(text.strip()) == 0:
+        return 'Text cannot be empty'
+    
+    if len(text) > max_text_length:
+        return f'Text too long (max {max_text_length} characters)'
+    
+    engine = item.get('engine', 'edge-tts')
+    if engine == 'edge-tts':
+        if not item.get('voice'):
+            return 'No voice selected'
+    elif engine != 'coqui-tts':
+        return f'Unsupported engine: {engine}'
+    
+    return None
+
+
+def start_edge_batch_item(item):
+    """
+    Start one Edge-TTS batch item on the shared event loop without blocking
+    
+    Returns:
+        (future, finish, output_path): finish(future) returns (audio bytes, 'mp3')
+        once the future is done; output_path is removed by finish
+    """
+    text, voice_name = item['text'], item['voice']
+    cache = get_synthesis_cache()
+    cache_key = cache.make_key('edge-tts', 'edge-tts', text, voice=voice_name)
+    
+    audio = cache.get(cache_key)
+    if audio is not None:
+        future = Future()
+        future.set_result(None)
+        return future, lambda done: (audio, 'mp3'), None
+    
+    output_path = os.path.join(UPLOAD_FOLDER, f'synth_{os.urandom(8).hex()}.mp3')
+    
+    def finish(done):
+        try:
+            done.result()
+            with open(output_path, 'rb') as f:
+                result = f.read()
+        finally:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+        cache.put(cache_key, result)
+        return result, 'mp3'
+    
+    future = get_voice_converter().submit_text_to_speech(text, voice_name, output_path)
+    return future, finish, output_path
+
+
+def synthesize_batch_item(item):
+    """
+    Synthesize one validated model-backed (Coqui) batch item through the synthesis cache
+    
+    Returns:
+        (audio bytes, file extension)
+    """
+    text = item['text']
+    cache = get_synthesis_cache()
+    
+    language = item.get('language', 'en')
+    converter = get_coqui_tts_converter()
+    if not converter.is_model_available():
+        raise RuntimeError('Coqui TTS model not available')
+    
+    if item.get('speaker_id'):
+        registry = get_speaker_registry()
+        speaker_hash = registry.get(item['speaker_id'])['audio_hash']
+        speaker_path = registry.reference_path(item['speaker_id'])
+        cache_key = cache.make_key(
+            'coqui-tts', converter.model_name, text,
+            language=language,
+            quantize=converter.quantize,
+            speaker=speaker_hash
+        )
+        audio = synthesize_cached(
+            cache_key,
+            lambda output_path: converter.clone_voice(text, speaker_path, output_path, language),
+            'wav'
         )
+    else:
+        cache_key = cache.make_key(
+            'coqui-tts', converter.model_name, text,
+            language=language,
+            quantize=converter.quantize
+        )
+        audio = synthesize_cached(
+            cache_key,
+            lambda output_path: converter.synthesize(text, output_path, language),
+            'wav'
+        )
+    return audio, 'wav'
+
+
+def run_batch(items):
+    """
+    Synthesize batch items with engine-appropriate parallelism
+    
+    Edge-TTS items are network-bound and run concurrently on the shared event
+    loop, at most BATCH_EDGE_CONCURRENCY at a time. Model-backed items run one
+    at a time, grouped by speaker so each speaker's conditioning is computed
+    once and reused by the following items.
+    
+    Yields:
+        (index, audio bytes or None, extension or None, error or None)
+        in completion order
+    """
+    edge_items = deque((i, item) for i, item in enumerate(items) if item.get('engine', 'edge-tts') == 'edge-tts')
+    model_items = [(i, item) for i, item in enumerate(items) if item.get('engine', 'edge-tts') != 'edge-tts']
+    model_items.sort(key=lambda entry: (entry[1].get('engine'), entry[1].get('speaker_id') or ''))
+    
+    # future -> (index, finish, output_path); finish is None for model items
+    pending = {}
+    
+    def start_next_edge_item():
+        index, item = edge_items.popleft()
+        try:
+            future, finish, output_path = start_edge_batch_item(item)
+        except Exception as e:
+            future, output_path = Future(), None
+            future.set_exception(e)
+            finish = lambda done: done.result()
+        pending[future] = (index, finish, output_path)
+    
+    model_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='batch-model')
+    try:
+        for index, item in model_items:
+            pending[model_pool.submit(synthesize_batch_item, item)] = (index, None, None)
+        for _ in range(min(max(1, BATCH_EDGE_CONCURRENCY), len(edge_items))):
+            start_next_edge_item()
+        
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, finish, _ = pending.pop(future)
+                if finish is not None and edge_items:
+                    start_next_edge_item()
+                try:
+                    audio, extension = finish(future) if finish is not None else future.result()
+                    yield index, audio, extension, None
+                except Exception as e:
+                    logger.error(f"Batch item {index} failed: {e}")
+                    yield index, None, None, str(e)
+    finally:
+        model_pool.shutdown(wait=False, cancel_futures=True)
+        for future, (_, _, output_path) in pending.items():
+            future.cancel()
+            if output_path and os.path.exists(output_path):
+                os.remove(output_path)
+
+
+def write_batch_zip(items, errors, fileobj):
+    """
+    Synthesize the valid batch items into a zip with a manifest
+    
+    Args:
+        items: Batch items as submitted
+        errors: Validation error (or None) per item index
+        fileobj: Writable binary file receiving the zip
+    """
+    valid = [i for i, error in errors.items() if error is None]
+    manifest = [
+        {'index': index, 'id': batch_item_id(items, index), 'status': 'error', 'error': error}
+        for index, error in errors.items() if error is not None
+    ]
+    
+    with zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_STORED) as zf:
+        for index, audio, extension, error in run_batch([items[i] for i in valid]):
+            index = valid[index]
+            item_id = batch_item_id(items, index)
+            entry = {'index': index, 'id': item_id}
+            if error is None:
+                filename = f'{index:04d}_{secure_filename(item_id) or index}.{extension}'
+                zf.writestr(filename, audio)
+                entry.update({'status': 'ok', 'file': filename})
+            else:
+                entry.update({'status': 'error', 'error': error})
+            manifest.append(entry)
+        
+        manifest.sort(key=lambda entry: entry['index'])
+        zf.writestr('manifest.json', json.dumps({'items': manifest}, indent=2))
+
+
+def batch_item_id(items, index):
+    """Client-supplied id of a batch item, or its index"""
+    item = items[index]
+    return str(item.get('id', index)) if isinstance(item, dict) else str(index)
+
+
+@app.route('/api/batch', methods=['POST'])
+def batch_synthesize():
+    """
+    Synthesize many texts in one request
+    
+    Expected JSON body:
+    - items: List of {text, engine, voice, language, speaker_id, id}
+      (engine is 'edge-tts' (default) or 'coqui-tts')
+    - format: 'zip' (default) or 'ndjson'
+    - async: (optional) true to queue the batch as a job
+    
+    Returns a zip with one audio file per successful item plus manifest.json,
+    or an NDJSON stream with one line per item (base64 audio) as items finish.
+    Batches of more than BATCH_SYNC_MAX_ITEMS items (or with async) are queued
+    as a job producing the zip: the response is 202 with the job's URLs.
+    """
+    try:
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict) or not isinstance(payload.get('items'), list):
+            return jsonify({'error': 'Expected a JSON body with an items list'}), 400
+        
+        items = payload['items']
+        output_format = payload.get('format', 'zip')
+        queued = bool(payload.get('async')) or len(items) > BATCH_SYNC_MAX_ITEMS
+        
+        if not items:
+            return jsonify({'error': 'No items provided'}), 400
+        
+        if len(items) > BATCH_MAX_ITEMS:
+            return jsonify({'error': f'Too many items (max {BATCH_MAX_ITEMS})'}), 400
+        
+        if output_format not in ('zip', 'ndjson'):
+            return jsonify({'error': f'Unsupported format: {output_format}'}), 400
+        
+        if queued and output_format == 'ndjson':
+            return jsonify({
+                'error': f'NDJSON output is limited to {BATCH_SYNC_MAX_ITEMS} items; '
+                         'larger batches are queued as zip jobs (format: zip)'
+            }), 400
+        
+        max_text_length = JOB_MAX_TEXT_LENGTH if queued else MAX_TEXT_LENGTH
+        errors = {i: validate_batch_item(item, max_text_length) for i, item in enumerate(items)}
+        valid = [i for i, error in errors.items() if error is None]
+        
+        logger.info(f"Batch synthesis of {len(valid)} item(s), {len(items) - len(valid)} invalid")
+        
+        if queued:
+            def run(output_path):
+                with open(output_path, 'wb') as f:
+                    write_batch_zip(items, errors, f)
+            
+            job_id = get_job_queue().submit(run, 'batch', 'zip', 'application/zip', 'batch.zip')
+            return jsonify({
+                'job_id': job_id,
+                'status': 'queued',
+                'status_url': f'/api/jobs/{job_id}',
+                'audio_url': f'/api/jobs/{job_id}/audio'
+            }), 202
+        
+        if output_format == 'ndjson':
+            def generate():
+                for index, error in errors.items():
+                    if error is not None:
+                        yield json.dumps({'index': index, 'id': batch_item_id(items, index), 'status': 'error', 'error': error}) + '\n'
+                
+                for index, audio, extension, error in run_batch([items[i] for i in valid]):
+                    index = valid[index]
+                    line = {'index': index, 'id': batch_item_id(items, index)}
+                    if error is None:
+                        line.update({
+                            'status': 'ok',
+                            'format': extension,
+                            'audio': base64.b64encode(audio).decode('ascii')
+                        })
+                    else:
+                        line.update({'status': 'error', 'error': error})
+                    yield json.dumps(line) + '\n'
+            
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+        archive = io.BytesIO()
+        write_batch_zip(items, errors, archive)
+        return send_audio(archive.getvalue(), 'application/zip', 'batch.zip')
+    
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
         
     except Exception as e:
-        logger.error(f"Error in Coqui voice conversion: {e}")
+        logger.error(f"Error in batch synthesis: {e}")
         return jsonify({'error': str(e)}), 500
 
 
+# ===== Job Queue Endpoints =====
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """
+    Submit an asynchronous synthesis job
+    
+    Expected form data:
+    - engine: 'edge-tts', 'coqui-tts' or 'index-tts'
+    - text: Text to synthesize
+    - voice: (edge-tts) Voice name to use
+    - language: (coqui-tts, optional) Language code
+    - speaker_audio: (coqui-tts optional, index-tts required) Reference audio for voice cloning
+    - speaker_id: (instead of speaker_audio) Registered speaker id for voice cloning
+    - emotion_audio: (index-tts, optional) Reference audio for emotion
+    - emotion_intensity: (index-tts, optional, with emotion_audio) Emotion intensity 0.0-1.0
+    - emotion_vector: (index-tts, optional) JSON array of 8 emotion values
+    """
+    try:
+        engine = request.form.get('engine', 'edge-tts')
+        text = request.form.get('text')
+        
+        if not text or len(text.strip()) == 0:
+            return jsonify({'error': 'Text cannot be empty'}), 400
+        
+        if len(text) > JOB_MAX_TEXT_LENGTH:
+            return jsonify({'error': f'Text too long (max {JOB_MAX_TEXT_LENGTH} characters)'}), 413
+        
+        if engine == 'edge-tts':
+            voice_name = request.form.get('voice')
+            if not voice_name:
+                return jsonify({'error': 'No voice selected'}), 400
+            
+            cache_key = get_synthesis_cache().make_key('edge-tts', 'edge-tts', text, voice=voice_name)
+            
+            def run(output_path):
+                vc = get_voice_converter()
+                audio = synthesize_cached(
+                    cache_key,
+                    lambda path: vc.text_to_speech(text, voice_name, path),
+                    'mp3'
+                )
+                with open(output_path, 'wb') as f:
+                    f.write(audio)
+            
+            job_id = get_job_queue().submit(
+                run, engine, 'mp3', 'audio/mpeg', 'converted_speech.mp3'
+            )
+        
+        elif engine == 'coqui-tts':
+            language = request.form.get('language', 'en')
+            speaker_path, speaker_hash, is_temporary = None, None, False
+            
+            if 'speaker_audio' in request.files or request.form.get('speaker_id'):
+                speaker_path, speaker_hash, is_temporary = resolve_speaker_reference('speaker_audio')
+            
+            def run(output_path):
+                try:
+                    converter = get_coqui_tts_converter()
+                    if not converter.is_model_available():
+                        raise RuntimeError('Coqui TTS model not available')
+                    
+                    if speaker_path:
+                        cache_key = get_synthesis_cache().make_key(
+                            'coqui-tts', converter.model_name, text,
+                            language=language,
+                            quantize=converter.quantize,
+                            speaker=speaker_hash
+                        )
+                        synthesize = lambda path: converter.clone_voice(text, speaker_path, path, language)
+                    else:
+                        cache_key = get_synthesis_cache().make_key(
+                            'coqui-tts', converter.model_name, text,
+                            language=language,
+                            quantize=converter.quantize
+                        )
+                        synthesize = lambda path: converter.synthesize(text, path, language)
+                    
+                    audio = synthesize_cached(cache_key, synthesize, 'wav')
+                    with open(output_path, 'wb') as f:
+                        f.write(audio)
+                finally:
+                    if is_temporary and os.path.exists(speaker_path):
+                        os.remove(speaker_path)
+            
+            try:
+                job_id = get_job_queue().submit(
+                    run, engine, 'wav', 'audio/wav', 'coqui_speech.wav'
+                )
+            except QueueFullError:
+                if is_temporary and os.path.exists(speaker_path):
+                    os.remove(speaker_path)
+                raise
+        
+        elif engine == 'index-tts':
+            temporary_paths = []
+            speaker_path, speaker_hash, is_temporary = resolve_speaker_reference('speaker_audio')
+            if is_temporary:
+                temporary_paths.append(speaker_path)
+            
+            try:
+                emotion_params = {}
+                emotion_path, emotion_vector, emotion_intensity = None, None, 1.0
+                if request.files.get('emotion_audio'):
+                    emotion_path = os.path.join(UPLOAD_FOLDER, f'emo_{os.urandom(8).hex()}.wav')
+                    request.files['emotion_audio'].save(emotion_path)
+                    temporary_paths.append(emotion_path)
+                    emotion_intensity = float(request.form.get('emotion_intensity', 1.0))
+                    emotion_params = {
+                        'emotion_audio': hash_file(emotion_path),
+                        'emotion_intensity': emotion_intensity
+                    }
+                elif request.form.get('emotion_vector'):
+                    emotion_vector = json.loads(request.form['emotion_vector'])
+                    emotion_params = {'emotion_vector': emotion_vector}
+                
+                cache_key = get_synthesis_cache().make_key(
+                    'index-tts', 'index-tts2', text, speaker=speaker_hash, **emotion_params
+                )
+                
+                def run(output_path):
+                    try:
+                        converter = get_index_tts_converter()
+                        if not converter.is_model_available():
+                            raise RuntimeError('Index-TTS2 models not available. Please run setup.')
+                        
+                        if emotion_path:
+                            synthesize = lambda path: converter.synthesize_with_emotion_audio(
+                                text, speaker_path, emotion_path, path, emotion_intensity
+                            )
+                        elif emotion_vector is not None:
+                            synthesize = lambda path: converter.synthesize_with_emotion_vector(
+                                text, speaker_path, emotion_vector, path
+                            )
+                        else:
+                            synthesize = lambda path: converter.clone_voice(text, speaker_path, path)
+                        
+                        audio = synthesize_cached(cache_key, synthesize, 'wav')
+                        with open(output_path, 'wb') as f:
+                            f.write(audio)
+                    finally:
+                        for path in temporary_paths:
+                            if os.path.exists(path):
+                                os.remove(path)
+                
+                job_id = get_job_queue().submit(
+                    run, engine, 'wav', 'audio/wav', 'index_tts_speech.wav'
+                )
+            except Exception:
+                # The job never started, so nothing else will clean up the uploads
+                for path in temporary_paths:
+                    if os.path.exists(path):
+                        os.remove(path)
+                raise
+        
+        else:
+            return jsonify({'error': f'Unsupported engine: {engine}'}), 400
+        
+        return jsonify({
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': f'/api/jobs/{job_id}',
+            'audio_url': f'/api/jobs/{job_id}/audio'
+        }), 202
+    
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
+    
+    except SpeakerNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    except Exception as e:
+        logger.error(f"Error submitting job: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Get the status of a synthesis job
+    """
+    job = get_job_queue().describe(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify(job)
+
+
+@app.route('/api/jobs/<job_id>/audio', methods=['GET'])
+def get_job_audio(job_id):
+    """
+    Download the audio produced by a completed synthesis job
+    """
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    if job['status'] == 'failed':
+        return jsonify({'error': job['error']}), 500
+    
+    if job['status'] != 'completed':
+        return jsonify({'error': 'Job not finished', 'status': job['status']}), 409
+    
+    return send_file(
+        job['output_path'],
+        mimetype=job['mimetype'],
+        as_attachment=True,
+        download_name=job['download_name']
+    )
+
+
+if PRELOAD_MODELS and not MODEL_SERVER_SOCKET:
+    if PRELOAD_MODELS.lower() in ('1', 'true', 'yes'):
+        preload_models(['coqui-tts'])
+    else:
+        preload_models([e.strip() for e in PRELOAD_MODELS.split(',') if e.strip()])
+
+if INDEX_TTS_WARMUP == 'background':
+    if PRELOAD_MODELS:
+        # The app is imported in the gunicorn master then; a load thread
+        # started there would not survive the fork into the workers
+        logger.warning("INDEX_TTS_WARMUP=background is ignored with PRELOAD_MODELS; add index-tts to PRELOAD_MODELS instead")
+    else:
+        try:
+            get_index_tts_converter().start_background_load()
+        except Exception as e:
+            logger.warning(f"Could not start Index-TTS2 background warmup: {e}")
+
+
 if __name__ == '__main__':
     print("=" * 60)
     print("VoiceMaker by Kerdos AI - Voice Conversion Application")
@@ -0,0 +1,217 @@
+"""
+Audio Assembly Module
+Synthesizes long texts segment by segment and joins the resulting PCM with
+short crossfades into a single WAV file
+"""
+
+import os
+import struct
+import logging
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from text_segmentation import segment_for_engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CROSSFADE_MS = 20
+
+# RIFF/data size used when the length is not known up front
+UNKNOWN_SIZE = 0xFFFFFFFF
+
+
+def float_to_pcm16(audio) -> bytes:
+    """
+    Convert float PCM in [-1, 1] to 16-bit little-endian bytes
+
+    Args:
+        audio: Mono float samples
+
+    Returns:
+        Raw PCM bytes
+    """
+    samples = np.clip(np.asarray(audio, dtype=np.float32), -1.0, 1.0)
+    return (samples * 32767).astype('<i2').tobytes()
+
+
+def wav_header(sample_rate: int, data_size: Optional[int] = None, channels: int = 1) -> bytes:
+    """
+    Build a 16-bit PCM WAV header
+
+    Args:
+        sample_rate: Sample rate in Hz
+        data_size: Size of the PCM data in bytes; None for an open-ended
+            stream, which players read until the connection closes
+        channels: Number of channels
+
+    Returns:
+        44-byte header
+    """
+    block_align = channels * 2
+    if data_size is None:
+        riff_size = data_size = UNKNOWN_SIZE
+    else:
+        riff_size = 36 + data_size
+    return (
+        struct.pack('<4sI4s', b'RIFF', riff_size, b'WAVE')
+        + struct.pack('<4sIHHIIHH', b'fmt ', 16, 1, channels, sample_rate,
+                      sample_rate * block_align, block_align, 16)
+        + struct.pack('<4sI', b'data', data_size)
+    )
+
+
+def crossfade_concatenate(
+    chunks: List[np.ndarray],
+    sample_rate: int,
+    crossfade_ms: float = DEFAULT_CROSSFADE_MS
+) -> np.ndarray:
+    """
+    Join mono float PCM chunks, overlapping neighbours with a linear crossfade
+
+    Args:
+        chunks: Mono float arrays at the same sample rate
+        sample_rate: Sample rate of the chunks
+        crossfade_ms: Length of each crossfade
+
+    Returns:
+        Joined audio
+    """
+    chunks = [np.asarray(c, dtype=np.float32) for c in chunks if len(c)]
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+
+    fade = int(sample_rate * crossfade_ms / 1000)
+    result = chunks[0]
+    for chunk in chunks[1:]:
+        overlap = min(fade, len(result), len(chunk))
+        if overlap == 0:
+            result = np.concatenate([result, chunk])
+            continue
+        ramp = np.linspace(0.0, 1.0, overlap, dtype=np.float32)
+        mixed = result[-overlap:] * (1.0 - ramp) + chunk[:overlap] * ramp
+        result = np.concatenate([result[:-overlap], mixed, chunk[overlap:]])
+    return result
+
+
+class OverlapAdd:
+    """
+    Joins consecutive overlapping chunks with a linear crossfade, incrementally
+    Each chunk's first `overlap` samples cover the same time as the previous
+    chunk's last `overlap` samples; those are held back until the next chunk
+    arrives so finished audio can be written out (or streamed) right away
+    """
+
+    def __init__(self, overlap: int):
+        """
+        Args:
+            overlap: Samples shared by consecutive chunks
+        """
+        self.overlap = max(0, overlap)
+        self._tail = np.zeros(0, dtype=np.float32)
+
+    def push(self, chunk) -> np.ndarray:
+        """
+        Add the next chunk
+
+        Args:
+            chunk: Mono float samples
+
+        Returns:
+            Samples that are final and can be emitted
+        """
+        chunk = np.asarray(chunk, dtype=np.float32)
+        n = min(len(self._tail), len(chunk))
+        if n:
+            ramp = np.linspace(0.0, 1.0, n, dtype=np.float32)
+            mixed = self._tail[:n] * (1.0 - ramp) + chunk[:n] * ramp
+            chunk = np.concatenate([mixed, chunk[n:]])
+        elif len(self._tail):
+            chunk = np.concatenate([self._tail, chunk])
+
+        split = max(0, len(chunk) - self.overlap)
+        self._tail = chunk[split:]
+        return chunk[:split]
+
+    def flush(self) -> np.ndarray:
+        """Return the held-back samples at the end of the stream"""
+        tail, self._tail = self._tail, np.zeros(0, dtype=np.float32)
+        return tail
+
+
+def concatenate_wavs(
+    paths: List[str],
+    output_path: str,
+    crossfade_ms: float = DEFAULT_CROSSFADE_MS
+) -> str:
+    """
+    Join WAV files into one with short crossfades
+
+    Args:
+        paths: WAV files in order (same sample rate)
+        output_path: Path to save the joined audio
+        crossfade_ms: Length of each crossfade
+
+    Returns:
+        output_path
+    """
+    import soundfile as sf
+
+    chunks = []
+    sample_rate = None
+    for path in paths:
+        audio, rate = sf.read(path, dtype='float32', always_2d=False)
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        if sample_rate is None:
+            sample_rate = rate
+        elif rate != sample_rate:
+            raise ValueError(f"Segment sample rates differ: {rate} != {sample_rate}")
+        chunks.append(audio)
+
+    joined = crossfade_concatenate(chunks, sample_rate, crossfade_ms)
+    sf.write(output_path, joined, sample_rate, subtype='PCM_16')
+    return output_path
+
+
+def synthesize_segmented(
+    text: str,
+    output_path: str,
+    synthesize: Callable[[str, str], None],
+    engine: str,
+    language: Optional[str] = None,
+    crossfade_ms: float = DEFAULT_CROSSFADE_MS
+) -> str:
+    """
+    Synthesize text in segments sized for the engine and assemble them
+
+    Texts that fit a single call are synthesized directly.
+
+    Args:
+        text: Text to synthesize
+        output_path: Path to save the assembled WAV
+        synthesize: Callable (segment_text, segment_output_path) producing a WAV
+        engine: Engine id used to pick the segment budget
+        language: Language code
+        crossfade_ms: Length of each crossfade
+
+    Returns:
+        output_path
+    """
+    segments = segment_for_engine(text, engine, language)
+    if len(segments) == 1:
+        synthesize(text, output_path)
+        return output_path
+
+    logger.info(f"Synthesizing {len(segments)} segments with {engine}")
+    base, _ = os.path.splitext(output_path)
+    segment_paths = [f'{base}.part{index:04d}.wav' for index in range(len(segments))]
+    try:
+        for segment, segment_path in zip(segments, segment_paths):
+            synthesize(segment, segment_path)
+        return concatenate_wavs(segment_paths, output_path, crossfade_ms)
+    finally:
+        for segment_path in segment_paths:
+            if os.path.exists(segment_path):
+                os.remove(segment_path)
@@ -0,0 +1,118 @@
+"""
+Coqui TTS Benchmark
+Compares real-time factor and memory of the fp32 and int8 quantized models
+
+Each mode runs in its own process so memory figures are not mixed:
+    python benchmark_coqui.py --speaker-wav reference.wav
+    python benchmark_coqui.py --model tts_models/en/ljspeech/vits --modes fp32,int8
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+SENTENCES = [
+    "The quick brown fox jumps over the lazy dog.",
+    "Speech synthesis has improved dramatically over the last few years.",
+    "Please remember to bring your umbrella, because the forecast says it will rain this afternoon.",
+    "Our production servers run on CPUs only, so every millisecond of inference counts.",
+]
+
+
+def run_worker(args) -> dict:
+    """Load the model in one mode, synthesize the sentences and report timings"""
+    import soundfile as sf
+    from coqui_tts_converter import CoquiTTSConverter
+    from memory_stats import get_memory_usage
+
+    quantize = None if args.worker == 'fp32' else args.worker
+
+    start = time.perf_counter()
+    converter = CoquiTTSConverter(args.model, quantize=quantize)
+    load_seconds = time.perf_counter() - start
+    if not converter.is_model_available():
+        raise RuntimeError("Coqui TTS model could not be loaded")
+    memory_after_load = get_memory_usage()
+
+    def synthesize(text, output_path):
+        if args.speaker_wav:
+            converter.clone_voice(text, args.speaker_wav, output_path, args.language)
+        else:
+            converter.synthesize(text, output_path, args.language)
+
+    output_dir = tempfile.mkdtemp(prefix='coqui-bench-')
+    # One untimed pass so lazy initialisation does not count against the first sentence
+    synthesize(SENTENCES[0], os.path.join(output_dir, 'warmup.wav'))
+
+    synth_seconds = 0.0
+    audio_seconds = 0.0
+    for run in range(args.runs):
+        for index, text in enumerate(SENTENCES):
+            output_path = os.path.join(output_dir, f'{run}-{index}.wav')
+            start = time.perf_counter()
+            synthesize(text, output_path)
+            synth_seconds += time.perf_counter() - start
+            audio_seconds += sf.info(output_path).duration
+
+    return {
+        'mode': args.worker,
+        'load_seconds': round(load_seconds, 2),
+        'synth_seconds': round(synth_seconds, 2),
+        'audio_seconds': round(audio_seconds, 2),
+        'rtf': round(synth_seconds / audio_seconds, 3) if audio_seconds else None,
+        'rss_mb_after_load': memory_after_load.get('rss_mb'),
+        'rss_mb_after_synthesis': get_memory_usage().get('rss_mb'),
+        'output_dir': output_dir,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Coqui TTS fp32 vs int8")
+    parser.add_argument('--model', default="tts_models/multilingual/multi-dataset/xtts_v2")
+    parser.add_argument('--modes', default='fp32,int8', help='Comma-separated modes to compare')
+    parser.add_argument('--speaker-wav', help='Reference audio (required for XTTS)')
+    parser.add_argument('--language', default='en')
+    parser.add_argument('--runs', type=int, default=3, help='Passes over the test sentences')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args)))
+        return
+
+    results = []
+    for mode in [m.strip() for m in args.modes.split(',') if m.strip()]:
+        print(f"Benchmarking {mode}...", file=sys.stderr)
+        command = [
+            sys.executable, __file__, '--worker', mode,
+            '--model', args.model, '--language', args.language, '--runs', str(args.runs)
+        ]
+        if args.speaker_wav:
+            command += ['--speaker-wav', args.speaker_wav]
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            print(completed.stderr, file=sys.stderr)
+            sys.exit(f"{mode} run failed")
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    columns = ['mode', 'load_seconds', 'rtf', 'rss_mb_after_load', 'rss_mb_after_synthesis']
+    print(' | '.join(f'{c:>22}' for c in columns))
+    for result in results:
+        print(' | '.join(f'{str(result[c]):>22}' for c in columns))
+
+    baseline = next((r for r in results if r['mode'] == 'fp32'), None)
+    for result in results:
+        if baseline and result is not baseline and result['rtf'] and baseline['rtf']:
+            print(
+                f"{result['mode']}: {baseline['rtf'] / result['rtf']:.2f}x faster, "
+                f"{baseline['rss_mb_after_load'] - result['rss_mb_after_load']:.0f}MB less RSS after load"
+            )
+    print(f"Generated audio kept in: {', '.join(r['output_dir'] for r in results)}")
+
+
+if __name__ == "__main__":
+    main()
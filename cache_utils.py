@@ -0,0 +1,274 @@
+"""
+Cache Utilities Module
+Content hashing, a bounded in-memory LRU and a size-capped on-disk store
+shared by the synthesis and conditioning caches
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CACHE_ROOT = os.environ.get(
+    'VOICEMAKER_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'voicemaker')
+)
+
+
+def get_cache_dir(name: str) -> str:
+    """
+    Get (and create) a named directory under the cache root
+
+    Args:
+        name: Sub-directory name (e.g., 'synthesis')
+
+    Returns:
+        Absolute path of the directory
+    """
+    path = os.path.join(CACHE_ROOT, name)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def hash_bytes(data: bytes) -> str:
+    """SHA-256 hex digest of a byte string"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    SHA-256 hex digest of a file's content
+
+    Args:
+        path: Path to the file
+        chunk_size: Bytes read per iteration
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_params(**params) -> str:
+    """
+    Stable SHA-256 hex digest of keyword parameters
+
+    Values must be JSON-serializable; None values are dropped so adding an
+    optional parameter does not invalidate existing keys.
+    """
+    payload = json.dumps(
+        {k: v for k, v in params.items() if v is not None},
+        sort_keys=True,
+        separators=(',', ':'),
+        ensure_ascii=False
+    )
+    return hash_bytes(payload.encode('utf-8'))
+
+
+class LRUCache:
+    """
+    Thread-safe in-memory LRU bounded by item count and/or total size
+    """
+
+    def __init__(
+        self,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = len
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_items: Maximum number of entries (None for unbounded)
+            max_bytes: Maximum total size of entries (None for unbounded)
+            sizeof: Function returning the size of a value in bytes
+        """
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+
+        self._items: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value and mark it most recently used"""
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key: str, value: Any):
+        """Insert a value, evicting least recently used entries as needed"""
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._remove(key)
+            self._items[key] = value
+            self._sizes[key] = size
+            self._total_bytes += size
+
+            while self._items and self._over_budget():
+                oldest = next(iter(self._items))
+                self._remove(oldest)
+
+    def pop(self, key: str) -> Optional[Any]:
+        """Remove and return a value"""
+        with self._lock:
+            value = self._items.get(key)
+            self._remove(key)
+            return value
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def _remove(self, key: str):
+        if key in self._items:
+            del self._items[key]
+            self._total_bytes -= self._sizes.pop(key)
+
+    def _over_budget(self) -> bool:
+        if self.max_items is not None and len(self._items) > self.max_items:
+            return True
+        if self.max_bytes is not None and self._total_bytes > self.max_bytes:
+            return True
+        return False
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._items
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+
+class DiskCache:
+    """
+    Directory of content-addressed files capped at a total size
+    Oldest-accessed files are deleted first when the cap is exceeded
+    """
+
+    def __init__(self, directory: str, max_bytes: int, suffix: str = '.bin'):
+        """
+        Initialize the disk cache
+
+        Args:
+            directory: Directory holding the cached files
+            max_bytes: Maximum total size of the directory
+            suffix: File name suffix for cached entries
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        """Path of the file holding a key"""
+        return os.path.join(self.directory, f'{key}{self.suffix}')
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Read a cached entry, or None if absent"""
+        path = self.path_for(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+
+        # Refresh the access time used for eviction ordering
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Write an entry atomically and enforce the size cap"""
+        if len(data) > self.max_bytes:
+            return
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path_for(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self._enforce_limit()
+
+    def delete(self, key: str):
+        """Remove an entry if present"""
+        try:
+            os.remove(self.path_for(key))
+        except FileNotFoundError:
+            pass
+
+    def _enforce_limit(self):
+        """Delete least recently used files until under the size cap"""
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.directory):
+                if not name.endswith(self.suffix):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            if total <= self.max_bytes:
+                return
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except FileNotFoundError:
+                    pass
+
+    def size_bytes(self) -> int:
+        """Total size of cached files"""
+        total = 0
+        for name in os.listdir(self.directory):
+            if name.endswith(self.suffix):
+                try:
+                    total += os.path.getsize(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+        return total
@@ -0,0 +1,160 @@
+"""
+Conditioning Cache Module
+Caches speaker conditioning tensors (latents, embeddings) computed from
+reference audio, keyed by the audio's content hash
+"""
+
+import io
+import threading
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from cache_utils import LRUCache, DiskCache, get_cache_dir, hash_params
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _torch_dumps(value: Any) -> bytes:
+    import torch
+
+    buffer = io.BytesIO()
+    torch.save(value, buffer)
+    return buffer.getvalue()
+
+
+def _torch_loads(data: bytes) -> Any:
+    import torch
+
+    return torch.load(io.BytesIO(data), map_location='cpu')
+
+
+class ConditioningCache:
+    """
+    Bounded in-memory LRU of conditioning tensors backed by a disk tier
+    Values are stored on CPU; callers move them to their device
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_items: int = 256,
+        disk_max_bytes: int = 256 * 1024 * 1024,
+        dumps: Callable[[Any], bytes] = _torch_dumps,
+        loads: Callable[[bytes], Any] = _torch_loads
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            name: Cache name, used as the disk directory name
+            max_items: Maximum number of entries kept in memory
+            disk_max_bytes: Size budget of the disk tier (0 disables it)
+            dumps: Serializer for the disk tier
+            loads: Deserializer for the disk tier
+        """
+        self.name = name
+        self.memory = LRUCache(max_items=max_items)
+        self.disk = None
+        if disk_max_bytes > 0:
+            self.disk = DiskCache(get_cache_dir(name), disk_max_bytes, suffix='.pt')
+
+        self.dumps = dumps
+        self.loads = loads
+
+        self._counts = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    @staticmethod
+    def make_key(model: str, audio_hash: str, **params) -> str:
+        """
+        Build a cache key
+
+        Args:
+            model: Model the conditioning was computed with
+            audio_hash: Content hash of the reference audio
+            **params: Any preprocessing parameters that affect the result
+
+        Returns:
+            Hex digest identifying the conditioning
+        """
+        return hash_params(model=model, audio=audio_hash, **params)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Look up conditioning in memory, then on disk"""
+        value = self.memory.get(key)
+        if value is not None:
+            self._count('memory_hits')
+            return value
+
+        if self.disk is not None:
+            data = self.disk.get(key)
+            if data is not None:
+                try:
+                    value = self.loads(data)
+                except Exception as e:
+                    logger.warning(f"Discarding unreadable {self.name} entry: {e}")
+                    self.disk.delete(key)
+                else:
+                    self.memory.put(key, value)
+                    self._count('disk_hits')
+                    return value
+
+        return None
+
+    def put(self, key: str, value: Any):
+        """Store conditioning in both tiers"""
+        self.memory.put(key, value)
+        if self.disk is not None:
+            try:
+                self.disk.put(key, self.dumps(value))
+            except Exception as e:
+                logger.warning(f"Could not persist {self.name} entry: {e}")
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Return cached conditioning or compute and store it
+
+        Concurrent callers asking for the same key wait for a single computation.
+
+        Args:
+            key: Key from make_key()
+            compute: Callable producing the conditioning on a miss
+
+        Returns:
+            The conditioning value
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            value = self.get(key)
+            if value is None:
+                self._count('misses')
+                value = compute()
+                self.put(key, value)
+
+        with self._lock:
+            self._key_locks.pop(key, None)
+
+        return value
+
+    def record_miss(self):
+        """Count a miss for callers that compute outside get_or_compute()"""
+        self._count('misses')
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def stats(self) -> Dict:
+        """Get hit/miss counts and entry count"""
+        with self._lock:
+            counts = dict(self._counts)
+        counts['memory_entries'] = len(self.memory)
+        return counts
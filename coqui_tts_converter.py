@@ -4,13 +4,91 @@ Handles multilingual TTS, voice cloning, and voice conversion using Coqui TTS
 """
 
 import os
+import gc
+import sys
+import time
+import threading
 import logging
+import importlib.util
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple, Iterator
+
+import numpy as np
+
+from audio_assembly import synthesize_segmented, float_to_pcm16, crossfade_concatenate
+from cache_utils import hash_file
+from conditioning_cache import ConditioningCache
+from micro_batcher import MicroBatcher
+from model_pool import ModelPool, torch_module_bytes
+from model_quantization import load_or_quantize
+from thread_budget import apply_thread_budget, apply_to_current_thread
+from text_segmentation import segment_for_engine
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DEFAULT_MODEL_NAME = "tts_models/multilingual/multi-dataset/xtts_v2"
+XTTS_LATENT_CACHE_SIZE = int(os.environ.get('XTTS_LATENT_CACHE_SIZE', 256))
+XTTS_LATENT_CACHE_DISK_MB = int(os.environ.get('XTTS_LATENT_CACHE_DISK_MB', 256))
+# GPT tokens decoded per streamed chunk; smaller means earlier first audio
+XTTS_STREAM_CHUNK_SIZE = int(os.environ.get('XTTS_STREAM_CHUNK_SIZE', 20))
+# Concurrent synthesize() segments arriving within the window share one batch
+COQUI_BATCH_MAX_SIZE = int(os.environ.get('COQUI_BATCH_MAX_SIZE', 8))
+COQUI_BATCH_MAX_WAIT_MS = float(os.environ.get('COQUI_BATCH_MAX_WAIT_MS', 20))
+# 'int8' applies dynamic quantization to the model's linear layers (CPU only)
+COQUI_QUANTIZE = os.environ.get('COQUI_QUANTIZE', '').lower() or None
+# Memory budget for Coqui models kept loaded side by side
+COQUI_MODEL_POOL_MB = int(os.environ.get('COQUI_MODEL_POOL_MB', 4096))
+# Seconds before the on-disk details of the model catalog are re-read
+COQUI_MODEL_CATALOG_TTL = int(os.environ.get('COQUI_MODEL_CATALOG_TTL', 60))
+
+# Models offered through the API
+CURATED_MODELS = [
+    {
+        "id": "tts_models/multilingual/multi-dataset/xtts_v2",
+        "name": "XTTS v2",
+        "description": "Multilingual voice cloning (recommended)",
+        "features": ["voice_cloning", "multilingual"],
+        "languages": ["en", "es", "fr", "de", "it", "pt", "pl", "tr", "ru", "nl", "cs", "ar", "zh-cn", "ja", "hu", "ko"]
+    },
+    {
+        "id": "tts_models/multilingual/multi-dataset/your_tts",
+        "name": "YourTTS",
+        "description": "Voice cloning in English, French, Portuguese",
+        "features": ["voice_cloning", "multilingual"],
+        "languages": ["en", "fr-fr", "pt-br"]
+    },
+    {
+        "id": "tts_models/en/ljspeech/vits",
+        "name": "VITS (English)",
+        "description": "High-quality English TTS",
+        "features": ["high_quality"],
+        "languages": ["en"]
+    },
+    {
+        "id": "voice_conversion_models/multilingual/vctk/freevc24",
+        "name": "FreeVC",
+        "description": "Voice conversion model",
+        "features": ["voice_conversion"],
+        "languages": ["multilingual"]
+    }
+]
+
+_model_catalog = {'models': None, 'built_at': 0.0}
+_model_catalog_lock = threading.Lock()
+
+
+def _directory_size(path: Path) -> int:
+    """Total size of the files below a directory"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
 
 class CoquiTTSConverter:
     """
@@ -18,19 +96,44 @@ class CoquiTTSConverter:
     Provides multilingual TTS, voice cloning, and voice conversion
     """
     
-    def __init__(self, model_name: str = "tts_models/multilingual/multi-dataset/xtts_v2"):
+    # Every method that runs the model holds _model_lock, so the batcher
+    # thread and direct calls (cloning, streaming, latents) never run it at
+    # once. The model server lets concurrent calls reach these methods so
+    # that their requests can be batched together
+    thread_safe_methods = frozenset({'synthesize'})
+    
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME, quantize: Optional[str] = COQUI_QUANTIZE):
         """
         Initialize the Coqui TTS converter
         
         Args:
             model_name: Coqui TTS model to use (default: XTTS v2 for voice cloning)
+            quantize: 'int8' for dynamic int8 quantization on CPU, None for fp32
         """
         logger.info("Initializing Coqui TTS Converter...")
         
+        if quantize not in (None, 'int8'):
+            raise ValueError(f"Unsupported quantization mode: {quantize}")
+        
         self.model_name = model_name
+        self.quantize = quantize
         self.tts = None
         self.is_available = False
         self.device = "cpu"  # Will auto-detect GPU if available
+        # Serializes forward passes on self.tts (reentrant: cloning computes latents)
+        self._model_lock = threading.RLock()
+        self.latent_cache = ConditioningCache(
+            'xtts_latents',
+            max_items=XTTS_LATENT_CACHE_SIZE,
+            disk_max_bytes=XTTS_LATENT_CACHE_DISK_MB * 1024 * 1024
+        )
+        self.batcher = MicroBatcher(
+            self._synthesize_batch,
+            max_batch_size=COQUI_BATCH_MAX_SIZE,
+            max_wait_ms=COQUI_BATCH_MAX_WAIT_MS,
+            name="coqui-batcher",
+            initializer=apply_to_current_thread
+        )
         
         # Try to initialize Coqui TTS
         try:
@@ -44,6 +147,9 @@ class CoquiTTSConverter:
     def _initialize_model(self):
         """Initialize the Coqui TTS model"""
         try:
+            # Size torch's thread pools for this process before loading
+            apply_thread_budget()
+            
             import torch
             from TTS.api import TTS
             
@@ -57,6 +163,9 @@ class CoquiTTSConverter:
             
             self.tts = TTS(self.model_name, progress_bar=False).to(self.device)
             
+            if self.quantize == 'int8':
+                self._apply_int8_quantization()
+            
             logger.info("Coqui TTS model loaded successfully")
             
         except ImportError as e:
@@ -67,6 +176,25 @@ class CoquiTTSConverter:
         except Exception as e:
             raise RuntimeError(f"Failed to initialize Coqui TTS: {e}")
     
+    def _apply_int8_quantization(self):
+        """Swap the loaded model for its int8 dynamically quantized version"""
+        if self.device != "cpu":
+            logger.warning("int8 dynamic quantization is CPU only, keeping the fp32 model")
+            self.quantize = None
+            return
+        
+        # Re-quantize whenever any file of the downloaded model changes
+        model_path = self.get_model_path(self.model_name)
+        mtimes = [f.stat().st_mtime for f in model_path.iterdir()] if model_path.is_dir() else []
+        fingerprint = str(max(mtimes)) if mtimes else None
+        
+        synthesizer = self.tts.synthesizer
+        synthesizer.tts_model = load_or_quantize(synthesizer.tts_model, self.model_name, fingerprint)
+        
+        # Release the fp32 weights now rather than at the next collection
+        gc.collect()
+        logger.info("Using int8 quantized Coqui TTS model")
+    
     def synthesize(
         self,
         text: str,
@@ -90,12 +218,22 @@ class CoquiTTSConverter:
         try:
             logger.info(f"Synthesizing text in language: {language}")
             
-            # For single-speaker models
-            if "multilingual" not in self.model_name:
-                self.tts.tts_to_file(text=text, file_path=output_path)
+            segments = segment_for_engine(text, 'coqui-tts', language)
+            if self.supports_padded_batch():
+                # Segments of long texts and of concurrent requests are batched
+                # together; results come back in submission order
+                futures = [self.batcher.submit((segment, language)) for segment in segments]
+                wavs = [future.result() for future in futures]
             else:
-                # For multilingual models, language is required
-                self.tts.tts_to_file(text=text, language=language, file_path=output_path)
+                # Other models (e.g. XTTS) would only queue behind the batcher
+                # for one-item batches, so they run on the calling thread
+                wavs = self._synthesize_batch([(segment, language) for segment in segments])
+                for wav in wavs:
+                    if isinstance(wav, Exception):
+                        raise wav
+            
+            wav = crossfade_concatenate(wavs, self.get_sample_rate())
+            self.tts.synthesizer.save_wav(wav=wav, path=output_path)
             
             logger.info(f"Speech synthesized: {output_path}")
             return output_path
@@ -104,6 +242,85 @@ class CoquiTTSConverter:
             logger.error(f"Error in synthesis: {e}")
             raise
     
+    def supports_padded_batch(self) -> bool:
+        """Whether the loaded model can synthesize several texts in one padded forward pass"""
+        if self.tts is None:
+            return False
+        tts_model = getattr(self.tts.synthesizer, 'tts_model', None)
+        # Single-speaker, single-language VITS models take a padded batch
+        # with per-item lengths and report output lengths through y_mask
+        return (
+            type(tts_model).__name__ == 'Vits'
+            and not getattr(tts_model, 'speaker_manager', None)
+            and not getattr(tts_model, 'language_manager', None)
+        )
+    
+    def _synthesize_batch(self, items: List[Tuple[str, str]]) -> List:
+        """
+        Synthesize a batch of (text, language) items collected by the batcher
+        
+        Identical items are synthesized once. Models with padded batch support
+        run the whole batch in one forward pass; others run item by item.
+        
+        Returns:
+            Float waveform (or the exception raised) per item
+        """
+        with self._model_lock:
+            return self._synthesize_unique(items)
+    
+    def _synthesize_unique(self, items: List[Tuple[str, str]]) -> List:
+        """Body of _synthesize_batch, run with the model lock held"""
+        unique = list(dict.fromkeys(items))
+        
+        if len(unique) > 1 and self.supports_padded_batch():
+            try:
+                wavs = self._infer_padded_batch([text for text, _ in unique])
+                results = dict(zip(unique, wavs))
+                return [results[item] for item in items]
+            except Exception as e:
+                logger.warning(f"Padded batch failed, synthesizing items one by one: {e}")
+        
+        results = {}
+        for text, language in unique:
+            try:
+                if "multilingual" not in self.model_name:
+                    wav = self.tts.tts(text=text)
+                else:
+                    wav = self.tts.tts(text=text, language=language)
+                results[(text, language)] = np.asarray(wav, dtype=np.float32)
+            except Exception as e:
+                results[(text, language)] = e
+        return [results[item] for item in items]
+    
+    def _infer_padded_batch(self, texts: List[str]) -> List:
+        """Run one padded VITS forward pass and trim each output to its length"""
+        import torch
+        
+        tts_model = self.tts.synthesizer.tts_model
+        token_ids = [tts_model.tokenizer.text_to_ids(text) for text in texts]
+        lengths = torch.tensor([len(ids) for ids in token_ids], dtype=torch.long)
+        
+        inputs = torch.zeros(len(token_ids), int(lengths.max()), dtype=torch.long)
+        for row, ids in enumerate(token_ids):
+            inputs[row, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+        
+        with torch.inference_mode():
+            outputs = tts_model.inference(
+                inputs.to(self.device),
+                aux_input={'x_lengths': lengths.to(self.device)}
+            )
+        
+        hop_length = tts_model.config.audio.hop_length
+        frames = outputs['y_mask'].sum(dim=(1, 2)).long().cpu()
+        waveforms = outputs['model_outputs'].squeeze(1).float().cpu().numpy()
+        return [wav[:int(n) * hop_length] for wav, n in zip(waveforms, frames)]
+    
+    def get_batch_stats(self) -> Dict:
+        """Micro-batching counters for synthesize(); batching is only enabled for padded-batch models"""
+        if not self.supports_padded_batch():
+            return {'enabled': False, 'max_batch_size': 1}
+        return dict(self.batcher.stats(), enabled=True)
+    
     def clone_voice(
         self,
         text: str,
@@ -133,13 +350,27 @@ class CoquiTTSConverter:
             if not os.path.exists(speaker_wav):
                 raise FileNotFoundError(f"Reference audio not found: {speaker_wav}")
             
-            # Generate speech with voice cloning
-            self.tts.tts_to_file(
-                text=text,
-                speaker_wav=speaker_wav,
-                language=language,
-                file_path=output_path
-            )
+            if self.supports_cached_latents():
+                # Reuse conditioning latents computed from this reference before;
+                # every segment of a long text shares them
+                gpt_cond_latent, speaker_embedding = self.get_speaker_latents(speaker_wav)
+                
+                def synthesize_segment(segment: str, segment_path: str):
+                    with self._model_lock:
+                        wav = self._xtts_inference(segment, language, gpt_cond_latent, speaker_embedding)
+                    self.tts.synthesizer.save_wav(wav=wav, path=segment_path)
+            else:
+                def synthesize_segment(segment: str, segment_path: str):
+                    # Generate speech with voice cloning
+                    with self._model_lock:
+                        self.tts.tts_to_file(
+                            text=segment,
+                            speaker_wav=speaker_wav,
+                            language=language,
+                            file_path=segment_path
+                        )
+            
+            synthesize_segmented(text, output_path, synthesize_segment, 'coqui-tts', language)
             
             logger.info(f"Voice cloned successfully: {output_path}")
             return output_path
@@ -148,6 +379,125 @@ class CoquiTTSConverter:
             logger.error(f"Error in voice cloning: {e}")
             raise
     
+    def supports_cached_latents(self) -> bool:
+        """Whether the loaded model can synthesize from precomputed XTTS latents"""
+        if "xtts" not in self.model_name or self.tts is None:
+            return False
+        tts_model = getattr(getattr(self.tts, 'synthesizer', None), 'tts_model', None)
+        return hasattr(tts_model, 'get_conditioning_latents') and hasattr(tts_model, 'inference')
+    
+    def get_speaker_latents(self, speaker_wav: str) -> Tuple:
+        """
+        Get XTTS conditioning latents for a reference audio file
+        
+        Latents are cached by the audio's content hash, in memory and on disk,
+        so each reference is only encoded once.
+        
+        Args:
+            speaker_wav: Path to reference audio file
+        
+        Returns:
+            (gpt_cond_latent, speaker_embedding) on the model's device
+        """
+        tts_model = self.tts.synthesizer.tts_model
+        # Latents come from the (possibly quantized) conditioning encoder
+        key = self.latent_cache.make_key(
+            self.model_name, hash_file(speaker_wav), quantize=self.quantize
+        )
+        
+        def compute():
+            logger.info(f"Computing XTTS conditioning latents for: {speaker_wav}")
+            with self._model_lock:
+                gpt_cond_latent, speaker_embedding = tts_model.get_conditioning_latents(
+                    audio_path=[speaker_wav]
+                )
+            return gpt_cond_latent.cpu(), speaker_embedding.cpu()
+        
+        gpt_cond_latent, speaker_embedding = self.latent_cache.get_or_compute(key, compute)
+        return gpt_cond_latent.to(self.device), speaker_embedding.to(self.device)
+    
+    def _sampling_settings(self) -> Dict:
+        """XTTS sampling settings from the model config"""
+        config = self.tts.synthesizer.tts_model.config
+        return {
+            name: getattr(config, name)
+            for name in ('temperature', 'length_penalty', 'repetition_penalty', 'top_k', 'top_p')
+            if hasattr(config, name)
+        }
+    
+    def _xtts_inference(self, text: str, language: str, gpt_cond_latent, speaker_embedding):
+        """Run XTTS inference from latents with the model config's sampling settings"""
+        out = self.tts.synthesizer.tts_model.inference(
+            text,
+            language,
+            gpt_cond_latent,
+            speaker_embedding,
+            enable_text_splitting=True,
+            **self._sampling_settings()
+        )
+        return out['wav']
+    
+    def supports_streaming(self) -> bool:
+        """Whether the loaded model can stream audio while it is being decoded"""
+        return (
+            self.supports_cached_latents()
+            and hasattr(self.tts.synthesizer.tts_model, 'inference_stream')
+        )
+    
+    def get_sample_rate(self) -> int:
+        """Sample rate of the audio the loaded model produces"""
+        return self.tts.synthesizer.output_sample_rate
+    
+    def stream_clone_voice(
+        self,
+        text: str,
+        speaker_wav: str,
+        language: str = "en",
+        stream_chunk_size: int = XTTS_STREAM_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """
+        Clone a voice and yield the audio while it is being generated
+        
+        Args:
+            text: Text to synthesize
+            speaker_wav: Path to reference audio file (3-30 seconds)
+            language: Language code
+            stream_chunk_size: GPT tokens decoded per chunk
+        
+        Yields:
+            Mono 16-bit little-endian PCM chunks at get_sample_rate()
+        """
+        if not self.is_available:
+            raise RuntimeError("Coqui TTS is not available.")
+        if not self.supports_streaming():
+            raise NotImplementedError(f"Streaming is not supported by {self.model_name}")
+        if not os.path.exists(speaker_wav):
+            raise FileNotFoundError(f"Reference audio not found: {speaker_wav}")
+        
+        logger.info(f"Streaming cloned voice from: {speaker_wav}")
+        
+        tts_model = self.tts.synthesizer.tts_model
+        gpt_cond_latent, speaker_embedding = self.get_speaker_latents(speaker_wav)
+        settings = self._sampling_settings()
+        
+        # Each segment fits one GPT pass, so streaming never waits on a long text
+        for segment in segment_for_engine(text, 'coqui-tts', language):
+            # inference_stream stores this request's prefix embedding on the
+            # shared GPT model, so no other call may use the model until the
+            # segment's generator is exhausted
+            with self._model_lock:
+                chunks = tts_model.inference_stream(
+                    segment,
+                    language,
+                    gpt_cond_latent,
+                    speaker_embedding,
+                    stream_chunk_size=stream_chunk_size,
+                    enable_text_splitting=False,
+                    **settings
+                )
+                for chunk in chunks:
+                    yield float_to_pcm16(chunk.squeeze().cpu().numpy())
+    
     def convert_voice(
         self,
         source_wav: str,
@@ -177,17 +527,15 @@ class CoquiTTSConverter:
             if not os.path.exists(target_wav):
                 raise FileNotFoundError(f"Target audio not found: {target_wav}")
             
-            # Check if current model supports voice conversion
+            # Only voice conversion models can use the source recording;
+            # see voice_conversion_engine.VoiceConversionEngine
             if "voice_conversion" not in self.model_name:
-                # Use TTS with voice conversion as fallback
-                logger.info("Using TTS with voice conversion")
-                self.tts.tts_with_vc_to_file(
-                    text="",  # Empty for voice conversion
-                    speaker_wav=target_wav,
-                    file_path=output_path
+                raise NotImplementedError(
+                    f"{self.model_name} is not a voice conversion model; "
+                    "use VoiceConversionEngine instead"
                 )
-            else:
-                # Use dedicated voice conversion model
+            
+            with self._model_lock:
                 self.tts.voice_conversion_to_file(
                     source_wav=source_wav,
                     target_wav=target_wav,
@@ -201,57 +549,82 @@ class CoquiTTSConverter:
             logger.error(f"Error in voice conversion: {e}")
             raise
     
+    @staticmethod
+    def get_model_path(model_name: str = DEFAULT_MODEL_NAME) -> Path:
+        """
+        Directory where Coqui TTS stores a downloaded model
+        
+        Mirrors TTS.utils.generic_utils.get_user_data_dir() so it can be
+        resolved without importing TTS.
+        """
+        if os.environ.get("TTS_HOME"):
+            base = Path(os.environ["TTS_HOME"])
+        elif os.environ.get("XDG_DATA_HOME"):
+            base = Path(os.environ["XDG_DATA_HOME"])
+        elif sys.platform == "win32":
+            base = Path(os.environ.get("APPDATA", Path.home()))
+        elif sys.platform == "darwin":
+            base = Path.home() / "Library" / "Application Support"
+        else:
+            base = Path.home() / ".local" / "share"
+        return base / "tts" / model_name.replace("/", "--")
+    
+    @staticmethod
+    def probe(model_name: str = DEFAULT_MODEL_NAME) -> Dict:
+        """
+        Check whether Coqui TTS can run, without importing it or loading a model
+        
+        Args:
+            model_name: Model to look for on disk
+        
+        Returns:
+            dict with 'available' (packages importable), 'model_downloaded'
+            and 'model_path'
+        """
+        importable = all(
+            importlib.util.find_spec(package) is not None
+            for package in ("TTS", "torch")
+        )
+        model_path = CoquiTTSConverter.get_model_path(model_name)
+        
+        return {
+            'available': importable,
+            'model_downloaded': (model_path / "config.json").exists(),
+            'model_path': str(model_path)
+        }
+    
     @staticmethod
     def list_available_models() -> List[Dict]:
         """
         List available Coqui TTS models
         
+        The curated list is merged with what is installed locally (whether the
+        model is downloaded and its size on disk). The result is cached and
+        only rebuilt after COQUI_MODEL_CATALOG_TTL seconds, without importing TTS.
+        
         Returns:
             List of model information dictionaries
         """
-        try:
-            from TTS.api import TTS
-            
-            # Get all available models
-            all_models = TTS().list_models()
+        with _model_catalog_lock:
+            if (
+                _model_catalog['models'] is not None
+                and time.time() - _model_catalog['built_at'] < COQUI_MODEL_CATALOG_TTL
+            ):
+                return _model_catalog['models']
             
-            # Curate popular models
-            popular_models = [
-                {
-                    "id": "tts_models/multilingual/multi-dataset/xtts_v2",
-                    "name": "XTTS v2",
-                    "description": "Multilingual voice cloning (recommended)",
-                    "features": ["voice_cloning", "multilingual"],
-                    "languages": ["en", "es", "fr", "de", "it", "pt", "pl", "tr", "ru", "nl", "cs", "ar", "zh-cn", "ja", "hu", "ko"]
-                },
-                {
-                    "id": "tts_models/multilingual/multi-dataset/your_tts",
-                    "name": "YourTTS",
-                    "description": "Voice cloning in English, French, Portuguese",
-                    "features": ["voice_cloning", "multilingual"],
-                    "languages": ["en", "fr-fr", "pt-br"]
-                },
-                {
-                    "id": "tts_models/en/ljspeech/vits",
-                    "name": "VITS (English)",
-                    "description": "High-quality English TTS",
-                    "features": ["high_quality"],
-                    "languages": ["en"]
-                },
-                {
-                    "id": "voice_conversion_models/multilingual/vctk/freevc24",
-                    "name": "FreeVC",
-                    "description": "Voice conversion model",
-                    "features": ["voice_conversion"],
-                    "languages": ["multilingual"]
-                }
-            ]
-            
-            return popular_models
+            models = []
+            for model in CURATED_MODELS:
+                model_path = CoquiTTSConverter.get_model_path(model['id'])
+                downloaded = (model_path / "config.json").exists()
+                models.append({
+                    **model,
+                    'downloaded': downloaded,
+                    'size_mb': round(_directory_size(model_path) / (1024 * 1024), 1) if downloaded else None
+                })
             
-        except Exception as e:
-            logger.error(f"Error listing models: {e}")
-            return []
+            _model_catalog['models'] = models
+            _model_catalog['built_at'] = time.time()
+            return models
     
     @staticmethod
     def get_supported_languages() -> List[Dict]:
@@ -293,13 +666,28 @@ class CoquiTTSConverter:
         """
         try:
             logger.info(f"Switching to model: {model_name}")
-            self.model_name = model_name
-            self._initialize_model()
+            with self._model_lock:
+                self.model_name = model_name
+                self._initialize_model()
             logger.info("Model switched successfully")
         except Exception as e:
             logger.error(f"Error switching model: {e}")
             raise
     
+    def get_memory_bytes(self) -> int:
+        """Memory held by the loaded model's weights (0 when not loaded)"""
+        if self.tts is None:
+            return 0
+        synthesizer = self.tts.synthesizer
+        return torch_module_bytes(
+            getattr(synthesizer, 'tts_model', None),
+            getattr(synthesizer, 'vocoder_model', None)
+        )
+    
+    def close(self):
+        """Stop background work so the model can be freed once in-flight requests finish"""
+        self.batcher.close()
+    
     def is_model_available(self) -> bool:
         """Check if Coqui TTS model is available"""
         return self.is_available
@@ -347,6 +735,29 @@ class CoquiTTSConverter:
             }
 
 
+def create_model_pool(max_mb: int = COQUI_MODEL_POOL_MB) -> ModelPool:
+    """
+    Pool of Coqui converters keyed by model name
+    
+    The default model stays resident; other models are loaded on request
+    and the least recently used are evicted when the budget is exceeded.
+    
+    Args:
+        max_mb: Memory budget for the loaded weights in MB
+    
+    Returns:
+        ModelPool of CoquiTTSConverter instances
+    """
+    return ModelPool(
+        CoquiTTSConverter,
+        max_bytes=max_mb * 1024 * 1024,
+        sizeof=lambda converter: converter.get_memory_bytes(),
+        on_evict=lambda converter: converter.close(),
+        pinned=[DEFAULT_MODEL_NAME],
+        name="coqui"
+    )
+
+
 if __name__ == "__main__":
     # Test the Coqui TTS converter
     print("Testing Coqui TTS Converter...")
@@ -0,0 +1,149 @@
+"""
+Event Loop Thread Module
+Long-lived asyncio event loop running on a background thread, shared by
+all request threads of a worker process
+"""
+
+import os
+import asyncio
+import threading
+import logging
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import AsyncIterator, Awaitable, Iterator, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class EventLoopThread:
+    """
+    Background thread owning one asyncio event loop
+    Coroutines can be submitted from any thread and are multiplexed on the loop
+    """
+
+    def __init__(self, name: str = "event-loop"):
+        """
+        Initialize the loop thread (the loop starts on first use)
+
+        Args:
+            name: Name given to the background thread
+        """
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _ensure_running(self) -> asyncio.AbstractEventLoop:
+        """Start the loop if needed (again after a fork, threads do not survive it)"""
+        if self._is_running():
+            return self._loop
+
+        with self._lock:
+            if not self._is_running():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=self._run_loop,
+                    args=(loop,),
+                    name=self.name,
+                    daemon=True
+                )
+                thread.start()
+
+                self._loop = loop
+                self._thread = thread
+                self._pid = os.getpid()
+                logger.info(f"Started event loop thread '{self.name}' in process {self._pid}")
+
+        return self._loop
+
+    def _is_running(self) -> bool:
+        return (
+            self._loop is not None
+            and self._pid == os.getpid()
+            and self._thread.is_alive()
+        )
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop):
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running event loop"""
+        return self._ensure_running()
+
+    def submit(self, coro: Awaitable) -> Future:
+        """
+        Schedule a coroutine on the loop from any thread
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            concurrent.futures.Future resolving to the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_running())
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None):
+        """
+        Run a coroutine on the loop and block until it finishes
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait before giving up
+
+        Returns:
+            The coroutine's result
+        """
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def iterate(self, agen: AsyncIterator) -> Iterator:
+        """
+        Consume an async generator from synchronous code
+
+        Args:
+            agen: Async generator to drive on the loop
+
+        Yields:
+            Items produced by the async generator
+        """
+        try:
+            while True:
+                try:
+                    item = self.run(self._anext(agen))
+                except StopAsyncIteration:
+                    break
+                yield item
+        finally:
+            self.run(agen.aclose())
+
+    @staticmethod
+    async def _anext(agen: AsyncIterator):
+        # run_coroutine_threadsafe() needs a real coroutine, not an awaitable
+        return await agen.__anext__()
+
+    def stop(self):
+        """Stop the loop and wait for its thread to exit"""
+        with self._lock:
+            if not self._is_running():
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+
+
+_shared_loop_thread = EventLoopThread(name="edge-tts-loop")
+
+
+def get_event_loop_thread() -> EventLoopThread:
+    """Get the event loop thread shared by this worker process"""
+    return _shared_loop_thread
@@ -0,0 +1,47 @@
+"""
+Gunicorn configuration
+Loaded automatically by gunicorn from the working directory; command-line
+flags (e.g., --workers in the Procfile) take precedence
+"""
+
+import os
+import sys
+
+# With PRELOAD_MODELS set, app.py loads the model weights in the master before
+# forking so all workers share them copy-on-write instead of each loading a copy
+preload_app = bool(os.environ.get('PRELOAD_MODELS'))
+
+# WebSocket sessions (/ws/coqui/convert-voice, served by flask-sock) hold a
+# thread for their whole length, which a sync worker cannot do without
+# blocking every other request; gthread workers serve requests from a pool
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+
+def on_starting(server):
+    """
+    Tell the thread budget how many workers and threads share the cores
+
+    Without preload_app, workers import app.py after this and read these.
+    With it, app.py was already imported by the master; post_fork corrects it.
+    """
+    os.environ.setdefault('WEB_CONCURRENCY', str(server.cfg.workers))
+    os.environ.setdefault('WEB_THREADS', str(server.cfg.threads))
+
+
+def post_fork(server, worker):
+    """Size the new worker's thread budget and report how much memory it shares with the master"""
+    app_module = sys.modules.get('app')
+    if app_module is not None:
+        # Preloaded: app.py split the threads before on_starting ran, using defaults
+        app_module.configure_thread_budget(
+            inference_threads=int(os.environ['WEB_THREADS']) + app_module.JOB_WORKERS
+        )
+
+    from memory_stats import get_memory_usage
+
+    usage = get_memory_usage()
+    server.log.info(
+        f"Worker {worker.pid} started: rss={usage.get('rss_mb')}MB "
+        f"shared={usage.get('shared_mb')}MB private={usage.get('private_mb')}MB"
+    )
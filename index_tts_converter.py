@@ -5,13 +5,37 @@ Handles advanced voice cloning and emotional speech synthesis using Index-TTS2
 
 import os
 import sys
+import time
 import logging
+import tempfile
+import threading
+import importlib.util
 from pathlib import Path
-from typing import Optional, List, Dict, Union
+from typing import Optional, List, Dict, Tuple, Union
+
+from audio_assembly import synthesize_segmented
+from cache_utils import hash_file
+from conditioning_cache import ConditioningCache
+from memory_stats import get_memory_usage
+from model_pool import torch_module_bytes
+from thread_budget import apply_thread_budget
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Prompt conditioning is several MB per speaker, so fewer entries stay in memory
+INDEX_TTS_PROMPT_CACHE_SIZE = int(os.environ.get('INDEX_TTS_PROMPT_CACHE_SIZE', 16))
+INDEX_TTS_PROMPT_CACHE_DISK_MB = int(os.environ.get('INDEX_TTS_PROMPT_CACHE_DISK_MB', 1024))
+
+# Text synthesized (and discarded) to compute a speaker's prompt conditioning,
+# which IndexTTS2 only computes inside infer()
+PROMPT_PRECOMPUTE_TEXT = "Hello."
+
+# IndexTTS2 keeps the conditioning of the last speaker and emotion prompt in
+# these attributes, reusing them while the prompt path stays the same
+SPEAKER_PROMPT_ATTRIBUTES = ('cache_spk_cond', 'cache_s2mel_style', 'cache_s2mel_prompt', 'cache_mel')
+EMOTION_PROMPT_ATTRIBUTES = ('cache_emo_cond',)
+
 
 class IndexTTSConverter:
     """
@@ -19,38 +43,184 @@ class IndexTTSConverter:
     Provides voice cloning and emotional speech synthesis
     """
     
+    # Attributes that change after construction (the model loads lazily);
+    # the model server tells clients not to cache them
+    volatile_attributes = frozenset({
+        'model', 'is_available', 'load_state', 'load_error', 'load_seconds', 'load_rss_delta_mb'
+    })
+    
+    # Methods the model server may call while another call holds the engine
+    # (e.g. during a load), so a background warmup returns immediately
+    thread_safe_methods = frozenset({'start_background_load', 'load_stats'})
+    
     def __init__(self, model_dir: str = None, use_fp16: bool = False):
         """
         Initialize the Index-TTS2 converter
         
+        The model is not loaded here; it loads on first use, or ahead of time
+        with ensure_loaded() / start_background_load().
+        
         Args:
             model_dir: Directory containing Index-TTS2 models
             use_fp16: Use half-precision for faster inference (CPU compatible)
         """
-        logger.info("Initializing Index-TTS2 Converter...")
-        
         self.model_dir = model_dir or self._get_default_model_dir()
         self.use_fp16 = use_fp16
         self.model = None
         self.is_available = False
         
-        # Try to initialize Index-TTS2
-        try:
-            self._initialize_model()
-            self.is_available = True
-            logger.info("Index-TTS2 Converter ready")
-        except Exception as e:
-            logger.warning(f"Index-TTS2 not available: {e}")
-            logger.info("Index-TTS2 features will be disabled. Please run setup.")
+        # Load state; _load_lock makes concurrent first calls share one load
+        # and is held for the whole load, so starting a background load uses
+        # the separate _state_lock and never waits for it
+        self._load_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self.load_state = 'unloaded'
+        self.load_error = None
+        self.load_seconds = None
+        self.load_rss_delta_mb = None
+        self._background_load = None
+        
+        # Speaker/emotion prompt features by audio content hash; _infer_lock
+        # keeps swapping them into the model and inferring together
+        self.prompt_cache = ConditioningCache(
+            'index_tts_prompts',
+            max_items=INDEX_TTS_PROMPT_CACHE_SIZE,
+            disk_max_bytes=INDEX_TTS_PROMPT_CACHE_DISK_MB * 1024 * 1024
+        )
+        self._infer_lock = threading.Lock()
     
-    def _get_default_model_dir(self) -> str:
+    def ensure_loaded(self) -> bool:
+        """
+        Load the model if it has not been loaded yet
+        
+        Thread-safe: callers arriving during a load wait for it instead of
+        starting their own. A failed load is not retried.
+        
+        Returns:
+            True if the model is available
+        """
+        if self.load_state in ('ready', 'failed'):
+            return self.is_available
+        
+        with self._load_lock:
+            if self.load_state in ('ready', 'failed'):
+                return self.is_available
+            
+            logger.info("Initializing Index-TTS2 Converter...")
+            self.load_state = 'loading'
+            rss_before = get_memory_usage().get('rss_mb')
+            start = time.time()
+            
+            try:
+                self._initialize_model()
+                self.is_available = True
+                self.load_state = 'ready'
+                logger.info("Index-TTS2 Converter ready")
+            except Exception as e:
+                self.load_error = str(e)
+                self.load_state = 'failed'
+                logger.warning(f"Index-TTS2 not available: {e}")
+                logger.info("Index-TTS2 features will be disabled. Please run setup.")
+            
+            self.load_seconds = round(time.time() - start, 3)
+            rss_after = get_memory_usage().get('rss_mb')
+            if rss_before is not None and rss_after is not None:
+                self.load_rss_delta_mb = round(rss_after - rss_before, 1)
+            logger.info(f"Index-TTS2 load finished in {self.load_seconds}s")
+        
+        return self.is_available
+    
+    def start_background_load(self) -> Dict:
+        """
+        Start loading the model in a background thread and return immediately
+        
+        Does not wait for a load already in progress.
+        
+        Returns:
+            Current load stats
+        """
+        with self._state_lock:
+            if self.load_state == 'unloaded' and self._background_load is None:
+                self.load_state = 'loading'
+                self._background_load = threading.Thread(
+                    target=self.ensure_loaded,
+                    name='index-tts-warmup',
+                    daemon=True
+                )
+                self._background_load.start()
+        return self.load_stats()
+    
+    def get_memory_bytes(self) -> int:
+        """Memory held by the loaded model's torch modules"""
+        if self.model is None:
+            return 0
+        
+        import torch
+        
+        modules = [
+            value for value in vars(self.model).values()
+            if isinstance(value, torch.nn.Module)
+        ]
+        return torch_module_bytes(*modules)
+    
+    def load_stats(self) -> Dict:
+        """
+        Load state, timing and memory of the model
+        
+        Returns:
+            dict with 'state', 'load_seconds', 'model_mb', 'rss_delta_mb', 'error'
+            and the prompt cache counts
+        """
+        return {
+            'state': self.load_state,
+            'load_seconds': self.load_seconds,
+            'model_mb': (
+                round(self.get_memory_bytes() / (1024 * 1024), 1)
+                if self.load_state == 'ready' else None
+            ),
+            'rss_delta_mb': self.load_rss_delta_mb,
+            'error': self.load_error,
+            'prompt_cache': self.prompt_cache.stats()
+        }
+    
+    @staticmethod
+    def _get_default_model_dir() -> str:
         """Get default model directory"""
         base_dir = Path(__file__).parent
         return str(base_dir / "index-tts" / "checkpoints")
     
+    @staticmethod
+    def probe(model_dir: str = None) -> Dict:
+        """
+        Check whether Index-TTS2 can run, without importing it or loading the model
+        
+        Args:
+            model_dir: Directory containing Index-TTS2 models
+        
+        Returns:
+            dict with 'available', 'importable', 'checkpoints_present' and 'model_dir'
+        """
+        model_dir = model_dir or IndexTTSConverter._get_default_model_dir()
+        
+        importable = (
+            importlib.util.find_spec("indextts") is not None
+            or (Path(__file__).parent / "index-tts" / "indextts").is_dir()
+        )
+        checkpoints_present = (Path(model_dir) / "config.yaml").exists()
+        
+        return {
+            'available': importable and checkpoints_present,
+            'importable': importable,
+            'checkpoints_present': checkpoints_present,
+            'model_dir': model_dir
+        }
+    
     def _initialize_model(self):
         """Initialize the Index-TTS2 model"""
         try:
+            # Size torch's thread pools for this process before loading
+            apply_thread_budget()
+            
             # Add index-tts to Python path
             index_tts_path = Path(__file__).parent / "index-tts"
             if index_tts_path.exists():
@@ -87,6 +257,116 @@ class IndexTTSConverter:
         except Exception as e:
             raise RuntimeError(f"Failed to initialize Index-TTS2: {e}")
     
+    def _prompt_keys(self, speaker_audio: str, emotion_audio: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Cache keys of the speaker and emotion prompt conditioning
+        
+        Without emotion audio IndexTTS2 takes the emotion from the speaker audio.
+        """
+        speaker_hash = hash_file(speaker_audio)
+        emotion_hash = hash_file(emotion_audio) if emotion_audio else speaker_hash
+        return (
+            self.prompt_cache.make_key('index-tts2', speaker_hash, prompt='speaker'),
+            self.prompt_cache.make_key('index-tts2', emotion_hash, prompt='emotion')
+        )
+    
+    def _restore_prompt(self, key: str, attributes: Tuple[str, ...], path_attribute: str, path: str) -> bool:
+        """
+        Put cached prompt conditioning into the model so infer() skips recomputing it
+        
+        Returns:
+            True on a cache hit; on a miss the model is made to recompute
+        """
+        if not all(hasattr(self.model, name) for name in attributes + (path_attribute,)):
+            return False
+        
+        cached = self.prompt_cache.get(key)
+        if cached is None:
+            # The same path may have held different audio before
+            self.prompt_cache.record_miss()
+            setattr(self.model, path_attribute, None)
+            return False
+        
+        for name in attributes:
+            setattr(self.model, name, cached[name].to(self.model.device))
+        setattr(self.model, path_attribute, path)
+        return True
+    
+    def _store_prompt(self, key: str, attributes: Tuple[str, ...], path_attribute: str, path: str):
+        """Cache the prompt conditioning infer() just computed for path"""
+        if getattr(self.model, path_attribute, None) != path:
+            return
+        values = {name: getattr(self.model, name, None) for name in attributes}
+        if any(value is None for value in values.values()):
+            return
+        self.prompt_cache.put(key, {name: value.detach().cpu() for name, value in values.items()})
+    
+    def _infer(self, prompt_keys: Tuple[str, str], speaker_audio: str, text: str, output_path: str, **kwargs):
+        """
+        Run IndexTTS2 inference with prompt conditioning served from the cache
+        
+        Args:
+            prompt_keys: Result of _prompt_keys()
+            speaker_audio: Reference audio for speaker voice
+            text: Text to synthesize
+            output_path: Path to save output audio
+            **kwargs: Further IndexTTS2.infer() arguments (emotion settings)
+        """
+        speaker_key, emotion_key = prompt_keys
+        emotion_audio = kwargs.get('emo_audio_prompt') or speaker_audio
+        
+        with self._infer_lock:
+            speaker_hit = self._restore_prompt(
+                speaker_key, SPEAKER_PROMPT_ATTRIBUTES, 'cache_spk_audio_prompt', speaker_audio
+            )
+            emotion_hit = self._restore_prompt(
+                emotion_key, EMOTION_PROMPT_ATTRIBUTES, 'cache_emo_audio_prompt', emotion_audio
+            )
+            
+            self.model.infer(
+                spk_audio_prompt=speaker_audio,
+                text=text,
+                output_path=output_path,
+                verbose=True,
+                **kwargs
+            )
+            
+            if not speaker_hit:
+                self._store_prompt(speaker_key, SPEAKER_PROMPT_ATTRIBUTES, 'cache_spk_audio_prompt', speaker_audio)
+            if not emotion_hit:
+                self._store_prompt(emotion_key, EMOTION_PROMPT_ATTRIBUTES, 'cache_emo_audio_prompt', emotion_audio)
+    
+    def precompute_prompts(self, speaker_audio: str) -> bool:
+        """
+        Compute and cache the prompt conditioning of a reference audio file
+        
+        Caches the speaker prompt and the emotion prompt taken from the same
+        audio, so the first synthesis with this speaker skips extracting them.
+        IndexTTS2 has no separate entry point for this, so one short
+        inference is run and its audio discarded.
+        
+        Args:
+            speaker_audio: Path to reference audio file
+        
+        Returns:
+            True if the conditioning is cached
+        """
+        if not self.ensure_loaded():
+            return False
+        
+        prompt_keys = self._prompt_keys(speaker_audio)
+        if all(self.prompt_cache.get(key) is not None for key in prompt_keys):
+            return True
+        
+        fd, output_path = tempfile.mkstemp(suffix='.wav')
+        os.close(fd)
+        try:
+            logger.info(f"Precomputing Index-TTS2 prompt conditioning for: {speaker_audio}")
+            self._infer(prompt_keys, speaker_audio, PROMPT_PRECOMPUTE_TEXT, output_path)
+        finally:
+            os.remove(output_path)
+        return all(self.prompt_cache.get(key) is not None for key in prompt_keys)
+    
     def clone_voice(
         self,
         text: str,
@@ -106,7 +386,7 @@ class IndexTTSConverter:
         Returns:
             Path to generated audio file
         """
-        if not self.is_available:
+        if not self.ensure_loaded():
             raise RuntimeError("Index-TTS2 is not available. Please run setup.")
         
         try:
@@ -116,13 +396,14 @@ class IndexTTSConverter:
             if not os.path.exists(reference_audio):
                 raise FileNotFoundError(f"Reference audio not found: {reference_audio}")
             
-            # Generate speech
-            self.model.infer(
-                spk_audio_prompt=reference_audio,
-                text=text,
-                output_path=output_path,
-                verbose=True
-            )
+            # Generate speech; long texts are synthesized segment by segment and
+            # the speaker conditioning is computed at most once (then cached)
+            prompt_keys = self._prompt_keys(reference_audio)
+            
+            def synthesize_segment(segment: str, segment_path: str):
+                self._infer(prompt_keys, reference_audio, segment, segment_path)
+            
+            synthesize_segmented(text, output_path, synthesize_segment, 'index-tts', language)
             
             logger.info(f"Voice cloned successfully: {output_path}")
             return output_path
@@ -152,7 +433,7 @@ class IndexTTSConverter:
         Returns:
             Path to generated audio file
         """
-        if not self.is_available:
+        if not self.ensure_loaded():
             raise RuntimeError("Index-TTS2 is not available. Please run setup.")
         
         try:
@@ -168,14 +449,16 @@ class IndexTTSConverter:
             emotion_intensity = max(0.0, min(1.0, emotion_intensity))
             
             # Generate speech with emotion
-            self.model.infer(
-                spk_audio_prompt=speaker_audio,
-                text=text,
-                output_path=output_path,
-                emo_audio_prompt=emotion_audio,
-                emo_alpha=emotion_intensity,
-                verbose=True
-            )
+            prompt_keys = self._prompt_keys(speaker_audio, emotion_audio)
+            
+            def synthesize_segment(segment: str, segment_path: str):
+                self._infer(
+                    prompt_keys, speaker_audio, segment, segment_path,
+                    emo_audio_prompt=emotion_audio,
+                    emo_alpha=emotion_intensity
+                )
+            
+            synthesize_segmented(text, output_path, synthesize_segment, 'index-tts')
             
             logger.info(f"Emotional speech generated: {output_path}")
             return output_path
@@ -205,7 +488,7 @@ class IndexTTSConverter:
         Returns:
             Path to generated audio file
         """
-        if not self.is_available:
+        if not self.ensure_loaded():
             raise RuntimeError("Index-TTS2 is not available. Please run setup.")
         
         try:
@@ -222,14 +505,16 @@ class IndexTTSConverter:
             emotion_vector = [max(0.0, min(1.0, e)) for e in emotion_vector]
             
             # Generate speech with emotion vector
-            self.model.infer(
-                spk_audio_prompt=speaker_audio,
-                text=text,
-                output_path=output_path,
-                emo_vector=emotion_vector,
-                use_random=use_random,
-                verbose=True
-            )
+            prompt_keys = self._prompt_keys(speaker_audio)
+            
+            def synthesize_segment(segment: str, segment_path: str):
+                self._infer(
+                    prompt_keys, speaker_audio, segment, segment_path,
+                    emo_vector=emotion_vector,
+                    use_random=use_random
+                )
+            
+            synthesize_segmented(text, output_path, synthesize_segment, 'index-tts')
             
             logger.info(f"Emotional speech generated: {output_path}")
             return output_path
@@ -294,8 +579,8 @@ class IndexTTSConverter:
         ]
     
     def is_model_available(self) -> bool:
-        """Check if Index-TTS2 model is available"""
-        return self.is_available
+        """Check if Index-TTS2 model is available (loads it on first call)"""
+        return self.ensure_loaded()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,313 @@
+"""
+Synthesis Job Queue Module
+Runs synthesis work on a bounded worker pool so HTTP requests return immediately
+
+Job records and results live in a directory shared by all worker processes,
+so any gunicorn worker can report a job's status or return its audio, and the
+inference concurrency limit applies across processes rather than per process.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import fcntl
+import tempfile
+import threading
+import logging
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+# How often a queued job checks for a free inference slot
+SLOT_POLL_SECONDS = 0.2
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the job queue cannot accept more work"""
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SynthesisJobQueue:
+    """
+    Bounded pool of synthesis workers with job status tracking
+    Decouples HTTP request concurrency from inference concurrency
+
+    A job runs in the process that accepted it. Its state is kept as a
+    JSON file in the shared directory. At most max_workers jobs run at
+    once across all processes, enforced with lock files (slots).
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_workers: int = 1,
+        max_pending: int = 100,
+        result_ttl: int = 3600,
+        initializer: Optional[Callable[[], None]] = None
+    ):
+        """
+        Initialize the job queue
+
+        Args:
+            directory: Directory shared by all workers for job records and results
+            max_workers: Number of jobs allowed to run inference at once (all processes)
+            max_pending: Maximum number of queued or running jobs (all processes)
+            result_ttl: Seconds to keep finished jobs and their audio
+            initializer: Called once in each worker thread before its first job
+        """
+        self.directory = directory
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="synthesis-job",
+            initializer=initializer
+        )
+
+        logger.info(f"Job queue ready with {self.max_workers} worker(s) in {directory}")
+
+    def _record_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f'{job_id}.json')
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Hold the queue lock, shared by the threads of this and other processes"""
+        with self._lock:
+            with open(os.path.join(self.directory, '.lock'), 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self, job_id: str) -> Optional[Dict]:
+        try:
+            with open(self._record_path(job_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, job: Dict):
+        """Write a job record atomically"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(job, f)
+            os.replace(tmp_path, self._record_path(job['id']))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _update(self, job_id: str, **changes) -> Optional[Dict]:
+        with self._exclusive():
+            job = self._read(job_id)
+            if job is None:
+                return None
+            job.update(changes)
+            self._write(job)
+            return job
+
+    def _list_jobs(self) -> List[Dict]:
+        jobs = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                job = self._read(name[:-len('.json')])
+                if job is not None:
+                    jobs.append(job)
+        return jobs
+
+    def submit(
+        self,
+        func: Callable[[str], None],
+        engine: str,
+        extension: str,
+        mimetype: str,
+        download_name: str
+    ) -> str:
+        """
+        Queue a synthesis job
+
+        Args:
+            func: Callable that writes the audio to the path it is given
+            engine: Engine id, reported in job status
+            extension: Output file extension (e.g., 'mp3', 'wav')
+            mimetype: Mimetype of the produced audio
+            download_name: File name offered to the client
+
+        Returns:
+            Job id
+
+        Raises:
+            QueueFullError: If max_pending jobs are already queued or running
+        """
+        self._expire_finished_jobs()
+
+        with self._exclusive():
+            pending = sum(
+                1 for job in self._list_jobs()
+                if job['status'] in ('queued', 'running')
+            )
+            if pending >= self.max_pending:
+                raise QueueFullError(
+                    f"Job queue is full ({self.max_pending} pending jobs)"
+                )
+
+            job_id = uuid.uuid4().hex
+            self._write({
+                'id': job_id,
+                'engine': engine,
+                'status': 'queued',
+                'error': None,
+                'pid': os.getpid(),
+                'created_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'output_path': os.path.join(self.directory, f'job_{job_id}.{extension}'),
+                'mimetype': mimetype,
+                'download_name': download_name
+            })
+
+        self._executor.submit(self._run, job_id, func)
+        logger.info(f"Queued {engine} job {job_id}")
+        return job_id
+
+    def _acquire_slot(self):
+        """Wait for one of the max_workers inference slots; returns its open lock file"""
+        while True:
+            for slot in range(self.max_workers):
+                slot_file = open(os.path.join(self.directory, f'.slot-{slot}.lock'), 'a')
+                try:
+                    fcntl.flock(slot_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return slot_file
+                except BlockingIOError:
+                    slot_file.close()
+            time.sleep(SLOT_POLL_SECONDS)
+
+    def _run(self, job_id: str, func: Callable[[str], None]):
+        """Execute a job on a worker thread and record its outcome"""
+        slot_file = self._acquire_slot()
+        try:
+            job = self._update(job_id, status='running', started_at=time.time())
+            if job is None:
+                return
+            output_path = job['output_path']
+
+            try:
+                func(output_path)
+                status, error = 'completed', None
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {e}")
+                status, error = 'failed', str(e)
+                # Do not leave a partial result behind
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+
+            self._update(job_id, status=status, error=error, finished_at=time.time())
+            logger.info(f"Job {job_id} {status}")
+        finally:
+            slot_file.close()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        Get a snapshot of a job
+
+        Jobs left unfinished by a worker process that has exited are
+        reported as failed.
+
+        Args:
+            job_id: Job id returned by submit()
+
+        Returns:
+            The job record, or None if unknown or expired
+        """
+        if not JOB_ID_PATTERN.match(job_id):
+            return None
+
+        job = self._read(job_id)
+        if job is not None and job['status'] in ('queued', 'running') and not _process_alive(job['pid']):
+            job = self._update(
+                job_id,
+                status='failed',
+                error='Worker process exited before the job finished',
+                finished_at=time.time()
+            )
+        return job
+
+    def describe(self, job_id: str) -> Optional[Dict]:
+        """
+        Get the public status of a job (no filesystem paths)
+
+        Args:
+            job_id: Job id returned by submit()
+
+        Returns:
+            dict with job status, or None if unknown or expired
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+
+        position = None
+        if job['status'] == 'queued':
+            position = sum(
+                1 for other in self._list_jobs()
+                if other['status'] == 'queued' and other['created_at'] < job['created_at']
+            )
+
+        return {
+            'id': job['id'],
+            'engine': job['engine'],
+            'status': job['status'],
+            'error': job['error'],
+            'queue_position': position,
+            'created_at': job['created_at'],
+            'started_at': job['started_at'],
+            'finished_at': job['finished_at']
+        }
+
+    def stats(self) -> Dict:
+        """Get job counts by status (all processes)"""
+        counts = {'queued': 0, 'running': 0, 'completed': 0, 'failed': 0}
+        for job in self._list_jobs():
+            counts[job['status']] += 1
+        counts['workers'] = self.max_workers
+        return counts
+
+    def _expire_finished_jobs(self):
+        """Forget finished jobs older than the TTL and delete their audio"""
+        cutoff = time.time() - self.result_ttl
+
+        with self._exclusive():
+            expired = [
+                job for job in self._list_jobs()
+                if job['finished_at'] is not None and job['finished_at'] < cutoff
+            ]
+            for job in expired:
+                os.remove(self._record_path(job['id']))
+
+        for job in expired:
+            if os.path.exists(job['output_path']):
+                try:
+                    os.remove(job['output_path'])
+                except OSError as e:
+                    logger.warning(f"Could not remove expired job output: {e}")
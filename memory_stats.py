@@ -0,0 +1,72 @@
+"""
+Memory Statistics Module
+Reports resident memory of the current process split into pages shared with
+other processes (e.g., copy-on-write model weights) and private pages
+"""
+
+import os
+import logging
+from typing import Dict, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SMAPS_FIELDS = {
+    'Rss': 'rss_mb',
+    'Pss': 'pss_mb',
+    'Shared_Clean': 'shared_clean_mb',
+    'Shared_Dirty': 'shared_dirty_mb',
+    'Private_Clean': 'private_clean_mb',
+    'Private_Dirty': 'private_dirty_mb',
+}
+
+
+def _read_smaps_rollup(pid: int) -> Optional[Dict[str, float]]:
+    """Parse /proc/<pid>/smaps_rollup (Linux 4.14+)"""
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+
+    stats = {}
+    for line in lines:
+        parts = line.split()
+        if len(parts) >= 2 and parts[0].rstrip(':') in SMAPS_FIELDS:
+            stats[SMAPS_FIELDS[parts[0].rstrip(':')]] = round(int(parts[1]) / 1024, 1)
+    return stats or None
+
+
+def get_memory_usage(pid: Optional[int] = None) -> Dict[str, float]:
+    """
+    Get memory usage of a process in MB
+
+    On Linux the result splits RSS into shared and private pages; shared
+    pages are what workers forked from a preloaded master have in common.
+    PSS divides shared pages among the processes mapping them, so summing
+    PSS across workers gives their true combined footprint.
+
+    Args:
+        pid: Process id (default: current process)
+
+    Returns:
+        dict with rss_mb, and on Linux pss_mb, shared_mb and private_mb
+    """
+    pid = pid or os.getpid()
+
+    stats = _read_smaps_rollup(pid)
+    if stats is not None:
+        stats['shared_mb'] = round(stats.get('shared_clean_mb', 0) + stats.get('shared_dirty_mb', 0), 1)
+        stats['private_mb'] = round(stats.get('private_clean_mb', 0) + stats.get('private_dirty_mb', 0), 1)
+        stats['pid'] = pid
+        return stats
+
+    try:
+        import resource
+        # ru_maxrss is KB on Linux and bytes on macOS; peak, not current
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        divisor = 1024 * 1024 if os.uname().sysname == 'Darwin' else 1024
+        return {'rss_mb': round(maxrss / divisor, 1), 'pid': pid}
+    except Exception as e:
+        logger.warning(f"Memory usage not available: {e}")
+        return {'pid': pid}
@@ -0,0 +1,161 @@
+"""
+Micro-Batcher Module
+Collects requests that arrive within a short window and hands them to a model
+as one batch, so concurrent callers share forward passes instead of contending
+for the same model and CPU threads
+"""
+
+import time
+import queue
+import threading
+import logging
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Queued by close() to let the worker thread exit
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Single worker thread that runs batches of queued items
+    A batch closes when it reaches max_batch_size or max_wait_ms after its
+    first item arrived, whichever comes first
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 20,
+        name: str = "micro-batcher",
+        initializer: Optional[Callable[[], None]] = None
+    ):
+        """
+        Initialize the batcher
+
+        Args:
+            process_batch: Callable mapping a list of items to a list of results
+                in the same order; a result that is an Exception is raised to
+                that item's caller only
+            max_batch_size: Maximum items per batch
+            max_wait_ms: Longest time the first item of a batch waits for others
+            name: Worker thread name
+            initializer: Called once in the worker thread before the first batch
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+        self.initializer = initializer
+
+        self._queue: "queue.Queue[Tuple[Any, Future]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._batches = 0
+        self._items = 0
+        self._largest_batch = 0
+
+    def submit(self, item: Any) -> Future:
+        """
+        Queue an item for the next batch
+
+        Args:
+            item: Work item understood by process_batch
+
+        Returns:
+            Future resolving to the item's result
+        """
+        future = Future()
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._queue.put((item, future))
+        return future
+
+    def close(self):
+        """Let the worker thread exit once queued items are done (submit restarts it)"""
+        self._queue.put(_STOP)
+
+    def _collect(self) -> Optional[List[Tuple[Any, Future]]]:
+        """Block for the first item, then gather more until the batch closes"""
+        first = self._queue.get()
+        if first is _STOP:
+            return None
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    entry = self._queue.get(timeout=remaining)
+                else:
+                    # Window closed: still take whatever is already queued
+                    entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                # Handle the stop after this batch
+                self._queue.put(_STOP)
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        if self.initializer is not None:
+            self.initializer()
+        while True:
+            batch = self._collect()
+            if batch is None:
+                with self._lock:
+                    if self._queue.empty():
+                        self._thread = None
+                        return
+                continue
+
+            # Drop items whose callers gave up before the batch started
+            batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            with self._lock:
+                self._batches += 1
+                self._items += len(batch)
+                self._largest_batch = max(self._largest_batch, len(batch))
+
+            try:
+                results = self.process_batch([item for item, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"Batch returned {len(results)} results for {len(batch)} items"
+                    )
+            except Exception as e:
+                logger.error(f"Batch of {len(batch)} failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def stats(self) -> Dict:
+        """Batch counts since startup"""
+        with self._lock:
+            return {
+                'batches': self._batches,
+                'items': self._items,
+                'mean_batch_size': round(self._items / self._batches, 2) if self._batches else 0,
+                'largest_batch': self._largest_batch,
+                'queued': self._queue.qsize(),
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000
+            }
@@ -0,0 +1,183 @@
+"""
+Model Pool Module
+Keeps several loaded models resident within a memory budget, loading them on
+demand and evicting the least recently used when the budget is exceeded
+"""
+
+import gc
+import sys
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def torch_module_bytes(*modules: Any) -> int:
+    """
+    Memory held by the parameters and buffers of torch modules
+
+    Args:
+        modules: torch.nn.Module instances (None entries are skipped)
+
+    Returns:
+        Size in bytes
+    """
+    total = 0
+    for module in modules:
+        if module is None:
+            continue
+        for tensor in list(module.parameters()) + list(module.buffers()):
+            total += tensor.numel() * tensor.element_size()
+        # Dynamically quantized layers keep their int8 weights in packed params
+        for submodule in module.modules():
+            weight = getattr(submodule, 'weight', None)
+            if callable(weight) and hasattr(submodule, '_packed_params'):
+                packed = weight()
+                total += packed.numel() * packed.element_size()
+    return total
+
+
+class ModelPool:
+    """
+    Memory-budgeted LRU of loaded models keyed by name
+    Each model is loaded at most once at a time (concurrent callers wait for
+    the same load); pinned models are never evicted
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], Any],
+        max_bytes: int,
+        sizeof: Callable[[Any], int],
+        on_evict: Optional[Callable[[Any], None]] = None,
+        pinned: Iterable[str] = (),
+        name: str = "models"
+    ):
+        """
+        Initialize the pool
+
+        Args:
+            factory: Loads a model given its name
+            max_bytes: Memory budget for all resident models
+            sizeof: Estimates the memory a loaded model holds
+            on_evict: Called with a model after it leaves the pool
+            pinned: Names that stay resident once loaded
+            name: Name used in log messages
+        """
+        self.factory = factory
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.on_evict = on_evict
+        self.pinned = set(pinned)
+        self.name = name
+
+        self._models: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._loads = 0
+        self._evictions = 0
+
+    def get(self, key: str) -> Any:
+        """
+        Get a model, loading it (and evicting others) if it is not resident
+
+        A model whose load failed (is_available False) is returned without
+        being kept, so it takes no room and the next call retries the load.
+
+        Args:
+            key: Model name
+
+        Returns:
+            The loaded model
+        """
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self._hits += 1
+                return self._models[key]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    self._hits += 1
+                    return self._models[key]
+
+            logger.info(f"Loading {key} into {self.name} pool")
+            model = self.factory(key)
+            if not getattr(model, 'is_available', True):
+                logger.warning(f"{key} failed to load, not keeping it in {self.name} pool")
+                if self.on_evict is not None:
+                    self.on_evict(model)
+                return model
+            size = self.sizeof(model)
+
+            with self._lock:
+                self._models[key] = model
+                self._sizes[key] = size
+                self._loads += 1
+                evicted = self._evict_over_budget(keep=key)
+
+        for evicted_key, evicted_model in evicted:
+            logger.info(f"Evicted {evicted_key} from {self.name} pool")
+            if self.on_evict is not None:
+                self.on_evict(evicted_model)
+        if evicted:
+            self._release_memory()
+
+        return model
+
+    def _evict_over_budget(self, keep: str):
+        """Remove least recently used models until within budget (caller holds the lock)"""
+        evicted = []
+        for key in list(self._models):
+            if sum(self._sizes.values()) <= self.max_bytes:
+                break
+            if key == keep or key in self.pinned:
+                continue
+            evicted.append((key, self._models.pop(key)))
+            del self._sizes[key]
+            self._evictions += 1
+        return evicted
+
+    @staticmethod
+    def _release_memory():
+        gc.collect()
+        torch = sys.modules.get('torch')
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Get a resident model without loading it or changing its recency"""
+        with self._lock:
+            return self._models.get(key)
+
+    def keys(self):
+        """Names of the resident models, most recently used first"""
+        with self._lock:
+            return list(reversed(self._models))
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._models
+
+    def stats(self) -> Dict:
+        """Resident models, sizes and counters"""
+        with self._lock:
+            return {
+                'models': [
+                    {'name': key, 'size_mb': round(self._sizes[key] / (1024 * 1024), 1)}
+                    for key in reversed(self._models)
+                ],
+                'used_mb': round(sum(self._sizes.values()) / (1024 * 1024), 1),
+                'budget_mb': round(self.max_bytes / (1024 * 1024), 1),
+                'hits': self._hits,
+                'loads': self._loads,
+                'evictions': self._evictions
+            }
@@ -0,0 +1,132 @@
+"""
+Model Quantization Module
+Int8 dynamic quantization of PyTorch TTS models for CPU inference, with the
+quantized module cached on disk so the conversion runs once per model
+"""
+
+import os
+import logging
+import tempfile
+from typing import Any, Optional
+
+from cache_utils import get_cache_dir, hash_params
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def convert_conv1d_to_linear(module: Any) -> int:
+    """
+    Replace Hugging Face Conv1D layers with equivalent nn.Linear layers
+
+    GPT-2 style blocks (used by XTTS) implement their projections as
+    transformers' Conv1D, which dynamic quantization does not recognise.
+    Conv1D stores its weight as (in, out), so the Linear gets the transpose.
+
+    Args:
+        module: Root module, modified in place
+
+    Returns:
+        Number of layers replaced
+    """
+    import torch
+
+    replaced = 0
+    for name, child in list(module.named_children()):
+        if type(child).__name__ == 'Conv1D' and hasattr(child, 'nf'):
+            in_features, out_features = child.weight.shape
+            linear = torch.nn.Linear(in_features, out_features, bias=child.bias is not None)
+            with torch.no_grad():
+                linear.weight.copy_(child.weight.t())
+                if child.bias is not None:
+                    linear.bias.copy_(child.bias)
+            setattr(module, name, linear)
+            replaced += 1
+        else:
+            replaced += convert_conv1d_to_linear(child)
+    return replaced
+
+
+def quantize_int8(module: Any) -> Any:
+    """
+    Apply int8 dynamic quantization to the linear layers of a module
+
+    Weights are stored as int8 and activations are quantized on the fly, so
+    no calibration data is needed. CPU only.
+
+    Args:
+        module: Float model in eval mode
+
+    Returns:
+        Quantized model
+    """
+    import torch
+
+    converted = convert_conv1d_to_linear(module)
+    if converted:
+        logger.info(f"Converted {converted} Conv1D layers to Linear for quantization")
+
+    return torch.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_or_quantize(module: Any, model_id: str, fingerprint: Optional[str] = None) -> Any:
+    """
+    Get the int8 version of a model, from the disk cache when possible
+
+    The cache entry is keyed by the model id, a fingerprint of its checkpoint
+    and the torch version, so upgrading either invalidates it.
+
+    Args:
+        module: Loaded float model
+        model_id: Model name
+        fingerprint: Changes when the checkpoint changes (e.g., its mtime)
+
+    Returns:
+        Quantized model
+    """
+    import torch
+
+    key = hash_params(model=model_id, fingerprint=fingerprint, torch=torch.__version__, dtype='qint8')
+    cache_path = os.path.join(get_cache_dir('quantized'), f'{key[:32]}.pt')
+
+    if os.path.exists(cache_path):
+        try:
+            quantized = torch.load(cache_path, map_location='cpu', weights_only=False)
+            logger.info(f"Loaded int8 model from {cache_path}")
+            return quantized.eval()
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable quantized model {cache_path}: {e}")
+
+    logger.info(f"Quantizing {model_id} to int8 (first run only)...")
+    quantized = quantize_int8(module.eval())
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix='.tmp')
+    os.close(fd)
+    try:
+        torch.save(quantized, tmp_path)
+        os.replace(tmp_path, cache_path)
+        logger.info(f"Saved int8 model to {cache_path}")
+    except Exception as e:
+        logger.warning(f"Could not cache quantized model: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return quantized
+
+
+def module_size_mb(module: Any) -> float:
+    """
+    Size of a module's parameters and buffers in MB, including packed int8 weights
+
+    Args:
+        module: PyTorch module
+
+    Returns:
+        Size in MB
+    """
+    import io
+    import torch
+
+    buffer = io.BytesIO()
+    torch.save(module.state_dict(), buffer)
+    return round(buffer.tell() / (1024 * 1024), 1)
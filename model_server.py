@@ -0,0 +1,394 @@
+"""
+Model Server Module
+Single long-lived process owning the heavy models (Coqui, FreeVC, Index-TTS, Bark),
+served to the gunicorn workers over a local Unix socket
+
+Run with:
+    python model_server.py --socket /tmp/voicemaker-models.sock
+
+and start the web workers with MODEL_SERVER_SOCKET pointing at the same path.
+"""
+
+import os
+import sys
+import argparse
+import builtins
+import importlib
+import threading
+import logging
+from multiprocessing.connection import Listener, Client
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from thread_budget import apply_to_current_thread, configure as configure_thread_budget
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = '/tmp/voicemaker-models.sock'
+
+# Exceptions re-raised with their own type on the client side
+PASSTHROUGH_EXCEPTIONS = {
+    'ValueError', 'KeyError', 'LookupError', 'FileNotFoundError',
+    'RuntimeError', 'ImportError', 'NotImplementedError'
+}
+# Application exceptions re-raised with their own type, by defining module
+APP_EXCEPTIONS = {
+    'SpeakerNotFoundError': 'speaker_registry',
+    'QueueFullError': 'job_queue',
+}
+
+
+_coqui_model_pool = None
+
+
+def _get_coqui_model(model_name: Optional[str] = None):
+    """Coqui converter for a model, from a pool shared by all clients"""
+    global _coqui_model_pool
+    from coqui_tts_converter import CURATED_MODELS, DEFAULT_MODEL_NAME, create_model_pool
+
+    model_name = model_name or DEFAULT_MODEL_NAME
+    if model_name not in {model['id'] for model in CURATED_MODELS}:
+        raise ValueError(f"Unsupported Coqui model: {model_name}")
+    if _coqui_model_pool is None:
+        _coqui_model_pool = create_model_pool()
+    return _coqui_model_pool.get(model_name)
+
+
+def _create_coqui_tts():
+    return _get_coqui_model()
+
+
+def _create_voice_conversion():
+    from voice_conversion_engine import VoiceConversionEngine
+    return VoiceConversionEngine()
+
+
+def _create_index_tts():
+    # The model loads on first use or through a remote start_background_load(),
+    # so creating the converter never holds the server's load lock for long
+    from index_tts_converter import IndexTTSConverter
+    return IndexTTSConverter()
+
+
+def _create_bark():
+    from bark_voice import BarkVoiceGenerator
+    return BarkVoiceGenerator()
+
+
+ENGINE_FACTORIES: Dict[str, Callable[[], Any]] = {
+    'coqui-tts': _create_coqui_tts,
+    'index-tts': _create_index_tts,
+    'voice-conversion': _create_voice_conversion,
+    'bark': _create_bark,
+}
+
+
+class ModelServer:
+    """
+    Owns one converter per engine and executes method calls for clients
+    Converters are created on first use; calls into the same engine are serialized,
+    except the converter's thread_safe_methods, which lock the model themselves
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, authkey: Optional[bytes] = None):
+        """
+        Initialize the model server
+
+        Args:
+            socket_path: Path of the Unix socket to listen on
+            authkey: Optional shared secret clients must present
+        """
+        self.socket_path = socket_path
+        self.authkey = authkey
+        self.engines: Dict[str, Any] = {}
+        self._engine_locks = {name: threading.Lock() for name in ENGINE_FACTORIES}
+        self._load_lock = threading.Lock()
+        self._locks_lock = threading.Lock()
+
+    def get_engine(self, name: str) -> Any:
+        """Get (creating on first use) the converter for an engine"""
+        # 'coqui-tts:<model>' selects a non-default Coqui model from the pool
+        if name.startswith('coqui-tts:'):
+            return _get_coqui_model(name.split(':', 1)[1])
+
+        if name not in ENGINE_FACTORIES:
+            raise ValueError(f"Unknown engine: {name}")
+
+        if name not in self.engines:
+            with self._load_lock:
+                if name not in self.engines:
+                    logger.info(f"Loading engine: {name}")
+                    self.engines[name] = ENGINE_FACTORIES[name]()
+                    logger.info(f"Engine ready: {name}")
+        return self.engines[name]
+
+    def _engine_lock(self, name: str) -> threading.Lock:
+        """Lock serializing calls into one engine (or one pooled Coqui model)"""
+        with self._locks_lock:
+            return self._engine_locks.setdefault(name, threading.Lock())
+
+    def handle(self, request: tuple) -> Any:
+        """
+        Execute one request
+
+        Requests are tuples:
+            ('ping',)
+            ('getattr', engine, name)            -> ('method', None) or ('value', value, cacheable)
+            ('call', engine, method, args, kwargs)
+            ('stream', engine, method, args, kwargs)  -> iterator of chunks
+        """
+        op = request[0]
+
+        if op == 'ping':
+            return {'engines': sorted(self.engines), 'pid': os.getpid()}
+
+        if op == 'getattr':
+            _, engine, name = request
+            converter = self.get_engine(engine)
+            value = getattr(converter, name)
+            # Methods are invoked remotely, only plain values travel back.
+            # Converters list attributes that change after init (e.g. load
+            # state) in volatile_attributes; clients may cache the others
+            if callable(value):
+                return ('method', None)
+            return ('value', value, name not in getattr(converter, 'volatile_attributes', ()))
+
+        if op == 'call':
+            _, engine, method, args, kwargs = request
+            if method.startswith('_'):
+                raise ValueError(f"Private method not callable remotely: {method}")
+            converter = self.get_engine(engine)
+            if method in getattr(converter, 'thread_safe_methods', ()):
+                return getattr(converter, method)(*args, **kwargs)
+            with self._engine_lock(engine):
+                return getattr(converter, method)(*args, **kwargs)
+
+        if op == 'stream':
+            return self._stream(*request[1:])
+
+        raise ValueError(f"Unknown request: {op}")
+
+    def _stream(self, engine: str, method: str, args: tuple, kwargs: dict):
+        """Run a generator method, holding the engine lock until it is exhausted"""
+        if not method.startswith('stream_'):
+            raise ValueError(f"Not a streaming method: {method}")
+        converter = self.get_engine(engine)
+        with self._engine_lock(engine):
+            yield from getattr(converter, method)(*args, **kwargs)
+
+    def _serve_connection(self, conn):
+        """Answer requests on one client connection until it closes"""
+        apply_to_current_thread()
+        try:
+            while True:
+                try:
+                    request = conn.recv()
+                except EOFError:
+                    break
+
+                try:
+                    result = self.handle(request)
+                    if request[0] == 'stream':
+                        for chunk in result:
+                            conn.send(('chunk', chunk))
+                        result = None
+                    conn.send(('ok', result))
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client went away mid-stream
+                    break
+                except Exception as e:
+                    logger.error(f"Model server request failed: {e}")
+                    try:
+                        conn.send(('error', type(e).__name__, str(e)))
+                    except OSError:
+                        break
+        finally:
+            conn.close()
+
+    def serve_forever(self, preload=()):
+        """
+        Listen on the socket and serve clients, one thread per connection
+
+        Args:
+            preload: Engine names to load before accepting connections
+        """
+        for name in preload:
+            converter = self.get_engine(name)
+            # Converters that load lazily (Index-TTS2) are loaded now as well
+            if hasattr(converter, 'ensure_loaded'):
+                converter.ensure_loaded()
+
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+        # Create the socket owner-only from the start rather than chmod-ing it
+        # after bind, which would leave a window where others can connect
+        previous_umask = os.umask(0o177)
+        try:
+            listener = Listener(self.socket_path, family='AF_UNIX', authkey=self.authkey)
+        finally:
+            os.umask(previous_umask)
+        logger.info(f"Model server listening on {self.socket_path}")
+
+        try:
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    logger.warning(f"Rejected model server connection: {e}")
+                    continue
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+        finally:
+            listener.close()
+
+
+class ModelServerClient:
+    """
+    Client for the model server; keeps one connection per calling thread
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, authkey: Optional[bytes] = None):
+        """
+        Initialize the client
+
+        Args:
+            socket_path: Path of the model server's Unix socket
+            authkey: Shared secret configured on the server
+        """
+        self.socket_path = socket_path
+        self.authkey = authkey
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = Client(self.socket_path, family='AF_UNIX', authkey=self.authkey)
+            self._local.conn = conn
+        return conn
+
+    def request(self, *request) -> Any:
+        """Send a request and return its result, re-raising server errors"""
+        conn = self._connection()
+        try:
+            conn.send(request)
+            response = conn.recv()
+        except (EOFError, OSError):
+            # Drop the broken connection; the next request reconnects
+            self._local.conn = None
+            conn.close()
+            raise RuntimeError(f"Model server connection lost ({self.socket_path})")
+
+        return self._unwrap(response)
+
+    def stream(self, *request) -> Iterator[Any]:
+        """Send a 'stream' request and yield its chunks as they arrive"""
+        conn = self._connection()
+        finished = False
+        try:
+            conn.send(request)
+            while True:
+                response = conn.recv()
+                if response[0] != 'chunk':
+                    finished = True
+                    self._unwrap(response)
+                    return
+                yield response[1]
+        except (EOFError, OSError):
+            raise RuntimeError(f"Model server connection lost ({self.socket_path})")
+        finally:
+            if not finished:
+                # Unread chunks would corrupt the next request; reconnect instead
+                self._local.conn = None
+                conn.close()
+
+    @staticmethod
+    def _unwrap(response: tuple) -> Any:
+        """Return an 'ok' result or re-raise a server error"""
+        if response[0] == 'ok':
+            return response[1]
+
+        _, error_type, message = response
+        if error_type in PASSTHROUGH_EXCEPTIONS:
+            raise getattr(builtins, error_type)(message)
+        if error_type in APP_EXCEPTIONS:
+            module = importlib.import_module(APP_EXCEPTIONS[error_type])
+            raise getattr(module, error_type)(message)
+        raise RuntimeError(f"{error_type}: {message}")
+
+    def ping(self) -> Dict:
+        """Check the server is reachable and list loaded engines"""
+        return self.request('ping')
+
+
+class RemoteConverter:
+    """
+    Proxy exposing a server-side converter with the same interface
+    Paths passed to methods must be readable by the server (same machine);
+    stream_* methods return iterators fed chunk by chunk from the server.
+    Method proxies and non-volatile attribute values are cached after the
+    first lookup, so only the first access costs a round trip.
+    """
+
+    def __init__(self, client: ModelServerClient, engine: str):
+        self._client = client
+        self._engine = engine
+        self._cached: Dict[str, Any] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        if name in self._cached:
+            return self._cached[name]
+
+        response = self._client.request('getattr', self._engine, name)
+        if response[0] == 'value':
+            _, value, cacheable = response
+            if cacheable:
+                self._cached[name] = value
+            return value
+
+        if name.startswith('stream_'):
+            def call(*args, **kwargs):
+                return self._client.stream('stream', self._engine, name, args, kwargs)
+        else:
+            def call(*args, **kwargs):
+                return self._client.request('call', self._engine, name, args, kwargs)
+
+        call.__name__ = name
+        self._cached[name] = call
+        return call
+
+    def __repr__(self) -> str:
+        return f"RemoteConverter({self._engine!r}, socket={self._client.socket_path!r})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VoiceMaker model server")
+    parser.add_argument(
+        '--socket',
+        default=os.environ.get('MODEL_SERVER_SOCKET', DEFAULT_SOCKET_PATH),
+        help='Unix socket path to listen on'
+    )
+    parser.add_argument(
+        '--preload',
+        default=os.environ.get('MODEL_SERVER_PRELOAD', 'coqui-tts'),
+        help='Comma-separated engines to load at startup (coqui-tts, index-tts, bark)'
+    )
+    args = parser.parse_args()
+
+    authkey = os.environ.get('MODEL_SERVER_AUTHKEY')
+    preload = [name.strip() for name in args.preload.split(',') if name.strip()]
+
+    # This process is the only one running inference
+    configure_thread_budget(workers=1)
+
+    server = ModelServer(args.socket, authkey.encode() if authkey else None)
+    try:
+        server.serve_forever(preload)
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
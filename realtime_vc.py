@@ -0,0 +1,229 @@
+"""
+Real-time Voice Conversion Module
+Converts live PCM audio block by block: each block is converted together with
+some past context and a short lookahead, and consecutive blocks are
+crossfaded, so latency is bounded by the block and lookahead sizes rather
+than the length of the recording
+"""
+
+import os
+import time
+import logging
+from math import gcd
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from audio_assembly import OverlapAdd, float_to_pcm16
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# New audio converted per step; larger blocks cost less compute per second of
+# audio but add latency
+REALTIME_VC_BLOCK_MS = int(os.environ.get('REALTIME_VC_BLOCK_MS', 320))
+# Future audio the model sees before a block is emitted
+REALTIME_VC_LOOKAHEAD_MS = int(os.environ.get('REALTIME_VC_LOOKAHEAD_MS', 160))
+# Past audio fed alongside each block so the content encoder has context
+REALTIME_VC_CONTEXT_MS = int(os.environ.get('REALTIME_VC_CONTEXT_MS', 800))
+REALTIME_VC_CROSSFADE_MS = int(os.environ.get('REALTIME_VC_CROSSFADE_MS', 40))
+
+# The content encoder works in 20 ms frames; sizes are rounded to whole frames
+FRAME_MS = 20
+
+
+def _whole_frames(ms: int) -> int:
+    return max(0, round(ms / FRAME_MS)) * FRAME_MS
+
+
+def pcm16_to_float(data: bytes) -> np.ndarray:
+    """Decode little-endian 16-bit mono PCM into float samples in [-1, 1]"""
+    return np.frombuffer(data, dtype='<i2').astype(np.float32) / 32768.0
+
+
+class RealtimeConversionSession:
+    """
+    One live conversion stream
+    Feed PCM with push() as it arrives and send back whatever it returns;
+    call finish() at the end of the stream for the remaining audio
+    """
+
+    def __init__(
+        self,
+        engine,
+        target: Tuple[str, object],
+        sample_rate: int,
+        block_ms: int = REALTIME_VC_BLOCK_MS,
+        lookahead_ms: int = REALTIME_VC_LOOKAHEAD_MS,
+        context_ms: int = REALTIME_VC_CONTEXT_MS,
+        crossfade_ms: int = REALTIME_VC_CROSSFADE_MS
+    ):
+        """
+        Initialize a session
+
+        Args:
+            engine: VoiceConversionEngine (or a remote proxy of one)
+            target: Target conditioning from engine.get_target_embedding()
+            sample_rate: Sample rate of the incoming PCM
+            block_ms: New audio converted per step
+            lookahead_ms: Future audio seen before a block is emitted
+            context_ms: Past audio fed with each block
+            crossfade_ms: Overlap crossfaded between consecutive blocks
+        """
+        block_ms = _whole_frames(block_ms)
+        crossfade_ms = _whole_frames(crossfade_ms)
+        if block_ms <= 0:
+            raise ValueError(f"block_ms must be at least {FRAME_MS}")
+        if crossfade_ms >= block_ms:
+            raise ValueError("crossfade_ms must be shorter than block_ms")
+        if sample_rate <= 0:
+            raise ValueError("sample_rate must be positive")
+
+        self.engine = engine
+        self.target = target
+        self.sample_rate = sample_rate
+        self.block_ms = block_ms
+        self.lookahead_ms = _whole_frames(lookahead_ms)
+        self.context_ms = _whole_frames(context_ms)
+        self.crossfade_ms = crossfade_ms
+        self.model_sample_rate, self.output_sample_rate = engine.get_sample_rates()
+
+        # Sizes in input samples
+        self._block = block_ms * sample_rate // 1000
+        self._lookahead = self.lookahead_ms * sample_rate // 1000
+        self._context = self.context_ms * sample_rate // 1000
+        self._crossfade = crossfade_ms * sample_rate // 1000
+
+        self._joiner = OverlapAdd(crossfade_ms * self.output_sample_rate // 1000)
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_start = 0   # absolute position of _buffer[0]
+        self._next_block = 0     # absolute position of the next block to convert
+        self._received = 0
+        self._emitted = 0
+        self._compute_ms: List[float] = []
+        self._started = time.perf_counter()
+
+    @property
+    def algorithmic_latency_ms(self) -> int:
+        """
+        Delay built into the windowing, before any compute
+
+        A sample waits for the rest of its block and the lookahead to arrive,
+        and the crossfade region is held back until the next block.
+        """
+        return self.block_ms + self.lookahead_ms + self.crossfade_ms
+
+    def push(self, pcm: bytes) -> bytes:
+        """
+        Add incoming audio and convert every block that is now complete
+
+        Args:
+            pcm: 16-bit mono PCM at the session's sample rate
+
+        Returns:
+            Converted 16-bit mono PCM at output_sample_rate (may be empty)
+        """
+        samples = pcm16_to_float(pcm)
+        self._buffer = np.concatenate([self._buffer, samples])
+        self._received += len(samples)
+
+        output = []
+        while self._next_block + self._block + self._lookahead <= self._received:
+            output.append(self._convert_block(self._block, self._lookahead))
+        return self._encode(output)
+
+    def finish(self) -> bytes:
+        """
+        Convert the audio left at the end of the stream
+
+        Returns:
+            The remaining converted PCM
+        """
+        output = []
+        while self._next_block < self._received:
+            remaining = self._received - self._next_block
+            block = min(self._block, remaining)
+            output.append(self._convert_block(block, min(self._lookahead, remaining - block)))
+        output.append(self._joiner.flush())
+        return self._encode(output)
+
+    def _convert_block(self, block: int, lookahead: int) -> np.ndarray:
+        """Convert the next block with its context and lookahead; returns finished samples"""
+        start = self._next_block
+        # The first block has nothing before it to crossfade with
+        crossfade = self._crossfade if start > 0 else 0
+        window_start = max(0, start - crossfade - self._context)
+        window_end = start + block + lookahead
+
+        window = self._buffer[window_start - self._buffer_start:window_end - self._buffer_start]
+        began = time.perf_counter()
+        converted = self.engine.convert_window(self._resample(window), self.target)
+        self._compute_ms.append((time.perf_counter() - began) * 1000)
+
+        # Output length is proportional to input length; keep the part for
+        # this block, starting `crossfade` early to overlap the previous one
+        scale = len(converted) / max(1, window_end - window_start)
+        segment = converted[
+            round((start - crossfade - window_start) * scale):
+            round((start + block - window_start) * scale)
+        ]
+
+        self._next_block = start + block
+        self._trim_buffer()
+        return self._joiner.push(segment)
+
+    def _resample(self, window: np.ndarray) -> np.ndarray:
+        """Bring a window to the model's input sample rate"""
+        if self.sample_rate == self.model_sample_rate:
+            return window
+        from scipy.signal import resample_poly
+
+        divisor = gcd(self.model_sample_rate, self.sample_rate)
+        return resample_poly(
+            window, self.model_sample_rate // divisor, self.sample_rate // divisor
+        ).astype(np.float32)
+
+    def _trim_buffer(self):
+        """Drop input older than the context the next block needs"""
+        keep_from = max(0, self._next_block - self._crossfade - self._context)
+        if keep_from > self._buffer_start:
+            self._buffer = self._buffer[keep_from - self._buffer_start:]
+            self._buffer_start = keep_from
+
+    def _encode(self, chunks: List[np.ndarray]) -> bytes:
+        chunks = [c for c in chunks if len(c)]
+        if not chunks:
+            return b''
+        samples = np.concatenate(chunks)
+        self._emitted += len(samples)
+        return float_to_pcm16(samples)
+
+    def stats(self) -> Dict:
+        """
+        Latency budget of the session so far
+
+        compute_ms is the time spent converting each block. When its p95
+        exceeds block_ms the server cannot keep up and latency grows over
+        the session; overruns counts the blocks where that happened.
+        """
+        compute = np.array(self._compute_ms) if self._compute_ms else np.zeros(1)
+        p95 = float(np.percentile(compute, 95))
+        return {
+            'block_ms': self.block_ms,
+            'lookahead_ms': self.lookahead_ms,
+            'context_ms': self.context_ms,
+            'crossfade_ms': self.crossfade_ms,
+            'algorithmic_latency_ms': self.algorithmic_latency_ms,
+            'compute_ms': {
+                'mean': round(float(compute.mean()), 1),
+                'p95': round(p95, 1),
+                'max': round(float(compute.max()), 1)
+            },
+            'latency_budget_ms': round(self.algorithmic_latency_ms + p95, 1),
+            'real_time_factor': round(float(compute.mean()) / self.block_ms, 3),
+            'overruns': int((compute > self.block_ms).sum()) if self._compute_ms else 0,
+            'blocks': len(self._compute_ms),
+            'input_seconds': round(self._received / self.sample_rate, 2),
+            'output_seconds': round(self._emitted / self.output_sample_rate, 2),
+            'session_seconds': round(time.perf_counter() - self._started, 2)
+        }
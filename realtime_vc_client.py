@@ -0,0 +1,120 @@
+"""
+Real-time Voice Conversion Client
+Feeds a WAV file to /ws/coqui/convert-voice at real-time pace, as a
+microphone would, saves the converted audio and reports latency
+
+    python realtime_vc_client.py source.wav --target-audio voice.wav
+    python realtime_vc_client.py source.wav --target-speaker-id 1a2b3c --lookahead-ms 80
+"""
+
+import sys
+import json
+import time
+import base64
+import bisect
+import argparse
+
+import numpy as np
+import soundfile as sf
+from simple_websocket import Client, ConnectionClosed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a WAV file through real-time voice conversion")
+    parser.add_argument('source', help='WAV file to convert')
+    parser.add_argument('--url', default='ws://localhost:5000/ws/coqui/convert-voice')
+    parser.add_argument('--target-audio', help='Reference audio of the target voice')
+    parser.add_argument('--target-speaker-id', help='Registered speaker to convert to')
+    parser.add_argument('--output', default='realtime_converted.wav')
+    parser.add_argument('--frame-ms', type=int, default=20, help='Size of each frame sent')
+    parser.add_argument('--block-ms', type=int)
+    parser.add_argument('--lookahead-ms', type=int)
+    parser.add_argument('--context-ms', type=int)
+    parser.add_argument('--crossfade-ms', type=int)
+    parser.add_argument('--fast', action='store_true', help='Send as fast as possible instead of real time')
+    args = parser.parse_args()
+
+    if not args.target_audio and not args.target_speaker_id:
+        parser.error('--target-audio or --target-speaker-id is required')
+
+    audio, sample_rate = sf.read(args.source, dtype='int16', always_2d=True)
+    pcm = audio.mean(axis=1).astype('<i2').tobytes()
+
+    config = {'sample_rate': sample_rate}
+    if args.target_speaker_id:
+        config['target_speaker_id'] = args.target_speaker_id
+    else:
+        with open(args.target_audio, 'rb') as f:
+            config['target_audio'] = base64.b64encode(f.read()).decode('ascii')
+    for key in ('block_ms', 'lookahead_ms', 'context_ms', 'crossfade_ms'):
+        if getattr(args, key) is not None:
+            config[key] = getattr(args, key)
+
+    ws = Client.connect(args.url)
+    ws.send(json.dumps(config))
+    ready = json.loads(ws.receive())
+    if ready.get('type') != 'ready':
+        sys.exit(f"Server refused session: {ready.get('error', ready)}")
+    output_rate = ready['sample_rate']
+    print(f"Session ready: {ready['latency']['algorithmic_latency_ms']}ms algorithmic latency, "
+          f"output at {output_rate}Hz", file=sys.stderr)
+
+    # Send time of each frame, to match converted audio back to when its input was sent
+    sent_seconds, sent_at = [], []
+    received = []
+    received_bytes = [0]
+    latencies = []
+
+    def handle(message):
+        if isinstance(message, str):
+            return json.loads(message)
+        received.append(message)
+        received_bytes[0] += len(message)
+        output_seconds = received_bytes[0] / 2 / output_rate
+        index = bisect.bisect_left(sent_seconds, output_seconds)
+        if index < len(sent_at):
+            latencies.append((time.perf_counter() - sent_at[index]) * 1000)
+        return None
+
+    frame_bytes = sample_rate * args.frame_ms // 1000 * 2
+    started = time.perf_counter()
+    for offset in range(0, len(pcm), frame_bytes):
+        if not args.fast:
+            # Pace frames like a live source
+            delay = started + offset / 2 / sample_rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        ws.send(pcm[offset:offset + frame_bytes])
+        sent_seconds.append(min(len(pcm), offset + frame_bytes) / 2 / sample_rate)
+        sent_at.append(time.perf_counter())
+        message = ws.receive(timeout=0)
+        while message is not None:
+            handle(message)
+            message = ws.receive(timeout=0)
+
+    ws.send(json.dumps({'type': 'end'}))
+    stats = None
+    while stats is None:
+        stats = handle(ws.receive())
+    try:
+        ws.close()
+    except ConnectionClosed:
+        # The server closes the session after sending its stats
+        pass
+
+    if stats.get('type') == 'error':
+        sys.exit(f"Conversion failed: {stats['error']}")
+
+    converted = np.frombuffer(b''.join(received), dtype='<i2')
+    sf.write(args.output, converted, output_rate, subtype='PCM_16')
+
+    print(json.dumps(stats, indent=2))
+    if latencies and not args.fast:
+        print(f"Measured end-to-end latency: median {np.median(latencies):.0f}ms, "
+              f"p95 {np.percentile(latencies, 95):.0f}ms at block ends (earlier samples in a block "
+              f"wait up to block_ms longer)", file=sys.stderr)
+    print(f"Saved {len(converted) / output_rate:.2f}s of converted audio to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
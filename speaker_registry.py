@@ -0,0 +1,198 @@
+"""
+Speaker Registry Module
+Stores preprocessed reference audio for recurring voices so clone requests
+can refer to a speaker id instead of uploading audio every time
+"""
+
+import os
+import re
+import json
+import time
+import shutil
+import threading
+import logging
+from math import gcd
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from cache_utils import get_cache_dir, hash_bytes, hash_file
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SPEAKER_ID_PATTERN = re.compile(r'^[0-9a-f]{16}$')
+
+
+class SpeakerNotFoundError(LookupError):
+    """Raised when a speaker id is not registered"""
+
+
+class SpeakerRegistry:
+    """
+    On-disk registry of speaker reference audio
+    References are decoded, downmixed, resampled and trimmed once at registration
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        sample_rate: int = 24000,
+        max_duration: float = 30.0,
+        trim_db: float = 40.0
+    ):
+        """
+        Initialize the registry
+
+        Args:
+            directory: Directory holding speaker profiles (default: <cache root>/speakers)
+            sample_rate: Sample rate references are resampled to
+            max_duration: Maximum reference length in seconds (longer audio is cut)
+            trim_db: Leading/trailing audio quieter than peak minus this is trimmed
+        """
+        self.directory = directory or get_cache_dir('speakers')
+        self.sample_rate = sample_rate
+        self.max_duration = max_duration
+        self.trim_db = trim_db
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def register(self, audio_path: str, name: Optional[str] = None) -> Dict:
+        """
+        Preprocess reference audio and store it as a speaker profile
+
+        Registering the same audio twice returns the existing profile.
+
+        Args:
+            audio_path: Path to the uploaded reference audio
+            name: Optional display name
+
+        Returns:
+            Speaker metadata dictionary
+        """
+        audio = self._preprocess(audio_path)
+
+        if len(audio) < self.sample_rate:
+            raise ValueError('Reference audio too short after trimming silence (minimum 1 second)')
+
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+        speaker_id = hash_bytes(pcm.tobytes())[:16]
+        speaker_dir = os.path.join(self.directory, speaker_id)
+
+        with self._lock:
+            existing = self._read_meta(speaker_id)
+            if existing is not None:
+                logger.info(f"Speaker already registered: {speaker_id}")
+                return existing
+
+            os.makedirs(speaker_dir, exist_ok=True)
+            reference_path = os.path.join(speaker_dir, 'reference.wav')
+
+            from scipy.io.wavfile import write as write_wav
+            write_wav(reference_path, self.sample_rate, pcm)
+
+            meta = {
+                'speaker_id': speaker_id,
+                'name': name or speaker_id,
+                'sample_rate': self.sample_rate,
+                'duration': round(len(pcm) / self.sample_rate, 3),
+                'audio_hash': hash_file(reference_path),
+                'created_at': time.time()
+            }
+            with open(os.path.join(speaker_dir, 'meta.json'), 'w') as f:
+                json.dump(meta, f)
+
+        logger.info(f"Registered speaker {speaker_id} ({meta['duration']}s)")
+        return meta
+
+    def _preprocess(self, audio_path: str) -> np.ndarray:
+        """Decode to mono float32 at the registry sample rate, trimmed and cut"""
+        audio, source_rate = self._decode(audio_path)
+
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+
+        if source_rate != self.sample_rate:
+            from scipy.signal import resample_poly
+            divisor = gcd(source_rate, self.sample_rate)
+            audio = resample_poly(audio, self.sample_rate // divisor, source_rate // divisor)
+
+        audio = self._trim_silence(audio.astype(np.float32))
+        return audio[:int(self.max_duration * self.sample_rate)]
+
+    @staticmethod
+    def _decode(audio_path: str):
+        """Decode an audio file to a float array and its sample rate"""
+        try:
+            import soundfile as sf
+            audio, sample_rate = sf.read(audio_path, dtype='float32', always_2d=False)
+            return audio, sample_rate
+        except Exception as e:
+            logger.info(f"soundfile could not decode {audio_path} ({e}), trying pydub")
+
+        from pydub import AudioSegment
+        segment = AudioSegment.from_file(audio_path)
+        samples = np.array(segment.get_array_of_samples(), dtype=np.float32)
+        if segment.channels > 1:
+            samples = samples.reshape((-1, segment.channels))
+        samples /= float(1 << (8 * segment.sample_width - 1))
+        return samples, segment.frame_rate
+
+    def _trim_silence(self, audio: np.ndarray) -> np.ndarray:
+        """Cut leading and trailing audio below the trim threshold"""
+        if len(audio) == 0:
+            return audio
+
+        peak = float(np.max(np.abs(audio)))
+        if peak == 0.0:
+            return audio[:0]
+
+        threshold = peak * (10 ** (-self.trim_db / 20))
+        voiced = np.nonzero(np.abs(audio) > threshold)[0]
+        return audio[voiced[0]:voiced[-1] + 1]
+
+    def _read_meta(self, speaker_id: str) -> Optional[Dict]:
+        if not SPEAKER_ID_PATTERN.match(speaker_id):
+            return None
+        meta_path = os.path.join(self.directory, speaker_id, 'meta.json')
+        try:
+            with open(meta_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def get(self, speaker_id: str) -> Dict:
+        """
+        Get speaker metadata
+
+        Args:
+            speaker_id: Id returned by register()
+
+        Returns:
+            Speaker metadata dictionary
+        """
+        meta = self._read_meta(speaker_id)
+        if meta is None:
+            raise SpeakerNotFoundError(f"Speaker not found: {speaker_id}")
+        return meta
+
+    def reference_path(self, speaker_id: str) -> str:
+        """Path to a registered speaker's preprocessed reference audio"""
+        self.get(speaker_id)
+        return os.path.join(self.directory, speaker_id, 'reference.wav')
+
+    def list(self) -> List[Dict]:
+        """List all registered speakers, newest first"""
+        speakers = []
+        for speaker_id in os.listdir(self.directory):
+            meta = self._read_meta(speaker_id)
+            if meta is not None:
+                speakers.append(meta)
+        return sorted(speakers, key=lambda m: m['created_at'], reverse=True)
+
+    def delete(self, speaker_id: str):
+        """Remove a registered speaker"""
+        self.get(speaker_id)
+        with self._lock:
+            shutil.rmtree(os.path.join(self.directory, speaker_id), ignore_errors=True)
+        logger.info(f"Deleted speaker {speaker_id}")
@@ -0,0 +1,118 @@
+"""
+Synthesis Cache Module
+Content-addressed cache of synthesized audio with an in-memory LRU tier
+and a size-capped disk tier shared by all workers on the machine
+"""
+
+import threading
+import logging
+from typing import Dict, Optional
+
+from cache_utils import LRUCache, DiskCache, get_cache_dir, hash_params
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SynthesisCache:
+    """
+    Two-tier cache of synthesis results keyed by a hash of all inputs
+    """
+
+    def __init__(
+        self,
+        memory_max_bytes: int = 64 * 1024 * 1024,
+        disk_max_bytes: int = 1024 * 1024 * 1024,
+        directory: Optional[str] = None
+    ):
+        """
+        Initialize the synthesis cache
+
+        Args:
+            memory_max_bytes: Size budget of the in-memory tier
+            disk_max_bytes: Size budget of the disk tier (0 disables it)
+            directory: Disk tier directory (default: <cache root>/synthesis)
+        """
+        self.memory = LRUCache(max_bytes=memory_max_bytes)
+        self.disk = None
+        if disk_max_bytes > 0:
+            self.disk = DiskCache(directory or get_cache_dir('synthesis'), disk_max_bytes, suffix='.audio')
+
+        self._counts = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(engine: str, model: str, text: str, **params) -> str:
+        """
+        Build a cache key for a synthesis request
+
+        Args:
+            engine: Engine id (e.g., 'edge-tts', 'coqui-tts')
+            model: Model or service name
+            text: Text being synthesized
+            **params: Voice/speaker, language and any other synthesis
+                parameters; reference audio must be passed as a content hash
+
+        Returns:
+            Hex digest identifying the result
+        """
+        return hash_params(engine=engine, model=model, text=text, **params)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a result, promoting disk hits into memory
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Audio bytes, or None on a miss
+        """
+        data = self.memory.get(key)
+        if data is not None:
+            self._count('memory_hits')
+            return data
+
+        if self.disk is not None:
+            data = self.disk.get(key)
+            if data is not None:
+                self.memory.put(key, data)
+                self._count('disk_hits')
+                return data
+
+        self._count('misses')
+        return None
+
+    def put(self, key: str, data: bytes):
+        """
+        Store a result in both tiers
+
+        Args:
+            key: Key from make_key()
+            data: Audio bytes
+        """
+        self.memory.put(key, data)
+        if self.disk is not None:
+            try:
+                self.disk.put(key, data)
+            except OSError as e:
+                logger.warning(f"Could not write synthesis cache entry: {e}")
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def stats(self) -> Dict:
+        """Get hit/miss counts and tier sizes"""
+        with self._lock:
+            counts = dict(self._counts)
+
+        lookups = sum(counts.values())
+        hits = counts['memory_hits'] + counts['disk_hits']
+        counts.update({
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+            'memory_entries': len(self.memory),
+            'memory_bytes': self.memory.total_bytes,
+            'disk_bytes': self.disk.size_bytes() if self.disk is not None else 0
+        })
+        return counts
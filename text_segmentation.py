@@ -0,0 +1,200 @@
+"""
+Text Segmentation Module
+Splits long text at sentence and clause boundaries into segments that fit an
+engine's per-call budget, so they can be synthesized independently and
+stitched back together in order
+"""
+
+import re
+from typing import List, Optional
+
+# Whitespace after sentence-ending punctuation (optionally closed by a quote or
+# bracket), or directly after CJK full stops which are not followed by spaces
+SENTENCE_END = re.compile(
+    r'(?:(?<=[.!?…])|(?<=[.!?…]["\'”’)\]]))\s+|(?<=[。！？])'
+)
+
+# Clause boundaries used when a single sentence exceeds the budget
+CLAUSE_END = re.compile(r'(?<=[,;:—])\s+|(?<=[，；：、])')
+
+# Words whose trailing period does not end a sentence
+ABBREVIATIONS = {
+    'mr.', 'mrs.', 'ms.', 'dr.', 'prof.', 'sr.', 'jr.', 'st.', 'vs.', 'etc.',
+    'e.g.', 'i.e.', 'no.', 'fig.', 'approx.', 'inc.', 'ltd.', 'co.'
+}
+
+# Languages written without spaces between words and sentences
+NO_SPACE_LANGUAGES = {'zh', 'zh-cn', 'zh-tw', 'ja'}
+
+# Maximum characters per model call. XTTS limits come from its tokenizer's
+# per-language character limits; other engines use conservative budgets.
+ENGINE_SEGMENT_LIMITS = {
+    'coqui-tts': {
+        'default': 250,
+        'en': 250, 'de': 253, 'fr': 273, 'es': 239, 'it': 213, 'pt': 203,
+        'pl': 224, 'tr': 226, 'ru': 182, 'nl': 251, 'cs': 186, 'ar': 166,
+        'zh-cn': 82, 'ja': 71, 'hu': 224, 'ko': 95, 'hi': 150
+    },
+    'index-tts': {'default': 300, 'zh': 120, 'zh-cn': 120, 'ja': 120},
+}
+
+
+def get_segment_limit(engine: str, language: Optional[str] = None) -> int:
+    """
+    Maximum segment length for an engine and language
+
+    Args:
+        engine: Engine id (e.g., 'coqui-tts')
+        language: Language code (e.g., 'en', 'zh-cn')
+
+    Returns:
+        Maximum characters per segment
+    """
+    limits = ENGINE_SEGMENT_LIMITS.get(engine, {'default': 250})
+    if language:
+        language = language.lower()
+        if language in limits:
+            return limits[language]
+        base = language.split('-')[0]
+        if base in limits:
+            return limits[base]
+    return limits['default']
+
+
+def _separator(language: Optional[str], previous: str) -> str:
+    """Separator placed between two joined pieces"""
+    if language and language.lower() in NO_SPACE_LANGUAGES:
+        return ''
+    if previous and previous[-1] in '。！？，；：、':
+        return ''
+    return ' '
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences
+
+    Args:
+        text: Text to split
+
+    Returns:
+        Non-empty sentences, stripped, in order
+    """
+    pieces = [s.strip() for s in SENTENCE_END.split(text) if s and s.strip()]
+
+    # Re-attach pieces that were split after an abbreviation ("Dr. Smith")
+    sentences = []
+    for piece in pieces:
+        if sentences and sentences[-1].split()[-1].lower() in ABBREVIATIONS:
+            sentences[-1] = f'{sentences[-1]} {piece}'
+        else:
+            sentences.append(piece)
+    return sentences
+
+
+def _split_words(text: str, max_chars: int) -> List[str]:
+    """Split text at whitespace (hard cut as a last resort)"""
+    pieces = []
+    current = ''
+    for word in text.split():
+        while len(word) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ''
+            pieces.append(word[:max_chars])
+            word = word[max_chars:]
+        if current and len(current) + 1 + len(word) > max_chars:
+            pieces.append(current)
+            current = word
+        else:
+            current = f'{current} {word}' if current else word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _split_long(sentence: str, max_chars: int, language: Optional[str]) -> List[str]:
+    """Split a sentence longer than max_chars at clauses, then at words"""
+    clauses = [c.strip() for c in CLAUSE_END.split(sentence) if c and c.strip()]
+
+    pieces = []
+    for clause in clauses:
+        if len(clause) > max_chars:
+            pieces.extend(_split_words(clause, max_chars))
+        else:
+            pieces.append(clause)
+    return _pack(pieces, max_chars, language)
+
+
+def _pack(pieces: List[str], max_chars: int, language: Optional[str]) -> List[str]:
+    """Greedily join consecutive pieces while they fit in max_chars"""
+    segments = []
+    current = ''
+    for piece in pieces:
+        separator = _separator(language, current)
+        if current and len(current) + len(separator) + len(piece) > max_chars:
+            segments.append(current)
+            current = piece
+        else:
+            current = f'{current}{separator}{piece}' if current else piece
+    if current:
+        segments.append(current)
+    return segments
+
+
+def group_sentences(
+    sentences: List[str],
+    max_chars: int,
+    language: Optional[str] = None
+) -> List[str]:
+    """
+    Pack consecutive sentences into segments of at most max_chars
+
+    Args:
+        sentences: Sentences in order
+        max_chars: Maximum segment length
+        language: Language code, controls how pieces are joined
+
+    Returns:
+        Segments in order
+    """
+    pieces = []
+    for sentence in sentences:
+        if len(sentence) > max_chars:
+            pieces.extend(_split_long(sentence, max_chars, language))
+        else:
+            pieces.append(sentence)
+    return _pack(pieces, max_chars, language)
+
+
+def segment_text(text: str, max_chars: int, language: Optional[str] = None) -> List[str]:
+    """
+    Split text into sentence-aligned segments of at most max_chars
+
+    Args:
+        text: Text to segment
+        max_chars: Maximum segment length
+        language: Language code (e.g., 'en', 'zh-cn')
+
+    Returns:
+        Segments in order
+    """
+    return group_sentences(split_sentences(text), max_chars, language)
+
+
+def segment_for_engine(text: str, engine: str, language: Optional[str] = None) -> List[str]:
+    """
+    Split text into segments that fit one model call of an engine
+
+    Args:
+        text: Text to segment
+        engine: Engine id (e.g., 'coqui-tts', 'index-tts')
+        language: Language code
+
+    Returns:
+        Segments in order (a single segment if the text already fits)
+    """
+    max_chars = get_segment_limit(engine, language)
+    if len(text) <= max_chars:
+        return [text]
+    return segment_text(text, max_chars, language)
@@ -0,0 +1,203 @@
+"""
+Thread Budget Module
+Splits the machine's CPU cores between worker processes, and each process's
+share between the threads that may run inference at once, and sets torch's
+intra-op and inter-op thread counts accordingly, so concurrent inference does
+not oversubscribe the CPU
+"""
+
+import os
+import sys
+import threading
+import logging
+from typing import Dict, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Explicit overrides; unset means derive from cores and workers
+TORCH_NUM_THREADS = os.environ.get('TORCH_NUM_THREADS')
+TORCH_INTEROP_THREADS = int(os.environ.get('TORCH_INTEROP_THREADS', 1))
+# Threads per process that may run inference at the same time
+INFERENCE_THREADS = os.environ.get('INFERENCE_THREADS')
+
+_state = {'workers': None, 'inference_threads': None, 'applied_pid': None}
+_thread_local = threading.local()
+_lock = threading.Lock()
+
+
+def get_cpu_count() -> int:
+    """
+    Cores this process may use, honouring CPU affinity and cgroup quotas
+
+    Returns:
+        Number of usable cores (at least 1)
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    # Containers often expose every host core but cap usage with a CFS quota
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()[:2]
+        if quota != 'max':
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+
+    return max(1, cpus)
+
+
+def get_worker_count() -> int:
+    """
+    Number of processes running inference side by side on this machine
+
+    Returns:
+        Value set with configure(), else WEB_CONCURRENCY, else 1
+    """
+    if _state['workers'] is not None:
+        return _state['workers']
+    try:
+        return max(1, int(os.environ.get('WEB_CONCURRENCY', 1)))
+    except ValueError:
+        return 1
+
+
+def get_inference_thread_count() -> int:
+    """
+    Number of threads in this process that may run inference at once
+
+    Returns:
+        INFERENCE_THREADS, else the value set with configure(), else 1
+    """
+    if INFERENCE_THREADS:
+        return max(1, int(INFERENCE_THREADS))
+    return _state['inference_threads'] or 1
+
+
+def configure(workers: Optional[int] = None, inference_threads: Optional[int] = None):
+    """
+    Override the counts used for the budget; arguments left as None are unchanged
+
+    The model server calls this with workers=1, since it is the only process
+    running inference when it is in use. The app passes the number of request
+    threads and job workers, which can each run inference at the same time.
+
+    Args:
+        workers: Processes sharing the machine's cores
+        inference_threads: Threads in this process sharing its cores
+    """
+    if workers is not None:
+        _state['workers'] = workers
+    if inference_threads is not None:
+        _state['inference_threads'] = max(1, inference_threads)
+
+
+def get_thread_budget() -> Dict:
+    """
+    Thread counts this process should use
+
+    intra_op_threads is the process's share of the cores; each inference
+    thread gets an equal part of it (thread_intra_op_threads).
+
+    Returns:
+        dict with cpus, workers, inference_threads, intra_op_threads,
+        thread_intra_op_threads and inter_op_threads
+    """
+    cpus = get_cpu_count()
+    workers = get_worker_count()
+    inference_threads = get_inference_thread_count()
+
+    if TORCH_NUM_THREADS:
+        intra_op = max(1, int(TORCH_NUM_THREADS))
+    else:
+        intra_op = max(1, cpus // workers)
+
+    return {
+        'cpus': cpus,
+        'workers': workers,
+        'inference_threads': inference_threads,
+        'intra_op_threads': intra_op,
+        'thread_intra_op_threads': max(1, intra_op // inference_threads),
+        'inter_op_threads': max(1, TORCH_INTEROP_THREADS),
+    }
+
+
+def apply_thread_budget() -> Dict:
+    """
+    Apply the budget to this process; call before loading a model
+
+    Sets OMP/MKL thread variables for libraries not yet initialised, torch's
+    inter-op thread count, and the calling thread's intra-op thread count.
+    Safe to call repeatedly.
+
+    Returns:
+        The applied budget
+    """
+    budget = get_thread_budget()
+    intra_op = budget['intra_op_threads']
+
+    with _lock:
+        if _state['applied_pid'] == os.getpid():
+            return budget
+
+        for variable in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+            os.environ.setdefault(variable, str(intra_op))
+
+        try:
+            import torch
+        except ImportError:
+            _state['applied_pid'] = os.getpid()
+            return budget
+
+        torch.set_num_threads(budget['thread_intra_op_threads'])
+        try:
+            torch.set_num_interop_threads(budget['inter_op_threads'])
+        except RuntimeError:
+            # Only allowed before the first inter-op parallel work
+            logger.debug("torch inter-op thread count already fixed for this process")
+
+        _state['applied_pid'] = os.getpid()
+
+    logger.info(
+        f"Thread budget: {intra_op} intra-op threads split over {budget['inference_threads']} "
+        f"inference thread(s), {budget['inter_op_threads']} inter-op "
+        f"({budget['cpus']} cores, {budget['workers']} worker(s))"
+    )
+    return budget
+
+
+def apply_to_current_thread():
+    """
+    Apply the per-thread intra-op thread count to the calling thread
+
+    With OpenMP builds, torch's intra-op thread count is per calling thread,
+    so inference threads (request handlers, job and batch workers) each need
+    it set. They each get their part of the process's share, so threads
+    running at once use no more cores than the process was given. Cheap
+    after the first call in a thread.
+    """
+    pid = os.getpid()
+    if getattr(_thread_local, 'pid', None) == pid:
+        return
+    _thread_local.pid = pid
+
+    if 'torch' not in sys.modules:
+        # Nothing to configure until a model has been loaded
+        _thread_local.pid = None
+        return
+
+    sys.modules['torch'].set_num_threads(get_thread_budget()['thread_intra_op_threads'])
+
+
+def thread_budget_stats() -> Dict:
+    """Budget plus the thread counts torch currently reports"""
+    stats = get_thread_budget()
+    stats['applied'] = _state['applied_pid'] == os.getpid()
+    torch = sys.modules.get('torch')
+    if torch is not None:
+        stats['torch_num_threads'] = torch.get_num_threads()
+        stats['torch_interop_threads'] = torch.get_num_interop_threads()
+    return stats
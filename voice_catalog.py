@@ -0,0 +1,246 @@
+"""
+Voice Catalog Module
+Edge-TTS voice list persisted to a local JSON snapshot, loaded instantly at
+startup, refreshed from the service in the background and indexed for lookups
+"""
+
+import os
+import json
+import time
+import tempfile
+import threading
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import edge_tts
+
+from cache_utils import get_cache_dir, hash_bytes
+from event_loop_thread import EventLoopThread, get_event_loop_thread
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+VOICE_CATALOG_TTL = int(os.environ.get('VOICE_CATALOG_TTL', 24 * 3600))
+REFRESH_RETRY_SECONDS = 300
+
+# Used only when neither a snapshot nor the service is available
+FALLBACK_VOICES = [
+    {'name': 'en-US-AriaNeural', 'display_name': 'Aria (US Female)', 'gender': 'Female', 'locale': 'en-US'},
+    {'name': 'en-US-GuyNeural', 'display_name': 'Guy (US Male)', 'gender': 'Male', 'locale': 'en-US'},
+    {'name': 'en-GB-SoniaNeural', 'display_name': 'Sonia (UK Female)', 'gender': 'Female', 'locale': 'en-GB'},
+]
+
+
+class VoiceIndex:
+    """
+    Immutable lookup structure over one version of the voice list
+    """
+
+    def __init__(self, voices: List[Dict]):
+        """
+        Build the indexes
+
+        Args:
+            voices: Voice dictionaries with name, display_name, gender and locale
+        """
+        self.voices = sorted(voices, key=lambda v: (v['locale'], v['name']))
+        self.by_name = {v['name']: v for v in self.voices}
+
+        self.by_locale = defaultdict(list)
+        self.by_language = defaultdict(list)
+        self.by_gender = defaultdict(list)
+        for voice in self.voices:
+            self.by_locale[voice['locale'].lower()].append(voice)
+            self.by_language[voice['locale'].split('-')[0].lower()].append(voice)
+            self.by_gender[voice['gender'].lower()].append(voice)
+
+        self.locales = sorted({v['locale'] for v in self.voices})
+
+        # Changes whenever the voice list changes; used for HTTP ETags
+        self.version = hash_bytes(
+            json.dumps(self.voices, sort_keys=True).encode('utf-8')
+        )[:16]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.by_name
+
+    def __len__(self) -> int:
+        return len(self.voices)
+
+    def filter(
+        self,
+        locale: Optional[str] = None,
+        language: Optional[str] = None,
+        gender: Optional[str] = None,
+        query: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Select voices matching all given criteria
+
+        Args:
+            locale: Exact locale (e.g., 'en-US'), case-insensitive
+            language: Language prefix (e.g., 'en'), case-insensitive
+            gender: 'Male' or 'Female', case-insensitive
+            query: Substring of the name, display name or locale
+
+        Returns:
+            Matching voices in catalog order
+        """
+        # Start from the narrowest index that applies
+        if locale:
+            voices = self.by_locale.get(locale.lower(), [])
+        elif language:
+            voices = self.by_language.get(language.lower(), [])
+        elif gender:
+            voices = self.by_gender.get(gender.lower(), [])
+        else:
+            voices = self.voices
+
+        if language:
+            prefix = language.lower()
+            voices = [v for v in voices if v['locale'].split('-')[0].lower() == prefix]
+        if gender:
+            voices = [v for v in voices if v['gender'].lower() == gender.lower()]
+        if query:
+            needle = query.lower()
+            voices = [
+                v for v in voices
+                if needle in v['name'].lower()
+                or needle in v['display_name'].lower()
+                or needle in v['locale'].lower()
+            ]
+        return voices
+
+
+class VoiceCatalog:
+    """
+    Edge-TTS neural voice list backed by an on-disk snapshot
+    Reads never wait on the network; stale data triggers a background refresh
+    """
+
+    def __init__(
+        self,
+        snapshot_path: Optional[str] = None,
+        ttl: int = VOICE_CATALOG_TTL,
+        loop_thread: Optional[EventLoopThread] = None
+    ):
+        """
+        Initialize the catalog and load the snapshot if there is one
+
+        Args:
+            snapshot_path: JSON snapshot location (default: <cache root>/voices/edge_voices.json)
+            ttl: Seconds after which the snapshot is refreshed
+            loop_thread: Event loop used for the background refresh
+        """
+        self.snapshot_path = snapshot_path or os.path.join(get_cache_dir('voices'), 'edge_voices.json')
+        self.ttl = ttl
+        self.loop_thread = loop_thread or get_event_loop_thread()
+
+        self._index = VoiceIndex(FALLBACK_VOICES)
+        self._fetched_at: Optional[float] = None
+        self._refreshing = False
+        self._last_attempt = 0.0
+        self._lock = threading.Lock()
+
+        self._load_snapshot()
+
+    def _load_snapshot(self):
+        """Load the persisted voice list, however old it is"""
+        try:
+            with open(self.snapshot_path) as f:
+                snapshot = json.load(f)
+            self._index = VoiceIndex(snapshot['voices'])
+            self._fetched_at = snapshot['fetched_at']
+            logger.info(
+                f"Loaded {len(self._index)} voices from snapshot "
+                f"({int(time.time() - self._fetched_at)}s old)"
+            )
+        except FileNotFoundError:
+            logger.info("No voice snapshot yet, using fallback voices until refreshed")
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable voice snapshot: {e}")
+
+    def _save_snapshot(self, voices: List[Dict], fetched_at: float):
+        """Write the snapshot atomically so concurrent workers never read a partial file"""
+        directory = os.path.dirname(self.snapshot_path)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'fetched_at': fetched_at, 'voices': voices}, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @property
+    def index(self) -> VoiceIndex:
+        """Index over the current voice list; schedules a refresh when stale"""
+        if self.is_stale():
+            self.refresh_async()
+        return self._index
+
+    @property
+    def voices(self) -> List[Dict]:
+        """Current voice list; schedules a refresh when stale"""
+        return self.index.voices
+
+    @property
+    def fetched_at(self) -> Optional[float]:
+        """When the current list was fetched from the service (None for fallback)"""
+        return self._fetched_at
+
+    def is_stale(self) -> bool:
+        """Whether the list is older than the TTL or was never fetched"""
+        return self._fetched_at is None or time.time() - self._fetched_at > self.ttl
+
+    def refresh_async(self):
+        """
+        Fetch the voice list in the background, unless a fetch is already running
+
+        Returns:
+            concurrent.futures.Future, or None if no refresh was started
+        """
+        with self._lock:
+            if self._refreshing or time.time() - self._last_attempt < REFRESH_RETRY_SECONDS:
+                return None
+            self._refreshing = True
+            self._last_attempt = time.time()
+
+        return self.loop_thread.submit(self._refresh())
+
+    async def _refresh(self):
+        try:
+            voices = await edge_tts.list_voices()
+
+            # Keep only high-quality neural voices
+            neural_voices = [
+                {
+                    'name': v['ShortName'],
+                    'display_name': v['FriendlyName'],
+                    'gender': v['Gender'],
+                    'locale': v['Locale']
+                }
+                for v in voices
+                if 'Neural' in v['ShortName']
+            ]
+            if not neural_voices:
+                raise ValueError("Service returned no neural voices")
+
+            fetched_at = time.time()
+            self._index = VoiceIndex(neural_voices)
+            self._fetched_at = fetched_at
+            logger.info(f"Refreshed voice catalog: {len(neural_voices)} neural voices")
+
+            try:
+                self._save_snapshot(neural_voices, fetched_at)
+            except OSError as e:
+                logger.warning(f"Could not persist voice snapshot: {e}")
+
+        except Exception as e:
+            logger.error(f"Error refreshing voice catalog: {e}")
+
+        finally:
+            with self._lock:
+                self._refreshing = False
@@ -0,0 +1,365 @@
+"""
+Voice Conversion Engine Module
+Converts a source recording to a target speaker's voice with FreeVC, processing
+long recordings in fixed-size overlapping windows joined by overlap-add
+"""
+
+import os
+import logging
+import importlib.util
+from math import gcd
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from audio_assembly import OverlapAdd
+from cache_utils import hash_file
+from conditioning_cache import ConditioningCache
+from coqui_tts_converter import CoquiTTSConverter
+from thread_budget import apply_thread_budget
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_VC_MODEL_NAME = "voice_conversion_models/multilingual/vctk/freevc24"
+VC_MODEL_NAME = os.environ.get('VC_MODEL_NAME', DEFAULT_VC_MODEL_NAME)
+# Source audio is converted in windows of this length; neighbouring windows
+# share VC_OVERLAP_SECONDS, which is crossfaded
+VC_WINDOW_SECONDS = float(os.environ.get('VC_WINDOW_SECONDS', 8))
+VC_OVERLAP_SECONDS = float(os.environ.get('VC_OVERLAP_SECONDS', 0.5))
+VC_TARGET_CACHE_SIZE = int(os.environ.get('VC_TARGET_CACHE_SIZE', 256))
+VC_TARGET_CACHE_DISK_MB = int(os.environ.get('VC_TARGET_CACHE_DISK_MB', 128))
+
+
+class VoiceConversionEngine:
+    """
+    Voice conversion engine using a resident FreeVC model
+    Memory use is bounded by the window size, not the source length
+    """
+
+    def __init__(
+        self,
+        model_name: str = VC_MODEL_NAME,
+        window_seconds: float = VC_WINDOW_SECONDS,
+        overlap_seconds: float = VC_OVERLAP_SECONDS
+    ):
+        """
+        Initialize the voice conversion engine
+
+        Args:
+            model_name: Coqui voice conversion model
+            window_seconds: Length of each processed window of source audio
+            overlap_seconds: Overlap between neighbouring windows
+        """
+        logger.info("Initializing Voice Conversion Engine...")
+
+        if overlap_seconds >= window_seconds:
+            raise ValueError("overlap_seconds must be shorter than window_seconds")
+
+        self.model_name = model_name
+        self.window_seconds = window_seconds
+        self.overlap_seconds = overlap_seconds
+        self.tts = None
+        self.model = None
+        self.is_available = False
+        self.device = "cpu"
+        self.target_cache = ConditioningCache(
+            'freevc_targets',
+            max_items=VC_TARGET_CACHE_SIZE,
+            disk_max_bytes=VC_TARGET_CACHE_DISK_MB * 1024 * 1024
+        )
+
+        try:
+            self._initialize_model()
+            self.is_available = True
+            logger.info(f"Voice Conversion Engine ready with model: {model_name}")
+        except Exception as e:
+            logger.warning(f"Voice conversion not available: {e}")
+
+    def _initialize_model(self):
+        """Load the FreeVC model"""
+        try:
+            apply_thread_budget()
+
+            import torch
+            from TTS.api import TTS
+
+            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+            logger.info(f"Loading voice conversion model: {self.model_name}")
+
+            self.tts = TTS(self.model_name, progress_bar=False).to(self.device)
+            self.model = self.tts.voice_converter.vc_model
+
+        except ImportError as e:
+            raise ImportError(
+                f"Failed to import Coqui TTS: {e}. "
+                "Please install with: pip install TTS"
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to initialize voice conversion: {e}")
+
+    @property
+    def input_sample_rate(self) -> int:
+        """Sample rate the content encoder expects"""
+        return self.model.config.audio.input_sample_rate
+
+    @property
+    def output_sample_rate(self) -> int:
+        """Sample rate of the converted audio"""
+        return self.model.config.audio.output_sample_rate
+
+    def get_sample_rates(self) -> Tuple[int, int]:
+        """(input, output) sample rates of the loaded model"""
+        return self.input_sample_rate, self.output_sample_rate
+
+    def get_target_embedding(self, target_wav: str) -> Tuple[str, object]:
+        """
+        Encode the target speaker
+
+        FreeVC models with an external speaker encoder condition on its
+        embedding; the others condition on the target's mel spectrogram.
+        Results are cached by the audio's content hash, in memory and on disk.
+
+        Args:
+            target_wav: Path to target voice audio file
+
+        Returns:
+            ('embedding', g) or ('mel', mel) as CPU tensors
+        """
+        key = self.target_cache.make_key(self.model_name, hash_file(target_wav))
+        return self.target_cache.get_or_compute(key, lambda: self._encode_target(target_wav))
+
+    def _encode_target(self, target_wav: str) -> Tuple[str, object]:
+        """Compute the target conditioning (uncached)"""
+        import torch
+        import librosa
+
+        logger.info(f"Encoding voice conversion target: {target_wav}")
+
+        wav_tgt = self.model.load_audio(target_wav).cpu().numpy()
+        wav_tgt, _ = librosa.effects.trim(wav_tgt, top_db=20)
+
+        with torch.inference_mode():
+            if self.model.config.model_args.use_spk:
+                g = self.model.enc_spk_ex.embed_utterance(wav_tgt)
+                return 'embedding', torch.from_numpy(g)[None, :, None].float()
+
+            from TTS.vc.models.freevc import mel_spectrogram_torch
+
+            audio = self.model.config.audio
+            mel = mel_spectrogram_torch(
+                torch.from_numpy(wav_tgt).unsqueeze(0),
+                audio.filter_length,
+                audio.n_mel_channels,
+                audio.input_sample_rate,
+                audio.hop_length,
+                audio.win_length,
+                audio.mel_fmin,
+                audio.mel_fmax
+            )
+            return 'mel', mel.transpose(1, 2).float()
+
+    def extract_content(self, samples: np.ndarray):
+        """
+        Content (WavLM) features of one window of source audio
+
+        Args:
+            samples: Mono float samples at input_sample_rate
+
+        Returns:
+            Feature tensor on the model's device
+        """
+        import torch
+
+        with torch.inference_mode():
+            wav = torch.from_numpy(np.ascontiguousarray(samples, dtype=np.float32))
+            return self.model.extract_wavlm_features(wav[None, :].to(self.device))
+
+    def render(self, content, target: Tuple[str, object]) -> np.ndarray:
+        """
+        Decode content features in the target speaker's voice
+
+        Args:
+            content: Features from extract_content()
+            target: Result of get_target_embedding()
+
+        Returns:
+            Mono float samples at output_sample_rate
+        """
+        import torch
+
+        kind, value = target
+        with torch.inference_mode():
+            value = value.to(self.device)
+            if kind == 'embedding':
+                audio = self.model.inference(content, g=value)
+            else:
+                audio = self.model.inference(content, mel=value)
+        return audio[0][0].float().cpu().numpy()
+
+    def convert_window(self, samples: np.ndarray, target: Tuple[str, object]) -> np.ndarray:
+        """
+        Convert one window of source audio in a single call
+
+        Used by real-time sessions, which feed short windows as audio arrives.
+
+        Args:
+            samples: Mono float samples at input_sample_rate
+            target: Result of get_target_embedding()
+
+        Returns:
+            Mono float samples at output_sample_rate
+        """
+        if not self.is_available:
+            raise RuntimeError("Voice conversion is not available.")
+        return self.render(self.extract_content(samples), target)
+
+    def _window_bounds(self, total: int) -> Iterator[Tuple[int, int]]:
+        """(start, end) sample positions of the windows covering `total` input samples"""
+        window = int(self.window_seconds * self.input_sample_rate)
+        hop = window - int(self.overlap_seconds * self.input_sample_rate)
+
+        start = 0
+        while True:
+            end = min(start + window, total)
+            yield start, end
+            if end >= total:
+                break
+            start += hop
+
+    def _source_windows(self, source_wav: str) -> Iterator[np.ndarray]:
+        """
+        Read the source window by window at the model's input sample rate
+
+        Only one window is held in memory; files soundfile cannot open are
+        decoded whole by the model's loader instead.
+        """
+        import soundfile as sf
+        from scipy.signal import resample_poly
+
+        rate = self.input_sample_rate
+        try:
+            source = sf.SoundFile(source_wav)
+        except RuntimeError:
+            audio = self.model.load_audio(source_wav).cpu().numpy()
+            for start, end in self._window_bounds(len(audio)):
+                yield audio[start:end]
+            return
+
+        with source:
+            native_rate = source.samplerate
+            divisor = gcd(rate, native_rate)
+            total = int(source.frames * rate / native_rate)
+
+            for start, end in self._window_bounds(total):
+                source.seek(int(start * native_rate / rate))
+                frames = source.read(
+                    int((end - start) * native_rate / rate),
+                    dtype='float32',
+                    always_2d=True
+                ).mean(axis=1)
+                if native_rate != rate:
+                    frames = resample_poly(frames, rate // divisor, native_rate // divisor)
+                yield frames.astype(np.float32)
+
+    def convert_voice(
+        self,
+        source_wav: str,
+        target_wav: str,
+        output_path: str
+    ) -> str:
+        """
+        Convert voice from source to target speaker
+
+        Args:
+            source_wav: Path to source audio file
+            target_wav: Path to target voice audio file
+            output_path: Path to save output audio
+
+        Returns:
+            Path to generated audio file
+        """
+        return self.convert_voice_multi(source_wav, [target_wav], [output_path])[0]
+
+    def convert_voice_multi(
+        self,
+        source_wav: str,
+        target_wavs: List[str],
+        output_paths: List[str]
+    ) -> List[str]:
+        """
+        Convert one source recording into several target voices
+
+        Content features of each source window are extracted once and decoded
+        for every target, so the content encoder runs once however many
+        targets there are.
+
+        Args:
+            source_wav: Path to source audio file
+            target_wavs: Paths to target voice audio files
+            output_paths: Output path per target
+
+        Returns:
+            Paths to generated audio files, in target order
+        """
+        if not self.is_available:
+            raise RuntimeError("Voice conversion is not available.")
+
+        if len(target_wavs) != len(output_paths):
+            raise ValueError("Need exactly one output path per target")
+        if not os.path.exists(source_wav):
+            raise FileNotFoundError(f"Source audio not found: {source_wav}")
+        for target_wav in target_wavs:
+            if not os.path.exists(target_wav):
+                raise FileNotFoundError(f"Target audio not found: {target_wav}")
+
+        import soundfile as sf
+
+        logger.info(f"Converting voice from {source_wav} to {len(target_wavs)} target(s)")
+        targets = [self.get_target_embedding(target_wav) for target_wav in target_wavs]
+
+        overlap = round(self.overlap_seconds * self.output_sample_rate)
+        joiners = [OverlapAdd(overlap) for _ in targets]
+        outputs = [
+            sf.SoundFile(path, 'w', samplerate=self.output_sample_rate, channels=1, subtype='PCM_16')
+            for path in output_paths
+        ]
+
+        # Finished samples go straight to disk, so memory stays flat
+        try:
+            for window in self._source_windows(source_wav):
+                content = self.extract_content(window)
+                for target, joiner, output in zip(targets, joiners, outputs):
+                    output.write(joiner.push(self.render(content, target)))
+            for joiner, output in zip(joiners, outputs):
+                output.write(joiner.flush())
+        finally:
+            for output in outputs:
+                output.close()
+
+        logger.info(f"Voice converted successfully: {', '.join(output_paths)}")
+        return output_paths
+
+    @staticmethod
+    def probe(model_name: str = VC_MODEL_NAME) -> Dict:
+        """
+        Check whether voice conversion can run, without loading the model
+
+        Returns:
+            dict with 'available', 'model_downloaded' and 'model_path'
+        """
+        importable = all(
+            importlib.util.find_spec(package) is not None
+            for package in ("TTS", "torch")
+        )
+        model_path = CoquiTTSConverter.get_model_path(model_name)
+
+        return {
+            'available': importable,
+            'model_downloaded': (model_path / "config.json").exists(),
+            'model_path': str(model_path)
+        }
+
+    def is_model_available(self) -> bool:
+        """Check if the voice conversion model is available"""
+        return self.is_available
@@ -4,14 +4,34 @@ Handles text-to-speech using Microsoft Edge TTS
 """
 
 import os
+import math
 import asyncio
 import edge_tts
 import logging
+import importlib.util
 from pathlib import Path
+from event_loop_thread import get_event_loop_thread
+from voice_catalog import VoiceCatalog
+from text_segmentation import segment_text
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Long texts are split at sentence boundaries and synthesized concurrently
+EDGE_TTS_FANOUT = int(os.environ.get('EDGE_TTS_FANOUT', 4))
+EDGE_TTS_MIN_SEGMENT_CHARS = int(os.environ.get('EDGE_TTS_MIN_SEGMENT_CHARS', 200))
+
+
+def _strip_id3(mp3_bytes):
+    """Drop a leading ID3v2 tag so MP3 segments can be joined frame by frame"""
+    if len(mp3_bytes) >= 10 and mp3_bytes[:3] == b'ID3':
+        size = 0
+        for byte in mp3_bytes[6:10]:
+            size = (size << 7) | (byte & 0x7F)
+        footer = 10 if mp3_bytes[5] & 0x10 else 0
+        return mp3_bytes[10 + size + footer:]
+    return mp3_bytes
+
 
 class VoiceConverter:
     """
@@ -23,40 +43,29 @@ class VoiceConverter:
         Initialize the voice converter with Edge TTS
         """
         logger.info("Initializing Voice Converter with Edge-TTS...")
-        self.available_voices = []
-        self._load_voices()
+        self.loop_thread = get_event_loop_thread()
+        
+        # Loads the persisted snapshot; never waits on the network
+        self.catalog = VoiceCatalog(loop_thread=self.loop_thread)
+        if self.catalog.is_stale():
+            self.catalog.refresh_async()
+        
         logger.info(f"Voice Converter ready with {len(self.available_voices)} voices")
     
-    def _load_voices(self):
-        """Load available voices from Edge TTS"""
-        try:
-            # Get available voices synchronously
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            voices = loop.run_until_complete(edge_tts.list_voices())
-            loop.close()
-            
-            # Filter for high-quality neural voices
-            self.available_voices = [
-                {
-                    'name': v['ShortName'],
-                    'display_name': v['FriendlyName'],
-                    'gender': v['Gender'],
-                    'locale': v['Locale']
-                }
-                for v in voices
-                if 'Neural' in v['ShortName']
-            ]
-            
-            logger.info(f"Loaded {len(self.available_voices)} neural voices")
-        except Exception as e:
-            logger.error(f"Error loading voices: {e}")
-            # Provide some default voices as fallback
-            self.available_voices = [
-                {'name': 'en-US-AriaNeural', 'display_name': 'Aria (US Female)', 'gender': 'Female', 'locale': 'en-US'},
-                {'name': 'en-US-GuyNeural', 'display_name': 'Guy (US Male)', 'gender': 'Male', 'locale': 'en-US'},
-                {'name': 'en-GB-SoniaNeural', 'display_name': 'Sonia (UK Female)', 'gender': 'Female', 'locale': 'en-GB'},
-            ]
+    @property
+    def available_voices(self):
+        """Neural voices from the catalog (snapshot, refreshed in the background)"""
+        return self.catalog.voices
+    
+    @staticmethod
+    def probe():
+        """
+        Check whether Edge TTS can run, without contacting the service
+        
+        Returns:
+            dict with 'available'
+        """
+        return {'available': importlib.util.find_spec('edge_tts') is not None}
     
     def get_available_voices(self):
         """
@@ -67,12 +76,90 @@ class VoiceConverter:
         """
         return self.available_voices
     
+    def _plan_segments(self, text):
+        """
+        Split text into at most EDGE_TTS_FANOUT sentence-aligned segments
+        
+        Short texts (and a fan-out of 1) stay a single segment.
+        """
+        if EDGE_TTS_FANOUT <= 1 or len(text) < 2 * EDGE_TTS_MIN_SEGMENT_CHARS:
+            return [text]
+        
+        target = max(EDGE_TTS_MIN_SEGMENT_CHARS, math.ceil(len(text) / EDGE_TTS_FANOUT))
+        segments = segment_text(text, target)
+        return segments or [text]
+    
     async def _generate_speech_async(self, text, voice_name, output_path):
         """
         Async method to generate speech
         """
+        segments = self._plan_segments(text)
+        
+        if len(segments) == 1:
+            communicate = edge_tts.Communicate(text, voice_name)
+            await communicate.save(output_path)
+            return
+        
+        logger.info(f"Synthesizing {len(segments)} segments concurrently")
+        semaphore = asyncio.Semaphore(EDGE_TTS_FANOUT)
+        parts = await asyncio.gather(*(
+            self._synthesize_segment_async(segment, voice_name, semaphore)
+            for segment in segments
+        ))
+        
+        # MP3 frames are self-contained, so joining the streams in order
+        # yields one valid stream without re-encoding
+        with open(output_path, 'wb') as f:
+            for index, part in enumerate(parts):
+                f.write(part if index == 0 else _strip_id3(part))
+    
+    async def _synthesize_segment_async(self, text, voice_name, semaphore):
+        """
+        Synthesize one segment to MP3 bytes, holding a fan-out slot
+        """
+        async with semaphore:
+            chunks = []
+            async for chunk in self._stream_segment_async(text, voice_name):
+                chunks.append(chunk)
+            return b''.join(chunks)
+    
+    async def _stream_segment_async(self, text, voice_name):
+        """
+        Async generator yielding MP3 chunks of one Communicate call
+        """
         communicate = edge_tts.Communicate(text, voice_name)
-        await communicate.save(output_path)
+        async for chunk in communicate.stream():
+            if chunk['type'] == 'audio':
+                yield chunk['data']
+    
+    async def _stream_speech_async(self, text, voice_name):
+        """
+        Async generator yielding MP3 chunks as they arrive from Edge TTS
+        
+        For long texts the first segment is streamed live while the following
+        segments are synthesized concurrently and emitted in order.
+        """
+        segments = self._plan_segments(text)
+        semaphore = asyncio.Semaphore(EDGE_TTS_FANOUT)
+        
+        # Claim a slot for the first segment before the prefetch tasks start
+        await semaphore.acquire()
+        pending = [
+            asyncio.ensure_future(self._synthesize_segment_async(segment, voice_name, semaphore))
+            for segment in segments[1:]
+        ]
+        try:
+            try:
+                async for chunk in self._stream_segment_async(segments[0], voice_name):
+                    yield chunk
+            finally:
+                semaphore.release()
+            
+            for task in pending:
+                yield _strip_id3(await task)
+        finally:
+            for task in pending:
+                task.cancel()
     
     def text_to_speech(self, text, voice_name, output_path):
         """
@@ -89,17 +176,10 @@ class VoiceConverter:
         try:
             logger.info(f"Converting text to speech with voice: {voice_name}")
             
-            # Validate voice
-            valid_voices = [v['name'] for v in self.available_voices]
-            if voice_name not in valid_voices:
-                logger.warning(f"Voice {voice_name} not found, using default")
-                voice_name = 'en-US-AriaNeural'
+            voice_name = self._resolve_voice(voice_name)
             
-            # Generate speech using asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self._generate_speech_async(text, voice_name, output_path))
-            loop.close()
+            # Generate speech on the shared event loop
+            self.loop_thread.run(self._generate_speech_async(text, voice_name, output_path))
             
             logger.info(f"Speech generated successfully: {output_path}")
             return output_path
@@ -108,6 +188,52 @@ class VoiceConverter:
             logger.error(f"Error in text-to-speech conversion: {e}")
             raise
     
+    def submit_text_to_speech(self, text, voice_name, output_path):
+        """
+        Schedule text-to-speech on the shared event loop without blocking
+        
+        Args:
+            text: Text to convert to speech
+            voice_name: Name of the voice to use (e.g., 'en-US-AriaNeural')
+            output_path: Path to save the output audio
+            
+        Returns:
+            concurrent.futures.Future resolving to output_path
+        """
+        voice_name = self._resolve_voice(voice_name)
+        
+        async def generate():
+            await self._generate_speech_async(text, voice_name, output_path)
+            return output_path
+        
+        return self.loop_thread.submit(generate())
+    
+    def stream_speech(self, text, voice_name):
+        """
+        Convert text to speech, yielding MP3 chunks as they are synthesized
+        
+        Args:
+            text: Text to convert to speech
+            voice_name: Name of the voice to use (e.g., 'en-US-AriaNeural')
+            
+        Yields:
+            MP3 audio chunks (bytes)
+        """
+        logger.info(f"Streaming text to speech with voice: {voice_name}")
+        voice_name = self._resolve_voice(voice_name)
+        yield from self.loop_thread.iterate(self._stream_speech_async(text, voice_name))
+    
+    def _resolve_voice(self, voice_name):
+        """Return voice_name if it is known, otherwise the default voice"""
+        if self.catalog.fetched_at is None:
+            # Only the fallback list is known yet; let the service judge the name
+            return voice_name
+        
+        if voice_name not in self.catalog.index:
+            logger.warning(f"Voice {voice_name} not found, using default")
+            return 'en-US-AriaNeural'
+        return voice_name
+    
     def validate_audio_file(self, audio_path):
         """
         Validate that the audio file exists and is readable